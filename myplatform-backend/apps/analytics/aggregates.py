@@ -0,0 +1,152 @@
+# apps/analytics/aggregates.py
+
+from django.db.models import Avg, Count, Exists, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from apps.assignments.models import Assignment
+from apps.categories.models import CourseCategory
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.modules.models import Module
+from apps.progress_tracking.models import StudentCourseProgress
+from apps.users.models import CustomUser
+
+
+def full_name(first_name, last_name):
+    """Те саме, що AbstractUser.get_full_name(), але для рядків з .values()"""
+    return f"{first_name} {last_name}".strip()
+
+
+def teacher_name(row):
+    if row['teacher_id'] is None:
+        return 'No teacher'
+    return full_name(row['teacher__first_name'], row['teacher__last_name'])
+
+
+def build_course_statistics():
+    """Блок 'courses' дашборду: фіксована кількість агрегатних запитів незалежно від обсягу даних"""
+    course_totals = Course.objects.aggregate(
+        total_courses=Count('id'),
+        free_courses=Count('id', filter=Q(status='free')),
+        premium_courses=Count('id', filter=Q(status='premium')),
+        average_price=Avg('price', filter=Q(status='premium')),
+        courses_with_modules=Count(
+            'id', filter=Q(Exists(Module.objects.filter(course=OuterRef('pk'))))
+        ),
+        courses_with_assignments=Count(
+            'id', filter=Q(Exists(Assignment.objects.filter(course=OuterRef('pk'))))
+        ),
+    )
+    total_courses = course_totals['total_courses']
+    total_modules = Module.objects.count()
+    total_lessons = Lesson.objects.count()
+    total_enrollments = Enrollment.objects.count()
+
+    categories_stats = list(
+        CourseCategory.objects.annotate(
+            course_count=Count('category_courses')
+        ).filter(course_count__gt=0).order_by('id').values('name', 'course_count')
+    )
+
+    popular_courses = [{
+        'title': row['title'],
+        'student_count': row['student_count'],
+        'teacher': teacher_name(row),
+    } for row in Course.objects.annotate(
+        student_count=Count('enrollment')
+    ).order_by('-student_count', 'id').values(
+        'title', 'student_count', 'teacher_id', 'teacher__first_name', 'teacher__last_name'
+    )[:5]]
+
+    teachers_stats = [{
+        'name': full_name(row['first_name'], row['last_name']),
+        'username': row['username'],
+        'course_count': row['course_count'],
+        'student_count': row['student_count'],
+    } for row in CustomUser.objects.filter(role='teacher').annotate(
+        course_count=Count('course', distinct=True),
+        student_count=Count('course__enrollment'),
+    ).filter(course_count__gt=0).order_by('id').values(
+        'first_name', 'last_name', 'username', 'course_count', 'student_count'
+    )]
+
+    recent_courses = [{
+        'title': row['title'],
+        'created_at': row['created_at'],
+        'teacher_name': teacher_name(row),
+        'status': row['status'],
+        'enrollment_count': row['enrollment_count'],
+    } for row in Course.objects.annotate(
+        enrollment_count=Count('enrollment')
+    ).order_by('-created_at', '-id').values(
+        'title', 'created_at', 'status', 'enrollment_count',
+        'teacher_id', 'teacher__first_name', 'teacher__last_name'
+    )[:5]]
+
+    return {
+        'total_courses': total_courses,
+        'categories': categories_stats,
+        'average_modules_per_course': (
+            round(total_modules / total_courses, 2) if total_courses > 0 else 0
+        ),
+        'average_lessons_per_module': (
+            round(total_lessons / total_modules, 2) if total_modules > 0 else 0
+        ),
+        'most_popular_courses': popular_courses,
+        'courses_with_modules': course_totals['courses_with_modules'],
+        'courses_with_assignments': course_totals['courses_with_assignments'],
+        'courses_by_status': {
+            'free': course_totals['free_courses'],
+            'premium': course_totals['premium_courses']
+        },
+        'courses_by_teacher': teachers_stats,
+        'total_enrollments': total_enrollments,
+        'average_enrollments_per_course': (
+            round(total_enrollments / total_courses, 2) if total_courses > 0 else 0
+        ),
+        'recent_courses': recent_courses,
+        'price_statistics': {
+            'average_price': course_totals['average_price'],
+            'total_premium_courses': course_totals['premium_courses'],
+            'total_free_courses': course_totals['free_courses']
+        }
+    }
+
+
+def build_student_completion_stats():
+    """Завершені уроки/модулі по студентах одним проходом по зведенню StudentCourseProgress"""
+    rows = StudentCourseProgress.objects.filter(student__role='student').values(
+        'student_id', 'student__first_name', 'student__last_name', 'student__username'
+    ).annotate(
+        lessons_total=Sum('completed_lessons'),
+        modules_total=Sum('completed_modules'),
+    ).filter(Q(lessons_total__gt=0) | Q(modules_total__gt=0)).order_by('student_id')
+
+    return [{
+        'student_name': full_name(row['student__first_name'], row['student__last_name']),
+        'username': row['student__username'],
+        'completed_lessons': row['lessons_total'],
+        'completed_modules': row['modules_total']
+    } for row in rows]
+
+
+def build_student_progress(course):
+    """Прогрес зарахованих на курс студентів одним запитом з підзапитами до зведення"""
+    progress = StudentCourseProgress.objects.filter(course=course, student=OuterRef('student'))
+    rows = Enrollment.objects.filter(course=course).annotate(
+        lessons_done=Coalesce(Subquery(progress.values('completed_lessons')[:1]), 0),
+        modules_done=Coalesce(Subquery(progress.values('completed_modules')[:1]), 0),
+        progress_activity=Subquery(progress.values('last_activity')[:1]),
+    ).order_by('id').values(
+        'student__first_name', 'student__last_name', 'student__username', 'student__last_login',
+        'lessons_done', 'modules_done', 'progress_activity'
+    )
+
+    return [{
+        'student_name': f"{row['student__first_name']} {row['student__last_name']}",
+        'username': row['student__username'],
+        'completed_lessons': row['lessons_done'],
+        'completed_modules': row['modules_done'],
+        'last_activity': row['progress_activity'] or row['student__last_login']
+    } for row in rows]
@@ -0,0 +1,18 @@
+# apps/analytics/management/commands/refresh_analytics.py
+
+from django.core.management.base import BaseCommand
+
+from apps.analytics.snapshots import refresh_snapshots
+
+
+class Command(BaseCommand):
+    help = "Оновлює знімки аналітики (AnalyticsSnapshot) для курсів, що змінилися після попереднього запуску"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Перерахувати всі курси незалежно від watermark")
+
+    def handle(self, *args, **options):
+        result = refresh_snapshots(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed dashboard, {result['charts']} charts and {result['courses']} course snapshots"
+        ))
@@ -1,3 +1,23 @@
+# apps/analytics/models.py
+
 from django.db import models
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.courses.models import Course
+
+
+class AnalyticsSnapshot(models.Model):
+    """Збережений результат аналітики, який оновлює команда refresh_analytics"""
+    key = models.CharField(max_length=100, unique=True)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, null=True, blank=True, related_name='analytics_snapshots')
+    data = models.JSONField(encoder=JSONEncoder)
+    computed_at = models.DateTimeField()
+    watermark = models.DateTimeField()  # Зміни до цього моменту вже враховані в data
+
+    def __str__(self):
+        return self.key
 
-# Create your models here.
+    @property
+    def age(self):
+        return int((timezone.now() - self.computed_at).total_seconds())
@@ -0,0 +1,68 @@
+# apps/analytics/signals.py
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.assignments.models import Assignment, Submission
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.modules.models import Module
+from apps.progress_tracking.models import LessonProgress, ModuleProgress
+from myplatform.cache import bump_cache_version
+
+# Як дістати course_id з екземпляра кожної моделі, що впливає на аналітику курсу
+COURSE_ID_GETTERS = {
+    Course: lambda instance: instance.id,
+    Enrollment: lambda instance: instance.course_id,
+    Module: lambda instance: instance.course_id,
+    Lesson: lambda instance: instance.module.course_id,
+    LessonProgress: lambda instance: instance.lesson.module.course_id,
+    ModuleProgress: lambda instance: instance.module.course_id,
+    Assignment: lambda instance: instance.course_id,
+    Submission: lambda instance: instance.assignment.course_id,
+}
+
+
+def course_cache_namespace(course_id):
+    return f'course_analytics_{course_id}'
+
+
+def bump_course_version(course_id):
+    # Після коміту, інакше паралельний запит може закешувати старі дані вже під новою версією
+    transaction.on_commit(lambda: bump_cache_version(course_cache_namespace(course_id)))
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_save, sender=LessonProgress)
+@receiver(post_delete, sender=LessonProgress)
+@receiver(post_save, sender=ModuleProgress)
+@receiver(post_delete, sender=ModuleProgress)
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+def invalidate_course_analytics(sender, instance, origin=None, **kwargs):
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin is not None and origin_model is not sender and origin_model in COURSE_ID_GETTERS:
+        # Каскад від іншого об'єкта курсу: версію підніме його власний сигнал, а звернення
+        # до батьківського об'єкта тут коштувало б запиту на кожен видалений рядок
+        return
+    try:
+        course_id = COURSE_ID_GETTERS[sender](instance)
+    except ObjectDoesNotExist:
+        # Батьківський об'єкт уже видалено каскадом - його власний сигнал версію і підніме
+        return
+    if course_id is not None:
+        bump_course_version(course_id)
+
@@ -0,0 +1,127 @@
+# apps/analytics/snapshots.py
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from rest_framework.response import Response
+
+from apps.assignments.models import Assignment, Submission
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.modules.models import Module
+from apps.progress_tracking.models import StudentCourseProgress
+from myplatform.cache import peek_cache_versions
+from .models import AnalyticsSnapshot
+from .signals import course_cache_namespace
+
+DASHBOARD_KEY = 'dashboard'
+
+PERIOD_CHART_TYPES = ('enrollment_trends', 'user_activity')
+STATIC_CHART_TYPES = ('course_popularity', 'student_progress', 'assignment_completion')
+SNAPSHOT_CHART_PERIODS = ('7', '30', '90')
+
+
+def course_snapshot_key(course_id):
+    return f'course:{course_id}'
+
+
+def chart_snapshot_key(chart_type, period):
+    if chart_type in PERIOD_CHART_TYPES:
+        return f'charts:{chart_type}:{period}'
+    return f'charts:{chart_type}'
+
+
+def get_fresh_snapshot(key, changed_at_ns=None):
+    """
+    Знімок за ключем, якщо він є і не старший за ANALYTICS_SNAPSHOT_MAX_AGE секунд.
+    changed_at_ns - час останньої відомої зміни даних (версія з myplatform.cache); знімок,
+    порахований до неї, вважається застарілим.
+    """
+    try:
+        snapshot = AnalyticsSnapshot.objects.get(key=key)
+    except AnalyticsSnapshot.DoesNotExist:
+        return None
+
+    max_age = settings.ANALYTICS_SNAPSHOT_MAX_AGE
+    if max_age and snapshot.age > max_age:
+        return None
+    if changed_at_ns is not None and snapshot.watermark.timestamp() * 1e9 < changed_at_ns:
+        return None
+    return snapshot
+
+
+def snapshot_response(snapshot, payload):
+    age = snapshot.age
+    return Response({**payload, 'snapshot_age': age}, headers={'Age': str(age)})
+
+
+def changed_course_ids(since):
+    """ID курсів, у яких щось змінилося з моменту since (один UNION-запит)"""
+    sources = [
+        Course.objects.filter(updated_at__gte=since).values_list('id', flat=True),
+        Enrollment.objects.filter(enrollment_date__gte=since).values_list('course_id', flat=True),
+        StudentCourseProgress.objects.filter(updated_at__gte=since).values_list('course_id', flat=True),
+        Submission.objects.filter(updated_at__gte=since).values_list('assignment__course_id', flat=True),
+        Assignment.objects.filter(updated_at__gte=since).values_list('course_id', flat=True),
+        Module.objects.filter(updated_at__gte=since).values_list('course_id', flat=True),
+        Lesson.objects.filter(updated_at__gte=since).values_list('module__course_id', flat=True),
+    ]
+    return set(sources[0].union(*sources[1:]))
+
+
+def stale_course_ids():
+    """
+    ID курсів, чия версія кешу новіша за watermark їхнього знімка, - саме такі знімки відкидає
+    get_fresh_snapshot. Версію піднімає й post_delete, тож так видно і видалення (відрахування,
+    видалені здачі, уроки, прогрес), яких не знайти по updated_at.
+    """
+    watermarks = dict(AnalyticsSnapshot.objects.filter(course__isnull=False).values_list('course_id', 'watermark'))
+    namespaces = {course_cache_namespace(course_id): course_id for course_id in watermarks}
+    return {
+        namespaces[namespace]
+        for namespace, version in peek_cache_versions(list(namespaces)).items()
+        if watermarks[namespaces[namespace]].timestamp() * 1e9 < version
+    }
+
+
+def save_snapshot(key, data, watermark, course=None):
+    AnalyticsSnapshot.objects.update_or_create(
+        key=key,
+        defaults={'course': course, 'data': data, 'computed_at': timezone.now(), 'watermark': watermark},
+    )
+
+
+def refresh_snapshots(full=False):
+    """Оновлює знімок дашборду, графіків і лише тих курсів, що змінилися після попереднього запуску"""
+    from .views import AdminAnalyticsView, AnalyticsDataView, CourseAnalyticsView
+
+    watermark = timezone.now()
+    previous = AnalyticsSnapshot.objects.filter(key=DASHBOARD_KEY).values_list('watermark', flat=True).first()
+
+    courses = Course.objects.select_related('teacher')
+    if not full and previous is not None:
+        without_snapshot = ~Exists(AnalyticsSnapshot.objects.filter(course=OuterRef('pk')))
+        changed = changed_course_ids(previous) | stale_course_ids()
+        courses = courses.filter(without_snapshot) | courses.filter(id__in=changed)
+
+    course_view = CourseAnalyticsView()
+    refreshed_courses = 0
+    for course in courses:
+        save_snapshot(course_snapshot_key(course.id), course_view.build_analytics(course), watermark, course=course)
+        refreshed_courses += 1
+
+    chart_view = AnalyticsDataView()
+    refreshed_charts = 0
+    for chart_type in STATIC_CHART_TYPES:
+        save_snapshot(chart_snapshot_key(chart_type, None), chart_view.get_chart_data(chart_type, None), watermark)
+        refreshed_charts += 1
+    for chart_type in PERIOD_CHART_TYPES:
+        for period in SNAPSHOT_CHART_PERIODS:
+            save_snapshot(chart_snapshot_key(chart_type, period), chart_view.get_chart_data(chart_type, period), watermark)
+            refreshed_charts += 1
+
+    # Дашборд зберігається останнім: його watermark є точкою відліку для наступного запуску
+    save_snapshot(DASHBOARD_KEY, AdminAnalyticsView().build_analytics(), watermark)
+
+    return {'courses': refreshed_courses, 'charts': refreshed_charts}
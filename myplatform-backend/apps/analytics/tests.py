@@ -1,3 +1,295 @@
-from django.test import TestCase
+from io import StringIO
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db.models import Avg
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from apps.analytics.aggregates import build_course_statistics
+from apps.analytics.models import AnalyticsSnapshot
+from apps.analytics.snapshots import DASHBOARD_KEY, course_snapshot_key, refresh_snapshots
+from apps.assignments.models import Assignment, Submission
+from apps.categories.models import CourseCategory, CourseCategoryRelation
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.modules.models import Module
+from apps.users.models import CustomUser
+
+
+def legacy_course_statistics():
+    """Попередня реалізація AdminAnalyticsView.get_course_statistics (запит на кожен курс)"""
+    total_courses = Course.objects.count()
+    total_modules = Module.objects.count()
+    total_lessons = Lesson.objects.count()
+
+    categories_stats = []
+    for category in CourseCategory.objects.order_by('id'):
+        course_count = category.category_courses.count()
+        if course_count > 0:
+            categories_stats.append({
+                'name': category.name,
+                'course_count': course_count
+            })
+
+    popular_courses = []
+    for course in Course.objects.order_by('id'):
+        enrollment_count = Enrollment.objects.filter(course=course).count()
+        popular_courses.append({
+            'title': course.title,
+            'student_count': enrollment_count,
+            'teacher': course.teacher.get_full_name() if course.teacher else 'No teacher'
+        })
+    popular_courses.sort(key=lambda x: x['student_count'], reverse=True)
+    popular_courses = popular_courses[:5]
+
+    teachers_stats = []
+    for teacher in CustomUser.objects.filter(role='teacher').order_by('id'):
+        course_count = Course.objects.filter(teacher=teacher).count()
+        if course_count > 0:
+            teachers_stats.append({
+                'name': teacher.get_full_name(),
+                'username': teacher.username,
+                'course_count': course_count,
+                'student_count': Enrollment.objects.filter(course__teacher=teacher).count()
+            })
+
+    return {
+        'total_courses': total_courses,
+        'categories': categories_stats,
+        'average_modules_per_course': (
+            round(total_modules / total_courses, 2) if total_courses > 0 else 0
+        ),
+        'average_lessons_per_module': (
+            round(total_lessons / total_modules, 2) if total_modules > 0 else 0
+        ),
+        'most_popular_courses': popular_courses,
+        'courses_with_modules': Course.objects.filter(modules__isnull=False).distinct().count(),
+        'courses_with_assignments': Course.objects.filter(assignments__isnull=False).distinct().count(),
+        'courses_by_status': {
+            'free': Course.objects.filter(status='free').count(),
+            'premium': Course.objects.filter(status='premium').count()
+        },
+        'courses_by_teacher': teachers_stats,
+        'total_enrollments': Enrollment.objects.count(),
+        'average_enrollments_per_course': (
+            round(Enrollment.objects.count() / total_courses, 2) if total_courses > 0 else 0
+        ),
+        'recent_courses': [{
+            'title': course.title,
+            'created_at': course.created_at,
+            'teacher_name': course.teacher.get_full_name() if course.teacher else 'No teacher',
+            'status': course.status,
+            'enrollment_count': Enrollment.objects.filter(course=course).count()
+        } for course in Course.objects.order_by('-created_at')[:5]],
+        'price_statistics': {
+            'average_price': Course.objects.filter(status='premium').aggregate(Avg('price'))['price__avg'],
+            'total_premium_courses': Course.objects.filter(status='premium').count(),
+            'total_free_courses': Course.objects.filter(status='free').count()
+        }
+    }
+
+
+class CourseStatisticsTest(TestCase):
+
+    def setUp(self):
+        self.students = [
+            CustomUser.objects.create_user(username=f"student_{i}", password="1234567890HTML", role='student')
+            for i in range(12)
+        ]
+        self.categories = [
+            CourseCategory.objects.create(name=f"Category {i}") for i in range(4)
+        ]
+        self.teacher_count = 0
+        self.course_count = 0
+
+    def add_teacher(self, with_name=True):
+        self.teacher_count += 1
+        return CustomUser.objects.create_user(
+            username=f"teacher_{self.teacher_count}",
+            password="1234567890HTML",
+            role='teacher',
+            first_name="Andrii" if with_name else "",
+            last_name=f"Teacher{self.teacher_count}" if with_name else "",
+        )
+
+    def add_course(self, teacher, students=0, modules=0, lessons_per_module=0, assignments=0, categories=(), premium=False):
+        self.course_count += 1
+        course = Course.objects.create(
+            title=f"Course {self.course_count}",
+            description="Course Description",
+            teacher=teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='premium' if premium else 'free',
+            price=Decimal('10.00') * self.course_count if premium else None,
+        )
+        for student in self.students[:students]:
+            Enrollment.objects.create(course=course, student=student)
+        for i in range(modules):
+            module = Module.objects.create(course=course, title=f"Module {i}", description="Module Description")
+            for j in range(lessons_per_module):
+                Lesson.objects.create(module=module, title=f"Lesson {j}", content="Lesson Content")
+        for i in range(assignments):
+            Assignment.objects.create(course=course, teacher=teacher, title=f"Assignment {i}")
+        for category in categories:
+            CourseCategoryRelation.objects.create(course=course, category=category)
+        return course
+
+    def populate(self, scale):
+        for i in range(scale):
+            teacher = self.add_teacher(with_name=bool(i % 2))
+            self.add_course(teacher, students=(i * 5) % 13, modules=i % 3, lessons_per_module=2,
+                            assignments=i % 2, categories=self.categories[:i % 4], premium=bool(i % 3 == 0))
+            self.add_course(teacher, students=i % 4, premium=bool(i % 2))
+        self.add_teacher()  # викладач без курсів
+
+    def test_empty_database(self):
+        self.assertEqual(build_course_statistics(), legacy_course_statistics())
+
+    def test_matches_legacy_implementation(self):
+        self.populate(scale=7)
+        self.assertEqual(build_course_statistics(), legacy_course_statistics())
+
+    def test_query_count_does_not_depend_on_data_size(self):
+        self.populate(scale=2)
+        with self.assertNumQueries(8):
+            build_course_statistics()
+
+        self.populate(scale=20)
+        with self.assertNumQueries(8):
+            statistics = build_course_statistics()
+        self.assertEqual(statistics, legacy_course_statistics())
+
+
+class AnalyticsSnapshotTest(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.admin = CustomUser.objects.create_user(username="admin", password="1234567890HTML", role='admin')
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.student = CustomUser.objects.create_user(username="student", password="1234567890HTML", role='student')
+        self.courses = [
+            Course.objects.create(
+                title=f"Course {i}",
+                description="Course Description",
+                teacher=self.teacher,
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=30),
+                duration=30,
+                batch_number=1,
+                status='free'
+            ) for i in range(3)
+        ]
+
+    def computed_at(self):
+        return dict(AnalyticsSnapshot.objects.values_list('key', 'computed_at'))
+
+    def test_refresh_recomputes_only_changed_courses(self):
+        self.assertEqual(refresh_snapshots()['courses'], 3)
+        self.assertEqual(refresh_snapshots()['courses'], 0)
+
+        before = self.computed_at()
+        Enrollment.objects.create(course=self.courses[1], student=self.student)
+        self.assertEqual(refresh_snapshots()['courses'], 1)
+
+        after = self.computed_at()
+        self.assertNotEqual(after[course_snapshot_key(self.courses[1].id)], before[course_snapshot_key(self.courses[1].id)])
+        self.assertEqual(after[course_snapshot_key(self.courses[0].id)], before[course_snapshot_key(self.courses[0].id)])
+        self.assertEqual(
+            AnalyticsSnapshot.objects.get(key=course_snapshot_key(self.courses[1].id)).data['course_info']['total_students'], 1
+        )
+
+        self.assertEqual(refresh_snapshots(full=True)['courses'], 3)
+
+    def test_incremental_refresh_sees_deletions(self):
+        enrollment = Enrollment.objects.create(course=self.courses[1], student=self.student)
+        refresh_snapshots()
+        self.assertEqual(refresh_snapshots()['courses'], 0)
+
+        # Видалення не залишає updated_at - курс знаходиться за версією кешу, яку підняв post_delete
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment.delete()
+        self.assertEqual(refresh_snapshots()['courses'], 1)
+        self.assertEqual(
+            AnalyticsSnapshot.objects.get(key=course_snapshot_key(self.courses[1].id)).data['course_info']['total_students'], 0
+        )
+        self.assertEqual(refresh_snapshots()['courses'], 0)
+
+    def test_views_serve_snapshots_with_age(self):
+        call_command('refresh_analytics', stdout=StringIO())
+        self.client.login(username="admin", password="1234567890HTML")
+
+        response = self.client.get(reverse('analytics-dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('snapshot_age', response.data)
+        self.assertIn('Age', response)
+        self.assertEqual(response.data['courses']['total_courses'], 3)
+
+        response = self.client.get(reverse('course-analytics', kwargs={'course_id': self.courses[0].id}))
+        self.assertEqual(response.data['course_info']['title'], "Course 0")
+        self.assertIn('snapshot_age', response.data)
+
+        response = self.client.get(reverse('analytics-charts'), {'type': 'enrollment_trends', 'period': '7'})
+        self.assertEqual(response.data['title'], 'Enrollment Trends')
+        self.assertIn('snapshot_age', response.data)
+
+        AnalyticsSnapshot.objects.filter(key=DASHBOARD_KEY).delete()
+        response = self.client.get(reverse('analytics-dashboard'))
+        self.assertNotIn('snapshot_age', response.data)
+
+    def test_course_analytics_invalidated_by_grading(self):
+        self.client.login(username="admin", password="1234567890HTML")
+        course = self.courses[0]
+        assignment = Assignment.objects.create(course=course, teacher=self.teacher, title="Essay")
+        with self.captureOnCommitCallbacks(execute=True):
+            submission = Submission.objects.create(student=self.student, assignment=assignment, status='submitted')
+        url = reverse('course-analytics', kwargs={'course_id': course.id})
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['assignments']['submissions']['pending'], 1)
+
+        # Без змін повторний запит іде з кешу: лише сесія, користувач, курс і пошук знімка
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+        submission.status = 'graded'
+        with self.captureOnCommitCallbacks(execute=True):
+            submission.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data['assignments']['submissions']['graded'], 1)
+
+        # Знімок, порахований до зміни, більше не віддається
+        refresh_snapshots()
+        self.assertIn('snapshot_age', self.client.get(url).data)
+        with self.captureOnCommitCallbacks(execute=True):
+            Enrollment.objects.create(course=course, student=self.student)
+        response = self.client.get(url)
+        self.assertNotIn('snapshot_age', response.data)
+        self.assertEqual(response.data['course_info']['total_students'], 1)
+
+    def test_course_analytics_invalidated_by_bulk_grading(self):
+        self.client.login(username="admin", password="1234567890HTML")
+        course = self.courses[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            Enrollment.objects.create(course=course, student=self.student)
+            assignment = Assignment.objects.create(course=course, teacher=self.teacher, title="Essay")
+            Submission.objects.filter(assignment=assignment).update(status='submitted')
+        url = reverse('course-analytics', kwargs={'course_id': course.id})
+        self.assertEqual(self.client.get(url).data['assignments']['submissions']['pending'], 1)
+
+        teacher_client = Client()
+        teacher_client.force_login(self.teacher)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = teacher_client.post(
+                reverse('bulk_grade_submissions', args=[assignment.id]),
+                {'items': [{'student_id': self.student.id, 'grade': '90'}]}, content_type='application/json'
+            )
+        self.assertEqual(response.json()['updated'], 1)
+
+        submissions = self.client.get(url).data['assignments']['submissions']
+        self.assertEqual((submissions['pending'], submissions['graded']), (0, 1))
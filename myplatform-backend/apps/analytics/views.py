@@ -5,7 +5,6 @@ from django.db.models import Count, Q
 from django.utils import timezone
 from apps.courses.models import Course
 from apps.enrollments.models import Enrollment
-from apps.categories.models import CourseCategory
 from apps.modules.models import Module
 from apps.lessons.models import Lesson
 from apps.assignments.models import Assignment, Submission
@@ -16,12 +15,15 @@ from apps.users.models import CustomUser
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.core.cache import cache
+from myplatform.cache import get_or_compute, peek_cache_version, versioned_key
 from django.db.models import Count, Avg, Sum
 from django.utils import timezone
 from datetime import timedelta
 
 from apps.assignments.mixins import CsrfExemptSessionAuthentication
+from .aggregates import build_course_statistics, build_student_completion_stats, build_student_progress
+from .signals import course_cache_namespace
+from .snapshots import DASHBOARD_KEY, chart_snapshot_key, course_snapshot_key, get_fresh_snapshot, snapshot_response
 
 from django.db.models import F, Count, Avg, Sum, Q, Max, Min
 
@@ -30,12 +32,8 @@ class AdminAnalyticsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get_cached_data(self, key, callback, timeout=300):
-        """Отримання кешованих даних або їх обчислення"""
-        data = cache.get(key)
-        if data is None:
-            data = callback()
-            cache.set(key, data, timeout)
-        return data
+        """Отримання кешованих даних або їх обчислення (один воркер на ключ)"""
+        return get_or_compute(key, callback, timeout)
 
     def get_user_statistics(self):
         """Статистика користувачів"""
@@ -69,77 +67,7 @@ class AdminAnalyticsView(APIView):
     def get_course_statistics(self):
         """Статистика курсів"""
         try:
-            total_courses = Course.objects.count()
-            total_modules = Module.objects.count()
-            total_lessons = Lesson.objects.count()
-
-            categories_stats = []
-            for category in CourseCategory.objects.all():
-                course_count = category.category_courses.count()  
-                if course_count > 0:  
-                    categories_stats.append({
-                        'name': category.name,
-                        'course_count': course_count
-                    })
-                    
-            popular_courses = []
-            for course in Course.objects.all():
-                enrollment_count = Enrollment.objects.filter(course=course).count()
-                popular_courses.append({
-                    'title': course.title,
-                    'student_count': enrollment_count,
-                    'teacher': course.teacher.get_full_name() if course.teacher else 'No teacher'
-                })
-            
-            popular_courses.sort(key=lambda x: x['student_count'], reverse=True)
-            popular_courses = popular_courses[:5]
-
-            teachers_stats = []
-            for teacher in CustomUser.objects.filter(role='teacher'):
-                course_count = Course.objects.filter(teacher=teacher).count()
-                if course_count > 0:
-                    teachers_stats.append({
-                        'name': teacher.get_full_name(),
-                        'username': teacher.username,
-                        'course_count': course_count,
-                        'student_count': Enrollment.objects.filter(course__teacher=teacher).count()
-                    })
-
-            return {
-                'total_courses': total_courses,
-                'categories': categories_stats,
-                'average_modules_per_course': (
-                    round(total_modules / total_courses, 2) if total_courses > 0 else 0
-                ),
-                'average_lessons_per_module': (
-                    round(total_lessons / total_modules, 2) if total_modules > 0 else 0
-                ),
-                'most_popular_courses': popular_courses,
-                'courses_with_modules': Course.objects.filter(modules__isnull=False).distinct().count(),
-                'courses_with_assignments': Course.objects.filter(assignments__isnull=False).distinct().count(),
-                'courses_by_status': {
-                    'free': Course.objects.filter(status='free').count(),
-                    'premium': Course.objects.filter(status='premium').count()
-                },
-                'courses_by_teacher': teachers_stats,
-                'total_enrollments': Enrollment.objects.count(),
-                'average_enrollments_per_course': (
-                    round(Enrollment.objects.count() / total_courses, 2) if total_courses > 0 else 0
-                ),
-                'recent_courses': [{
-                    'title': course.title,
-                    'created_at': course.created_at,
-                    'teacher_name': course.teacher.get_full_name() if course.teacher else 'No teacher',
-                    'status': course.status,
-                    'enrollment_count': Enrollment.objects.filter(course=course).count()
-                } for course in Course.objects.order_by('-created_at')[:5]],
-      
-                'price_statistics': {
-                    'average_price': Course.objects.filter(status='premium').aggregate(Avg('price'))['price__avg'],
-                    'total_premium_courses': Course.objects.filter(status='premium').count(),
-                    'total_free_courses': Course.objects.filter(status='free').count()
-                }
-            }
+            return build_course_statistics()
         except Exception as e:
             print(f"Error in course statistics: {str(e)}")
             return {
@@ -211,27 +139,7 @@ class AdminAnalyticsView(APIView):
     def get_student_completion_stats(self):
         """Отримання статистики завершення по студентах"""
         try:
-            students = CustomUser.objects.filter(role='student')
-            student_stats = []
-
-            for student in students:
-                completed_lessons = LessonProgress.objects.filter(
-                    student=student
-                ).exclude(completed_at=None).count()
-                
-                completed_modules = ModuleProgress.objects.filter(
-                    student=student
-                ).exclude(completed_at=None).count()
-
-                if completed_lessons > 0 or completed_modules > 0:
-                    student_stats.append({
-                        'student_name': student.get_full_name(),
-                        'username': student.username,
-                        'completed_lessons': completed_lessons,
-                        'completed_modules': completed_modules
-                    })
-
-            return student_stats
+            return build_student_completion_stats()
         except Exception as e:
             print(f"Error in student completion stats: {str(e)}")
             return []
@@ -316,10 +224,23 @@ class AdminAnalyticsView(APIView):
             print(f"Error in assignment details: {str(e)}")
             return []
 
+    def build_analytics(self):
+        """Повний набір даних дашборду без кешу (для знімків refresh_analytics)"""
+        return {
+            'users': self.get_user_statistics(),
+            'courses': self.get_course_statistics(),
+            'progress': self.get_progress_statistics(),
+            'assignments': self.get_assignment_statistics()
+        }
+
     def get(self, request):
         if request.user.role != 'admin':
             return Response({"error": "Only admin can access analytics"}, status=403)
 
+        snapshot = get_fresh_snapshot(DASHBOARD_KEY)
+        if snapshot is not None:
+            return snapshot_response(snapshot, {'timestamp': snapshot.computed_at, **snapshot.data})
+
         analytics_data = {
             'timestamp': timezone.now(),
             'users': self.get_cached_data('user_stats', self.get_user_statistics),
@@ -331,6 +252,9 @@ class AdminAnalyticsView(APIView):
         return Response(analytics_data)
     
 
+COURSE_ANALYTICS_CACHE_TIMEOUT = 6 * 60 * 60
+
+
 class CourseAnalyticsView(APIView):
     authentication_classes = [CsrfExemptSessionAuthentication]
     permission_classes = [IsAuthenticated]
@@ -405,30 +329,7 @@ class CourseAnalyticsView(APIView):
 
     def get_student_progress(self, course):
         """Статистика прогресу по студентах"""
-        enrollments = Enrollment.objects.filter(course=course)
-        student_progress = []
-
-        for enrollment in enrollments:
-            student = enrollment.student
-            completed_lessons = LessonProgress.objects.filter(
-                student=student,
-                lesson__module__course=course
-            ).exclude(completed_at=None).count()
-
-            completed_modules = ModuleProgress.objects.filter(
-                student=student,
-                module__course=course
-            ).exclude(completed_at=None).count()
-
-            student_progress.append({
-                'student_name': f"{student.first_name} {student.last_name}",
-                'username': student.username,
-                'completed_lessons': completed_lessons,
-                'completed_modules': completed_modules,
-                'last_activity': student.last_login
-            })
-
-        return student_progress
+        return build_student_progress(course)
 
     def get_assignment_statistics(self, course):
         """Статистика завдань курсу"""
@@ -496,28 +397,33 @@ class CourseAnalyticsView(APIView):
         except Course.DoesNotExist:
             return Response({"error": "Course not found"}, status=404)
 
-        cache_key = f'course_analytics_{course_id}'
-        cached_data = cache.get(cache_key)
-
-        if cached_data is None:
-            analytics_data = {
-                'course_info': {
-                    'title': course.title,
-                    'teacher': course.teacher.get_full_name(),
-                    'start_date': course.start_date,
-                    'end_date': course.end_date,
-                    'status': course.status,
-                    'total_students': Enrollment.objects.filter(course=course).count()
-                },
-                'enrollments': self.get_enrollment_statistics(course),
-                'progress': self.get_progress_statistics(course),
-                'assignments': self.get_assignment_statistics(course),
-                'timestamp': timezone.now()
-            }
-            cache.set(cache_key, analytics_data, 300)  
-            return Response(analytics_data)
+        namespace = course_cache_namespace(course.id)
+        snapshot = get_fresh_snapshot(course_snapshot_key(course.id), changed_at_ns=peek_cache_version(namespace))
+        if snapshot is not None:
+            return snapshot_response(snapshot, snapshot.data)
+
+        # Версія піднімається сигналами при кожній зміні даних курсу, тож запис може жити годинами
+        analytics_data = get_or_compute(
+            versioned_key(namespace), lambda: self.build_analytics(course), COURSE_ANALYTICS_CACHE_TIMEOUT
+        )
+        return Response(analytics_data)
 
-        return Response(cached_data)
+    def build_analytics(self, course):
+        """Повна аналітика курсу без кешу"""
+        return {
+            'course_info': {
+                'title': course.title,
+                'teacher': course.teacher.get_full_name(),
+                'start_date': course.start_date,
+                'end_date': course.end_date,
+                'status': course.status,
+                'total_students': Enrollment.objects.filter(course=course).count()
+            },
+            'enrollments': self.get_enrollment_statistics(course),
+            'progress': self.get_progress_statistics(course),
+            'assignments': self.get_assignment_statistics(course),
+            'timestamp': timezone.now()
+        }
     
 from django.db.models import Count, Avg, Sum
 from django.db.models.functions import TruncMonth, TruncDay
@@ -534,24 +440,33 @@ class AnalyticsDataView(APIView):
         chart_type = request.query_params.get('type', 'enrollment_trends')
         period = request.query_params.get('period', '30')
 
+        snapshot = get_fresh_snapshot(chart_snapshot_key(chart_type, period))
+        if snapshot is not None:
+            return snapshot_response(snapshot, snapshot.data)
+
         try:
-            if chart_type == 'enrollment_trends':
-                data = self.get_enrollment_trends(period)
-            elif chart_type == 'course_popularity':
-                data = self.get_course_popularity()
-            elif chart_type == 'student_progress':
-                data = self.get_student_progress_stats()
-            elif chart_type == 'assignment_completion':
-                data = self.get_assignment_completion_stats()
-            elif chart_type == 'user_activity':
-                data = self.get_user_activity(period)
-            else:
+            data = self.get_chart_data(chart_type, period)
+            if data is None:
                 return Response({"error": "Invalid chart type"}, status=400)
 
             return Response(data)
         except Exception as e:
             return Response({"error": str(e)}, status=500)
 
+    def get_chart_data(self, chart_type, period):
+        """Дані графіка потрібного типу або None для невідомого типу"""
+        if chart_type == 'enrollment_trends':
+            return self.get_enrollment_trends(period)
+        elif chart_type == 'course_popularity':
+            return self.get_course_popularity()
+        elif chart_type == 'student_progress':
+            return self.get_student_progress_stats()
+        elif chart_type == 'assignment_completion':
+            return self.get_assignment_completion_stats()
+        elif chart_type == 'user_activity':
+            return self.get_user_activity(period)
+        return None
+
     def get_enrollment_trends(self, period):
         """Тренди зарахувань на курси"""
         end_date = timezone.now()
@@ -5,3 +5,6 @@ from django.apps import AppConfig
 class AssignmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.assignments'
+
+    def ready(self):
+        import apps.assignments.signals
@@ -0,0 +1,90 @@
+# apps/assignments/counters.py
+"""
+Лічильники статусів здач на рядку Assignment (assigned_count, submitted_count, ...).
+
+Кожна зміна статусу Submission зсуває два лічильники одним UPDATE у тій самій транзакції,
+тож сторінка завдання читає готові числа замість COUNT по submissions. Розбіжності
+(каскадні видалення, ручні правки в БД) виправляє reconcile_counters / manage.py reconcile_assignment_counters.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from .models import Assignment, Submission
+
+COUNTER_FIELDS = list(Assignment.STATUS_COUNTER_FIELDS)
+
+
+def shift_status_counters(assignment_id, old_status, new_status, count=1):
+    """count здач assignment_id перейшли з old_status у new_status (None - здачі не було / більше немає)"""
+    if old_status == new_status or not count:
+        return
+    updates = {}
+    if old_status is not None:
+        # Не нижче нуля: лічильник, що вже розійшовся з даними, не повинен ламати запит (CHECK >= 0)
+        updates[f'{old_status}_count'] = Greatest(F(f'{old_status}_count') - count, 0)
+    if new_status is not None:
+        updates[f'{new_status}_count'] = F(f'{new_status}_count') + count
+    Assignment.objects.filter(id=assignment_id).update(**updates)
+
+
+def apply_status_transitions(assignment_id, transitions):
+    """Сумарний зсув лічильників для пар (старий статус, новий статус) - одним UPDATE"""
+    deltas = {}
+    for old_status, new_status in transitions:
+        if old_status == new_status:
+            continue
+        deltas[old_status] = deltas.get(old_status, 0) - 1
+        deltas[new_status] = deltas.get(new_status, 0) + 1
+    updates = {
+        f'{status}_count': Greatest(F(f'{status}_count') + delta, 0)
+        for status, delta in deltas.items() if delta
+    }
+    if updates:
+        Assignment.objects.filter(id=assignment_id).update(**updates)
+
+
+def save_submission(submission):
+    """submission.save() разом зі зсувом лічильників; викликати всередині transaction.atomic()"""
+    # Блокування рядка: дві паралельні зміни однієї здачі не порахують той самий перехід двічі
+    old_status = Submission.objects.select_for_update().filter(id=submission.id).values_list('status', flat=True).get()
+    submission.save()
+    shift_status_counters(submission.assignment_id, old_status, submission.status)
+
+
+def actual_status_counts(assignment_ids):
+    counts = {assignment_id: dict.fromkeys(COUNTER_FIELDS, 0) for assignment_id in assignment_ids}
+    rows = (
+        Submission.objects.filter(assignment_id__in=assignment_ids)
+        .values('assignment_id', 'status')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for row in rows:
+        counts[row['assignment_id']][f"{row['status']}_count"] = row['total']
+    return counts
+
+
+def reconcile_counters(assignments=None, dry_run=False, batch_size=1000):
+    """Перераховує лічильники пакетами по batch_size завдань; повертає кількість виправлених рядків"""
+    if assignments is None:
+        assignments = Assignment.objects.all()
+    assignment_ids = list(assignments.order_by('id').values_list('id', flat=True))
+    repaired = 0
+    for start in range(0, len(assignment_ids), batch_size):
+        batch_ids = assignment_ids[start:start + batch_size]
+        with transaction.atomic():
+            # Рядки завдань заблоковано до кінця пакета: паралельний зсув лічильника дочекається
+            # перерахунку і застосується вже поверх нього
+            stored = Assignment.objects.select_for_update().filter(id__in=batch_ids).values('id', *COUNTER_FIELDS)
+            stored = {row.pop('id'): row for row in stored}
+            actual = actual_status_counts(list(stored))
+            drifted = [
+                Assignment(id=assignment_id, **actual[assignment_id])
+                for assignment_id, counters in stored.items() if counters != actual[assignment_id]
+            ]
+            if drifted and not dry_run:
+                Assignment.objects.bulk_update(drifted, COUNTER_FIELDS)
+        repaired += len(drifted)
+    return repaired
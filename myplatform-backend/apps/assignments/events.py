@@ -0,0 +1,145 @@
+# apps/assignments/events.py
+"""
+Server-sent events про зміну статусу здачі (оцінено / повернуто на доопрацювання).
+
+Студент тримає одне з'єднання GET /api/assignments/events/ замість того, щоб опитувати
+StudentAssignmentListView. Ендпоінт - окремий ASGI-застосунок, який myplatform/asgi.py
+ставить перед Django: стандартний ASGIHandler тримає на кожен відкритий запит власний
+потік (ThreadSensitiveContext) і з'єднання з БД, а тут з'єднання, що простоює, - це лише
+корутина і черга. Сесія перевіряється один раз на початку, після чого з'єднання з БД закривається.
+"""
+
+import asyncio
+import json
+from http.cookies import SimpleCookie
+from importlib import import_module
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.http import HttpRequest, JsonResponse
+
+from myplatform.pubsub import get_broker, publish_on_commit
+
+EVENTS_PATH = '/api/assignments/events/'
+
+
+def user_channel(user_id):
+    return f"user.{user_id}"
+
+
+def publish_submission_status(submission):
+    """Подія 'submission' для студента після коміту поточної транзакції"""
+    publish_on_commit(user_channel(submission.student_id), {
+        'event': 'submission',
+        'submission_id': submission.id,
+        'assignment_id': submission.assignment_id,
+        'status': submission.status,
+        'grade': submission.grade,
+    })
+
+
+def format_event(message):
+    return f"event: {message.get('event', 'message')}\ndata: {json.dumps(message, cls=DjangoJSONEncoder)}\n\n"
+
+
+def request_headers(scope):
+    return {name.decode('latin1').lower(): value.decode('latin1') for name, value in scope.get('headers', [])}
+
+
+def session_user_id(session_key):
+    """id автентифікованого користувача сесії або None (ті самі перевірки, що й AuthenticationMiddleware)"""
+    request = HttpRequest()
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+    try:
+        user = get_user(request)
+        return user.id if user.is_authenticated else None
+    finally:
+        # Потік пулу sync_to_async не повинен тримати з'єднання, поки висить SSE
+        connections.close_all()
+
+
+def cors_headers(origin):
+    if origin and (settings.CORS_ALLOW_ALL_ORIGINS or origin in settings.CORS_ALLOWED_ORIGINS):
+        return [
+            (b'access-control-allow-origin', origin.encode('latin1')),
+            (b'access-control-allow-credentials', b'true'),
+            (b'vary', b'Origin'),
+        ]
+    return []
+
+
+async def send_json(send, status, data, extra_headers=()):
+    body = json.dumps(data).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode()), *extra_headers],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def stream_events(send, channel, keepalive):
+    subscription = get_broker().subscribe(channel)
+    try:
+        await send({'type': 'http.response.body', 'body': f"retry: {settings.SSE_RETRY_MS}\n\n".encode(), 'more_body': True})
+        while True:
+            try:
+                message = await subscription.get(timeout=keepalive)
+            except asyncio.TimeoutError:
+                # Коментар SSE: не дає проксі закрити з'єднання, що простоює
+                chunk = ": keepalive\n\n"
+            else:
+                chunk = format_event(message)
+            await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+    finally:
+        subscription.close()
+
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def submission_events_app(scope, receive, send):
+    headers = request_headers(scope)
+    cors = cors_headers(headers.get('origin'))
+    if scope['method'] != 'GET':
+        return await send_json(send, 405, {"error": "Method not allowed"}, cors)
+
+    cookie = SimpleCookie(headers.get('cookie', '')).get(settings.SESSION_COOKIE_NAME)
+    user_id = None
+    if cookie is not None:
+        user_id = await sync_to_async(session_user_id, thread_sensitive=False)(cookie.value)
+    if user_id is None:
+        return await send_json(send, 401, {"error": "Authentication required"}, cors)
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+            *cors,
+        ],
+    })
+    tasks = [
+        asyncio.ensure_future(stream_events(send, user_channel(user_id), settings.SSE_KEEPALIVE)),
+        asyncio.ensure_future(wait_for_disconnect(receive)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def submission_events(request):
+    # Сюди запит доходить лише під WSGI: під ASGI шлях перехоплює myplatform/asgi.py
+    return JsonResponse({"error": "Server-sent events are served only over ASGI"}, status=501)
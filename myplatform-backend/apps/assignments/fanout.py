@@ -0,0 +1,68 @@
+# apps/assignments/fanout.py
+"""
+Створення записів Submission ('assigned') для пар студент-завдання курсу.
+
+Працює лише з id: студенти/завдання вибираються через values_list, а рядки вставляються
+INSERT ... ON CONFLICT DO NOTHING RETURNING - наявні пари пропускає unique (student, assignment),
+а RETURNING каже, які рядки справді вставлено. Лічильник assigned_count завдань збільшується
+саме на них у тій самій транзакції, тож пара, яку паралельно вставила інша транзакція, не рахується двічі.
+"""
+
+from django.db import connections, transaction
+from django.db.models import F
+from django.db.models.constants import OnConflict
+
+from apps.enrollments.models import Enrollment
+from .models import Assignment, Submission
+
+
+def insert_assigned_submissions(pairs):
+    """
+    Вставляє здачі 'assigned' для пар (student_id, assignment_id), наявні пари пропускає.
+    Повертає assignment_id кожного справді вставленого рядка.
+    """
+    submissions = [
+        Submission(student_id=student_id, assignment_id=assignment_id, status='assigned')
+        for student_id, assignment_id in pairs
+    ]
+    if not submissions:
+        return []
+    # bulk_create(ignore_conflicts=True) не повертає рядків, тому вставка - через той самий _insert з RETURNING
+    connection = connections[Submission.objects.db]
+    fields = [field for field in Submission._meta.concrete_fields if not field.primary_key]
+    returning_fields = [Submission._meta.get_field('assignment')]
+    batch_size = max(connection.ops.bulk_batch_size(fields, submissions), 1)
+    inserted = []
+    for start in range(0, len(submissions), batch_size):
+        rows = Submission.objects._insert(
+            submissions[start:start + batch_size], fields=fields,
+            returning_fields=returning_fields, on_conflict=OnConflict.IGNORE,
+        )
+        # Для одного рядка, пропущеного через конфлікт, _insert повертає [None]
+        inserted.extend(row[0] for row in rows if row)
+    return inserted
+
+
+def create_submissions_for_assignment(assignment):
+    """Submission для кожного студента курсу assignment; повертає кількість вставлених рядків"""
+    student_ids = Enrollment.objects.filter(course_id=assignment.course_id).values_list('student_id', flat=True)
+    with transaction.atomic():
+        inserted = insert_assigned_submissions(
+            (student_id, assignment.id) for student_id in student_ids.distinct()
+        )
+        if inserted:
+            Assignment.objects.filter(id=assignment.id).update(assigned_count=F('assigned_count') + len(inserted))
+    return len(inserted)
+
+
+def create_submissions_for_enrollment(enrollment):
+    """Submission для кожного наявного завдання курсу, на який щойно записався студент"""
+    assignment_ids = Assignment.objects.filter(course_id=enrollment.course_id).values_list('id', flat=True)
+    with transaction.atomic():
+        # Повторний запис на курс: наявні здачі студента пропускає ON CONFLICT і вони не рахуються вдруге
+        inserted = insert_assigned_submissions(
+            (enrollment.student_id, assignment_id) for assignment_id in assignment_ids
+        )
+        if inserted:
+            Assignment.objects.filter(id__in=inserted).update(assigned_count=F('assigned_count') + 1)
+    return len(inserted)
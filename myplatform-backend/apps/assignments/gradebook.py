@@ -0,0 +1,285 @@
+# apps/assignments/gradebook.py
+"""
+Журнал оцінок курсу: експорт студенти × завдання в XLSX / CSV та імпорт зміненого файлу.
+
+Експорт - один запит по Submission, розгорнутий у стовпці (MAX(grade) FILTER по кожному завданню,
+GROUP BY студент), рядки читаються .iterator() і одразу пишуться у файл: CSV віддається потоком,
+XLSX пише xlsxwriter у режимі constant_memory (у пам'яті лише поточний рядок аркуша).
+
+Імпорт читає аркуш рядок за рядком (openpyxl read_only / csv), порівнює з поточними оцінками
+і записує лише змінені клітинки одним bulk_update. Порожня клітинка оцінку не змінює.
+Якщо оцінку змінили між читанням файлу і записом, імпорт не застосовується (GradebookConflictError).
+"""
+
+import csv
+import io
+import re
+import tempfile
+import zipfile
+from collections import defaultdict
+
+import openpyxl
+from openpyxl.utils.exceptions import InvalidFileException
+import xlsxwriter
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.analytics.signals import bump_course_version
+from apps.notifications.delivery import notify_each
+from .counters import apply_status_transitions
+from .events import publish_submission_status
+from .models import Assignment, Submission
+
+STUDENT_COLUMNS = ['student_id', 'username', 'first_name', 'last_name']
+# Стовпець завдання: "Назва (#12)" - за id імпорт знаходить завдання, навіть якщо назву змінено
+ASSIGNMENT_COLUMN_RE = re.compile(r'\(#(\d+)\)\s*$')
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 500
+GRADE_FIELD = serializers.DecimalField(max_digits=5, decimal_places=2)
+
+
+class GradebookImportError(Exception):
+    def __init__(self, message, errors=()):
+        super().__init__(message)
+        self.message = message
+        self.errors = list(errors)
+
+
+class GradebookConflictError(GradebookImportError):
+    pass
+
+
+def course_assignments(course_id):
+    return list(Assignment.objects.filter(course_id=course_id).order_by('id').values_list('id', 'title'))
+
+
+def header_row(assignments):
+    return STUDENT_COLUMNS + [f"{title} (#{assignment_id})" for assignment_id, title in assignments]
+
+
+def gradebook_rows(assignments):
+    """Рядки журналу (без заголовка): дані студента і оцінка за кожне завдання (None - немає)"""
+    if not assignments:
+        return
+    pivot = {
+        f'grade_{assignment_id}': Max('grade', filter=Q(assignment_id=assignment_id))
+        for assignment_id, _ in assignments
+    }
+    rows = (
+        Submission.objects.filter(assignment_id__in=[assignment_id for assignment_id, _ in assignments])
+        .values('student_id', 'student__username', 'student__first_name', 'student__last_name')
+        .annotate(**pivot)
+        .order_by('student__last_name', 'student__first_name', 'student_id')
+    )
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            row['student_id'], row['student__username'], row['student__first_name'], row['student__last_name'],
+            *(row[name] for name in pivot),
+        ]
+
+
+class _Echo:
+    """Псевдобуфер для csv.writer: writerow повертає рядок замість запису"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(assignments):
+    writer = csv.writer(_Echo())
+    # BOM - щоб Excel відкрив UTF-8 з кирилицею в назвах без перекодування
+    yield '\ufeff' + writer.writerow(header_row(assignments))
+    for row in gradebook_rows(assignments):
+        yield writer.writerow(row)
+
+
+def write_xlsx(assignments):
+    """Тимчасовий файл з XLSX журналу, позиція - на початку; файл видаляється після закриття"""
+    output = tempfile.TemporaryFile()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    worksheet = workbook.add_worksheet("Gradebook")
+    worksheet.freeze_panes(1, len(STUDENT_COLUMNS))
+    worksheet.write_row(0, 0, header_row(assignments), workbook.add_format({'bold': True}))
+    # constant_memory: рядки мають іти по порядку, кожен скидається на диск, щойно почато наступний
+    for index, row in enumerate(gradebook_rows(assignments), start=1):
+        worksheet.write_row(index, 0, row)
+    workbook.close()
+    output.seek(0)
+    return output
+
+
+def read_sheet(upload):
+    """Рядки завантаженого .csv / .xlsx (перший аркуш) як кортежі значень"""
+    name = upload.name.lower()
+    if name.endswith('.csv'):
+        # Помилки декодування з'являються лише під час читання рядків, тож ловимо їх тут, а не у view
+        try:
+            yield from csv.reader(io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''))
+        except UnicodeDecodeError:
+            raise GradebookImportError("The CSV file must be UTF-8 encoded.")
+        except csv.Error as e:
+            raise GradebookImportError(f"The CSV file could not be read: {e}.")
+    elif name.endswith('.xlsx'):
+        try:
+            workbook = openpyxl.load_workbook(upload.file, read_only=True, data_only=True)
+        except (zipfile.BadZipFile, InvalidFileException, KeyError):
+            raise GradebookImportError("The file is not a valid XLSX workbook.")
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    else:
+        raise GradebookImportError("Unsupported file type, upload a .csv or .xlsx file.")
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _parse_student_id(value):
+    # Числа з XLSX можуть прийти як float (12.0)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return int(str(value).strip())
+
+
+def parse_header(header, assignment_ids):
+    """(індекс стовпця student_id, {індекс стовпця: id завдання})"""
+    header = ['' if cell is None else str(cell).strip() for cell in header]
+    if 'student_id' not in header:
+        raise GradebookImportError("The header must contain a student_id column.")
+    columns = {}
+    errors = []
+    for index, title in enumerate(header):
+        match = ASSIGNMENT_COLUMN_RE.search(title)
+        if match is None:
+            continue
+        assignment_id = int(match.group(1))
+        if assignment_id not in assignment_ids:
+            errors.append({'row': 1, 'column': title, 'error': "Assignment does not belong to this course."})
+        elif assignment_id in columns.values():
+            errors.append({'row': 1, 'column': title, 'error': "Duplicate assignment column."})
+        else:
+            columns[index] = assignment_id
+    if errors:
+        raise GradebookImportError("The header has invalid assignment columns.", errors)
+    if not columns:
+        raise GradebookImportError("The header has no assignment columns.")
+    return header.index('student_id'), columns
+
+
+def diff_gradebook(course_id, rows):
+    """
+    Змінені клітинки аркуша: список словників row / submission_id / student_id / assignment_id / old_grade / grade.
+    Усі помилки файлу збираються і піднімаються разом одним GradebookImportError.
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        raise GradebookImportError("The file is empty.")
+    assignment_ids = set(Assignment.objects.filter(course_id=course_id).values_list('id', flat=True))
+    student_column, columns = parse_header(header, assignment_ids)
+
+    current = {
+        (student_id, assignment_id): (submission_id, grade)
+        for submission_id, student_id, assignment_id, grade in Submission.objects.filter(
+            assignment_id__in=list(columns.values())
+        ).values_list('id', 'student_id', 'assignment_id', 'grade').iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    }
+
+    changes = []
+    errors = []
+    seen = set()
+    for row_number, row in enumerate(rows, start=2):
+        if all(_is_blank(cell) for cell in row):
+            continue
+        raw_student = row[student_column] if student_column < len(row) else None
+        try:
+            student_id = _parse_student_id(raw_student)
+        except (TypeError, ValueError):
+            errors.append({'row': row_number, 'column': 'student_id', 'error': "A valid student_id is required."})
+            continue
+        if student_id in seen:
+            errors.append({'row': row_number, 'column': 'student_id', 'error': "Duplicate student_id."})
+            continue
+        seen.add(student_id)
+
+        for index, assignment_id in columns.items():
+            value = row[index] if index < len(row) else None
+            if _is_blank(value):
+                continue
+            column = header[index]
+            existing = current.get((student_id, assignment_id))
+            if existing is None:
+                errors.append({'row': row_number, 'column': column, 'error': "Submission not found."})
+                continue
+            try:
+                grade = GRADE_FIELD.run_validation(str(value).strip())
+            except serializers.ValidationError as e:
+                errors.append({'row': row_number, 'column': column, 'error': ' '.join(e.detail)})
+                continue
+            submission_id, old_grade = existing
+            if grade != old_grade:
+                changes.append({
+                    'row': row_number, 'submission_id': submission_id, 'student_id': student_id, 'assignment_id': assignment_id,
+                    'old_grade': old_grade, 'grade': grade,
+                })
+
+    if errors:
+        raise GradebookImportError("The file has invalid rows.", errors)
+    return changes
+
+
+def apply_gradebook(course_id, changes):
+    """
+    Записує оцінки changes (результат diff_gradebook) однією транзакцією; повертає кількість здач.
+    Якщо під блокуванням оцінка вже не дорівнює old_grade (її змінили після diff_gradebook),
+    нічого не записується - GradebookConflictError зі списком таких рядків.
+    """
+    grades = {change['submission_id']: change['grade'] for change in changes}
+    now = timezone.now()
+    with transaction.atomic():
+        # in_bulk сам ділить id__in на порції під ліміт параметрів БД
+        submissions = Submission.objects.select_for_update().only(
+            'id', 'student_id', 'assignment_id', 'status', 'grade', 'updated_at'
+        ).in_bulk(list(grades))
+        conflicts = [
+            {
+                'row': change['row'], 'student_id': change['student_id'], 'assignment_id': change['assignment_id'],
+                'error': "The grade was changed after the file was read.",
+            }
+            for change in changes
+            if change['submission_id'] not in submissions
+            or submissions[change['submission_id']].grade != change['old_grade']
+        ]
+        if conflicts:
+            raise GradebookConflictError("Some grades were changed during the import, nothing was applied.", conflicts)
+        by_assignment = defaultdict(list)
+        transitions = defaultdict(list)
+        for submission_id, submission in submissions.items():
+            transitions[submission.assignment_id].append((submission.status, 'graded'))
+            by_assignment[submission.assignment_id].append(submission)
+            submission.grade = grades[submission_id]
+            submission.status = 'graded'
+            submission.updated_at = now
+
+        Submission.objects.bulk_update(
+            submissions.values(), ['grade', 'status', 'updated_at'], batch_size=IMPORT_BATCH_SIZE
+        )
+        for assignment_id, pairs in transitions.items():
+            apply_status_transitions(assignment_id, pairs)
+        if submissions:
+            # bulk_update не надсилає post_save - версію кешу аналітики курсу піднімаємо самі
+            bump_course_version(course_id)
+
+        for submission in submissions.values():
+            publish_submission_status(submission)
+        titles = dict(Assignment.objects.filter(id__in=list(by_assignment)).values_list('id', 'title'))
+        for assignment_id, graded in by_assignment.items():
+            notify_each(
+                'submission_graded', [(submission.student_id, submission.id) for submission in graded],
+                f"Your submission for \"{titles[assignment_id]}\" was graded", course_id=course_id
+            )
+    return len(submissions)
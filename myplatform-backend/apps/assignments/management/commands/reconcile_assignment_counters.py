@@ -0,0 +1,26 @@
+# apps/assignments/management/commands/reconcile_assignment_counters.py
+
+from django.core.management.base import BaseCommand
+
+from apps.assignments.counters import reconcile_counters
+from apps.assignments.models import Assignment
+
+
+class Command(BaseCommand):
+    help = "Перераховує лічильники статусів здач на Assignment і виправляє розбіжності"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, default=None, help="Лише завдання цього курсу")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Лише показати кількість розбіжностей")
+
+    def handle(self, *args, **options):
+        assignments = Assignment.objects.all()
+        if options['course'] is not None:
+            assignments = assignments.filter(course_id=options['course'])
+
+        repaired = reconcile_counters(assignments, dry_run=options['dry_run'], batch_size=options['batch_size'])
+        if options['dry_run']:
+            self.stdout.write(f"{repaired} assignments have drifted counters")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Repaired counters of {repaired} assignments"))
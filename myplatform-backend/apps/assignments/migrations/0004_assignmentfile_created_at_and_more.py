@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-18 17:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0003_submission_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignmentfile',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='assignmentfile',
+            index=models.Index(fields=['is_temp', 'created_at'], name='assignments_is_temp_0a81c2_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.6 on 2026-10-18 17:51
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_status_counters(apps, schema_editor):
+    Assignment = apps.get_model('assignments', 'Assignment')
+    Submission = apps.get_model('assignments', 'Submission')
+
+    for status in ('assigned', 'submitted', 'graded', 'returned'):
+        counts = (
+            Submission.objects.filter(assignment=OuterRef('pk'), status=status)
+            .order_by().values('assignment').annotate(total=Count('id')).values('total')
+        )
+        Assignment.objects.update(**{f'{status}_count': Coalesce(Subquery(counts), 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0004_assignmentfile_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignment',
+            name='assigned_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='graded_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='returned_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='submitted_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_status_counters, migrations.RunPython.noop),
+    ]
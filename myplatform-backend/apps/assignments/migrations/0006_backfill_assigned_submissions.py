@@ -0,0 +1,41 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def backfill_assigned_submissions(apps, schema_editor):
+    """Здачі 'assigned' для студентів, записаних на курс до появи fan-out, і перерахунок assigned_count"""
+    Assignment = apps.get_model('assignments', 'Assignment')
+    Enrollment = apps.get_model('enrollments', 'Enrollment')
+    Submission = apps.get_model('assignments', 'Submission')
+
+    for assignment_id, course_id in list(Assignment.objects.values_list('id', 'course_id')):
+        student_ids = (
+            Enrollment.objects.filter(course_id=course_id)
+            .exclude(student_id__in=Submission.objects.filter(assignment_id=assignment_id).values('student_id'))
+            .values_list('student_id', flat=True).distinct()
+        )
+        Submission.objects.bulk_create([
+            Submission(student_id=student_id, assignment_id=assignment_id, status='assigned')
+            for student_id in student_ids
+        ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+    counts = (
+        Submission.objects.filter(assignment=OuterRef('pk'), status='assigned')
+        .order_by().values('assignment').annotate(total=Count('id')).values('total')
+    )
+    Assignment.objects.update(assigned_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0005_assignment_status_counters'),
+        ('enrollments', '0002_alter_enrollment_enrollment_date'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_assigned_submissions, migrations.RunPython.noop),
+    ]
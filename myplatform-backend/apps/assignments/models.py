@@ -14,6 +14,25 @@ class Assignment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Кількість Submission у кожному статусі; оновлюються разом зі здачами (apps.assignments.counters),
+    # розбіжності виправляє manage.py reconcile_assignment_counters
+    assigned_count = models.PositiveIntegerField(default=0)
+    submitted_count = models.PositiveIntegerField(default=0)
+    graded_count = models.PositiveIntegerField(default=0)
+    returned_count = models.PositiveIntegerField(default=0)
+
+    STATUS_COUNTER_FIELDS = ('assigned_count', 'submitted_count', 'graded_count', 'returned_count')
+
+    def save(self, *args, **kwargs):
+        # Лічильники змінюють лише атомарні UPDATE: збереження раніше завантаженого об'єкта
+        # (напр. редагування назви) не повинно перезаписати їх застарілими значеннями
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.STATUS_COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
 
@@ -28,6 +47,13 @@ class AssignmentFile(models.Model):
     ])
     file_size = models.PositiveIntegerField()
     is_temp = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Пошук покинутих тимчасових файлів (manage.py gc_temp_files)
+            models.Index(fields=['is_temp', 'created_at']),
+        ]
 
     def __str__(self):
         return f"File for {self.assignment.title}"
@@ -56,6 +82,7 @@ class Submission(models.Model):
     feedback = models.TextField(blank=True)
     submission_date = models.DateTimeField(null=True, blank=True)  # <-- Додаємо null=True та blank=True
     returned_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ('student', 'assignment')
@@ -2,6 +2,7 @@
 
 from rest_framework import serializers
 from .models import Assignment, AssignmentFile, AssignmentLink, Submission, SubmissionFile
+from apps.storage.serializers import FileListSerializer, UploadStatusField
 from apps.users.serializers import CustomUserSerializer
 from urllib.parse import unquote, urlparse
 import urllib.parse
@@ -9,10 +10,12 @@ import urllib.parse
 class AssignmentFileSerializer(serializers.ModelSerializer):
 
     file_name = serializers.SerializerMethodField() 
+    upload_status = UploadStatusField()
 
     class Meta:
         model = AssignmentFile
-        fields = ['id', 'file_url', 'file_type', 'file_size', 'is_temp', 'assignment', 'file_name']
+        fields = ['id', 'file_url', 'file_type', 'file_size', 'is_temp', 'assignment', 'file_name', 'upload_status']
+        list_serializer_class = FileListSerializer
 
     def get_file_name(self, obj):
         
@@ -31,13 +34,16 @@ class AssignmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Assignment
         fields = '__all__'
+        read_only_fields = Assignment.STATUS_COUNTER_FIELDS
 
 class SubmissionFileSerializer(serializers.ModelSerializer):
     file_name = serializers.SerializerMethodField()
+    upload_status = UploadStatusField()
 
     class Meta:
         model = SubmissionFile
-        fields = ['id', 'file_url', 'file_type', 'file_size', 'submission', 'file_name']
+        fields = ['id', 'file_url', 'file_type', 'file_size', 'submission', 'file_name', 'upload_status']
+        list_serializer_class = FileListSerializer
 
     def get_file_name(self, obj):
         
@@ -61,4 +67,16 @@ class MultipleAssignmentLinksSerializer(serializers.Serializer):
     links = serializers.ListField(
         child=serializers.URLField(),
         allow_empty=False
-    )
\ No newline at end of file
+    )
+class BulkGradeItemSerializer(serializers.Serializer):
+    ACTION_CHOICES = [('grade', 'Grade'), ('return', 'Return')]
+
+    student_id = serializers.IntegerField()
+    action = serializers.ChoiceField(choices=ACTION_CHOICES, default='grade')
+    grade = serializers.DecimalField(max_digits=5, decimal_places=2, required=False, allow_null=True)
+    feedback = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate(self, data):
+        if data['action'] == 'grade' and data.get('grade') is None:
+            raise serializers.ValidationError({'grade': "Grade is required."})
+        return data
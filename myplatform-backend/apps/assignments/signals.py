@@ -0,0 +1,20 @@
+# apps/assignments/signals.py
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.enrollments.models import Enrollment
+from .fanout import create_submissions_for_assignment, create_submissions_for_enrollment
+from .models import Assignment
+
+
+@receiver(post_save, sender=Assignment)
+def create_submissions_on_assignment_add(sender, instance, created, **kwargs):
+    if created:
+        create_submissions_for_assignment(instance)
+
+
+@receiver(post_save, sender=Enrollment)
+def create_submissions_on_enrollment(sender, instance, created, **kwargs):
+    if created:
+        create_submissions_for_enrollment(instance)
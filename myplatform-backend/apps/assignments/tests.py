@@ -1,3 +1,702 @@
-from django.test import TestCase
+import asyncio
+import importlib
+import json
+import shutil
+import tempfile
+import urllib.parse
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+import boto3
+import openpyxl
+from asgiref.sync import sync_to_async
+from moto import mock_aws
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.analytics.signals import course_cache_namespace
+from apps.assignments.counters import reconcile_counters
+from apps.assignments.events import EVENTS_PATH, submission_events_app
+from apps.assignments.fanout import insert_assigned_submissions
+from apps.assignments.gradebook import diff_gradebook
+from apps.assignments.models import Assignment, AssignmentFile, AssignmentLink, Submission, SubmissionFile
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.jobs.models import Job
+from apps.storage.client import public_url, reset_s3_client
+from apps.users.models import CustomUser
+from myplatform.cache import peek_cache_version
+from myplatform.pubsub import get_broker
+from myplatform.testing import QueryBudgetMixin
+
+
+class SubmissionFanOutTest(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.client.login(username="andrii_teacher", password="1234567890HTML")
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=self.teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        self.students = CustomUser.objects.bulk_create([
+            CustomUser(username=f"student_{i}", email=f"student_{i}@example.com", password='!', role='student')
+            for i in range(200)
+        ])
+        Enrollment.objects.bulk_create([Enrollment(course=self.course, student=student) for student in self.students])
+
+    def test_assignment_creation_inserts_submissions_in_bulk(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('assignments-list'), {
+                'course': self.course.id, 'title': "Essay", 'description': "Write an essay",
+            })
+        self.assertEqual(response.status_code, 201)
+
+        assignment = Assignment.objects.get(id=response.json()['id'])
+        self.assertEqual(Submission.objects.filter(assignment=assignment, status='assigned').count(), 200)
+        # Студенти не завантажуються поодинці: кількість запитів не залежить від розміру курсу
+        self.assertLess(len(queries), 20)
+        user_queries = [query for query in queries if 'users_customuser' in query['sql']]
+        self.assertLessEqual(len(user_queries), 3)
+
+    def test_new_enrollment_gets_existing_assignments(self):
+        assignments = [
+            Assignment.objects.create(course=self.course, teacher=self.teacher, title=f"Assignment {i}")
+            for i in range(3)
+        ]
+        student = CustomUser.objects.create_user(username="late_student", password="1234567890HTML", role='student')
+
+        response = self.client.post(reverse('enroll_course'), {'course_id': self.course.id, 'student_id': student.id})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            set(Submission.objects.filter(student=student).values_list('assignment_id', flat=True)),
+            {assignment.id for assignment in assignments}
+        )
+
+        # Повторний запуск не дублює наявні пари і не рахує їх удруге
+        Enrollment.objects.filter(student=student).delete()
+        Enrollment.objects.create(course=self.course, student=student)
+        self.assertEqual(Submission.objects.filter(student=student).count(), 3)
+        self.assertEqual(
+            list(Assignment.objects.filter(course=self.course).values_list('assigned_count', flat=True)), [201] * 3
+        )
+
+    def test_skipped_pairs_are_not_counted(self):
+        assignment = Assignment.objects.create(course=self.course, teacher=self.teacher, title="Essay")
+        student = CustomUser.objects.create_user(username="late_student", password="1234567890HTML", role='student')
+        # Пару вже вставила інша транзакція (без зсуву лічильника тут)
+        Submission.objects.bulk_create([Submission(student=student, assignment=assignment, status='assigned')])
+
+        Enrollment.objects.create(course=self.course, student=student)
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.assigned_count, 200)
+
+        newcomer = CustomUser.objects.create_user(username="newcomer", password="1234567890HTML", role='student')
+        inserted = insert_assigned_submissions([(student.id, assignment.id), (newcomer.id, assignment.id)])
+        self.assertEqual(inserted, [assignment.id])
+
+    def test_migration_backfills_missing_submissions(self):
+        assignments = [
+            Assignment.objects.create(course=self.course, teacher=self.teacher, title=f"Assignment {i}")
+            for i in range(2)
+        ]
+        # Здачі, яких бракує студентам, записаним до появи fan-out
+        Submission.objects.filter(assignment=assignments[0], student__in=self.students[:50]).delete()
+        Submission.objects.filter(assignment=assignments[1]).delete()
+        Submission.objects.filter(assignment=assignments[0], student=self.students[50]).update(status='graded', grade=90)
+
+        migration = importlib.import_module('apps.assignments.migrations.0006_backfill_assigned_submissions')
+        migration.backfill_assigned_submissions(django_apps, None)
+
+        for assignment in assignments:
+            assignment.refresh_from_db()
+            self.assertEqual(Submission.objects.filter(assignment=assignment).count(), 200)
+        self.assertEqual((assignments[0].assigned_count, assignments[1].assigned_count), (199, 200))
+        self.assertEqual(Submission.objects.get(assignment=assignments[0], student=self.students[50]).status, 'graded')
+
+
+class SubmissionEventsTest(TransactionTestCase):
+    # Сесія перевіряється в окремому потоці (своє з'єднання з БД) - дані мають бути закомічені
+
+    def setUp(self):
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.student = CustomUser.objects.create_user(username="student", password="1234567890HTML", role='student')
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=self.teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        Enrollment.objects.create(course=self.course, student=self.student)
+        self.assignment = Assignment.objects.create(course=self.course, teacher=self.teacher, title="Essay")
+        self.client.force_login(self.student)
+
+    def grade(self):
+        client = Client()
+        client.force_login(self.teacher)
+        response = client.post(
+            reverse('grade_submission', args=[self.assignment.id, self.student.id]), {'grade': '95', 'feedback': "Good"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def open_events(self, cookie=''):
+        scope = {'type': 'http', 'method': 'GET', 'path': EVENTS_PATH, 'headers': [(b'cookie', cookie.encode())]}
+        incoming, sent = asyncio.Queue(), asyncio.Queue()
+        task = asyncio.ensure_future(submission_events_app(scope, incoming.get, sent.put))
+        return task, incoming, sent
+
+    async def test_grade_is_pushed_to_connected_student(self):
+        task, incoming, sent = self.open_events(f"sessionid={self.client.cookies['sessionid'].value}")
+        start = await asyncio.wait_for(sent.get(), 5)
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), start['headers'])
+        self.assertTrue((await sent.get())['body'].startswith(b"retry:"))
+
+        await sync_to_async(self.grade)()
+        event = (await asyncio.wait_for(sent.get(), 5))['body'].decode()
+        self.assertTrue(event.startswith("event: submission\n"))
+        data = json.loads(event.split("data: ", 1)[1])
+        self.assertEqual((data['assignment_id'], data['status'], data['grade']), (self.assignment.id, 'graded', "95"))
+
+        await incoming.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(task, 5)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    async def test_anonymous_connection_is_rejected(self):
+        task, _, sent = self.open_events("sessionid=missing")
+        await asyncio.wait_for(task, 5)
+        self.assertEqual((await sent.get())['status'], 401)
+
+    def test_not_served_over_wsgi(self):
+        self.assertEqual(self.client.get(reverse('submission_events')).status_code, 501)
+
+
+class TeacherAssignmentListTest(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.client.login(username="andrii_teacher", password="1234567890HTML")
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=self.teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        students = CustomUser.objects.bulk_create([
+            CustomUser(username=f"student_{i}", email=f"student_{i}@example.com", password='!', role='student')
+            for i in range(4)
+        ])
+        Enrollment.objects.bulk_create([Enrollment(course=self.course, student=student) for student in students])
+        self.assignments = [
+            Assignment.objects.create(course=self.course, teacher=self.teacher, title=f"Assignment {i}")
+            for i in range(30)
+        ]
+        # Завдання 1: 3 здачі чекають на оцінку, завдання 2: по одній кожного статусу
+        Submission.objects.filter(assignment=self.assignments[1], student__in=students[:3]).update(status='submitted')
+        for student, status in zip(students, ['assigned', 'submitted', 'graded', 'returned']):
+            Submission.objects.filter(assignment=self.assignments[2], student=student).update(status=status)
+
+    def test_counts_come_from_one_grouped_query(self):
+        url = reverse('teacher_assignments', args=[self.course.id])
+        with self.assertNumQueries(3):  # сесія, користувач, завдання з лічильниками
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        rows = {row['id']: row for row in response.json()}
+        self.assertEqual(len(rows), 30)
+        row = rows[self.assignments[2].id]
+        self.assertEqual(
+            (row['total_submissions'], row['graded_submissions'], row['returned_submissions']), (4, 1, 1)
+        )
+        self.assertNotIn('status_counts', row)
+
+    def test_breakdown_and_pending_ordering(self):
+        response = self.client.get(
+            reverse('teacher_assignments', args=[self.course.id]), {'breakdown': '1', 'ordering': '-pending'}
+        )
+        rows = response.json()
+        self.assertEqual([row['id'] for row in rows[:2]], [self.assignments[1].id, self.assignments[2].id])
+        self.assertEqual(rows[0]['pending_submissions'], 3)
+        self.assertEqual(
+            rows[1]['status_counts'], {'assigned': 1, 'submitted': 1, 'graded': 1, 'returned': 1}
+        )
+
+
+class AssignmentCountersTest(TestCase):
+
+    def setUp(self):
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=self.teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        self.students = [
+            CustomUser.objects.create_user(username=f"student_{i}", password="1234567890HTML", role='student')
+            for i in range(3)
+        ]
+        for student in self.students:
+            Enrollment.objects.create(course=self.course, student=student)
+        self.teacher_client = Client()
+        self.teacher_client.force_login(self.teacher)
+        response = self.teacher_client.post(reverse('assignments-list'), {'course': self.course.id, 'title': "Essay"})
+        self.assertEqual(response.json()['assigned_count'], 3)
+        self.assignment = Assignment.objects.get(id=response.json()['id'])
+
+    def counters(self):
+        self.assignment.refresh_from_db()
+        return tuple(getattr(self.assignment, field) for field in Assignment.STATUS_COUNTER_FIELDS)
+
+    def test_status_transitions_move_counters(self):
+        student_client = Client()
+        student_client.force_login(self.students[0])
+        student_client.post(reverse('submit_assignment', args=[self.assignment.id]), {'comment': "Done"})
+        self.assertEqual(self.counters(), (2, 1, 0, 0))
+
+        grade_url = reverse('grade_submission', args=[self.assignment.id, self.students[0].id])
+        self.teacher_client.post(grade_url, {'grade': '90'})
+        self.teacher_client.post(grade_url, {'grade': '95'})
+        self.assertEqual(self.counters(), (2, 0, 1, 0))
+
+        self.teacher_client.post(reverse('return_submission', args=[self.assignment.id, self.students[0].id]))
+        self.assertEqual(self.counters(), (2, 0, 0, 1))
+
+        student_client.post(reverse('cancel_submission_assigment', args=[self.assignment.id]))
+        self.assertEqual(self.counters(), (3, 0, 0, 0))
+
+        # Редагування завдання не перезаписує лічильники значеннями з завантаженого об'єкта
+        student_client.post(reverse('submit_assignment', args=[self.assignment.id]), {'comment': "Again"})
+        response = self.teacher_client.patch(
+            reverse('assignments-detail', args=[self.assignment.id]), {'title': "Long essay", 'submitted_count': 100},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counters(), (2, 1, 0, 0))
+
+    def test_teacher_detail_reads_stored_counters(self):
+        Submission.objects.filter(assignment=self.assignment, student=self.students[1]).update(status='graded')
+        Assignment.objects.filter(id=self.assignment.id).update(assigned_count=2, graded_count=1)
+
+        with self.assertNumQueries(6):  # сесія, користувач, завдання, кількість студентів, файли, посилання
+            response = self.teacher_client.get(reverse('assignment_detail', args=[self.assignment.id]))
+        data = response.json()
+        self.assertEqual(
+            (data['total_students'], data['assigned_students'], data['graded_students'], data['submitted_students']),
+            (3, 2, 1, 0)
+        )
+
+    def test_teacher_detail_counts_enrolled_students(self):
+        # Здача відрахованого студента лишається, а студент без здачі (bulk_create без сигналу) - ні
+        Enrollment.objects.filter(course=self.course, student=self.students[2]).delete()
+        newcomer = CustomUser.objects.create_user(username="late_student", password="!", role='student')
+        Enrollment.objects.bulk_create([Enrollment(course=self.course, student=newcomer)])
+
+        data = self.teacher_client.get(reverse('assignment_detail', args=[self.assignment.id])).json()
+        self.assertEqual((data['total_students'], data['assigned_students']), (3, 3))
+
+    def test_reconcile_command_repairs_drift(self):
+        Submission.objects.filter(assignment=self.assignment, student=self.students[0]).update(status='submitted')
+        Submission.objects.filter(assignment=self.assignment, student=self.students[1]).delete()
+
+        out = StringIO()
+        call_command('reconcile_assignment_counters', '--dry-run', stdout=out)
+        self.assertIn("1 assignments have drifted counters", out.getvalue())
+        self.assertEqual(self.counters(), (3, 0, 0, 0))
+
+        call_command('reconcile_assignment_counters', '--course', str(self.course.id), stdout=StringIO())
+        self.assertEqual(self.counters(), (1, 1, 0, 0))
+
+
+class BulkGradingTest(TestCase):
+
+    def setUp(self):
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=self.teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        self.teacher_client = Client()
+        self.teacher_client.force_login(self.teacher)
+        self.students = self.enroll(4)
+        response = self.teacher_client.post(reverse('assignments-list'), {'course': self.course.id, 'title': "Essay"})
+        self.assignment = Assignment.objects.get(id=response.json()['id'])
+        self.url = reverse('bulk_grade_submissions', args=[self.assignment.id])
+
+    def enroll(self, count, offset=0):
+        students = [
+            CustomUser.objects.create_user(username=f"student_{i}", password="1234567890HTML", role='student')
+            for i in range(offset, offset + count)
+        ]
+        for student in students:
+            Enrollment.objects.create(course=self.course, student=student)
+        return students
+
+    def post(self, items):
+        return self.teacher_client.post(self.url, {'items': items}, content_type='application/json')
+
+    def test_grades_and_returns_with_per_row_results(self):
+        Submission.objects.filter(student__in=self.students[:2]).update(status='submitted')
+        Assignment.objects.filter(id=self.assignment.id).update(assigned_count=2, submitted_count=2)
+
+        response = self.post([
+            {'student_id': self.students[0].id, 'grade': '95', 'feedback': "Good"},
+            {'student_id': self.students[1].id, 'action': 'return', 'feedback': "Fix it"},
+            {'student_id': self.students[2].id},
+            {'student_id': self.students[0].id, 'grade': '10'},
+            {'student_id': 999999, 'grade': '50'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['updated'], data['failed']), (2, 3))
+        self.assertEqual(
+            [row['status'] for row in data['results']], ['graded', 'returned', 'error', 'error', 'error']
+        )
+        self.assertIn('grade', data['results'][2]['errors'])
+
+        first = Submission.objects.get(assignment=self.assignment, student=self.students[0])
+        self.assertEqual((first.status, first.grade, first.feedback), ('graded', 95, "Good"))
+        second = Submission.objects.get(assignment=self.assignment, student=self.students[1])
+        self.assertEqual(second.status, 'returned')
+        self.assertIsNotNone(second.returned_at)
+
+        self.assignment.refresh_from_db()
+        self.assertEqual(
+            tuple(getattr(self.assignment, field) for field in Assignment.STATUS_COUNTER_FIELDS), (2, 0, 1, 1)
+        )
+        # Сповіщення - лише про оцінені здачі, через чергу
+        self.assertEqual(Job.objects.filter(name='apps.notifications.delivery.deliver_each').count(), 1)
+
+    def test_query_count_does_not_depend_on_row_count(self):
+        def grade_all(students):
+            items = [{'student_id': student.id, 'grade': '80'} for student in students]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post(items)
+            self.assertEqual(response.json()['updated'], len(students))
+            return len(queries)
+
+        few = grade_all(self.students)
+        many = grade_all(self.students + self.enroll(20, offset=4))
+        self.assertEqual(few, many)
+
+    def test_only_assignment_teacher_can_bulk_grade(self):
+        other = CustomUser.objects.create_user(username="other_teacher", password="1234567890HTML", role='teacher')
+        self.teacher_client.force_login(other)
+        response = self.post([{'student_id': self.students[0].id, 'grade': '95'}])
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Submission.objects.filter(status='graded').exists())
+
+
+class GradebookTest(TestCase):
+
+    def setUp(self):
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=self.teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        self.students = [
+            CustomUser.objects.create_user(
+                username=f"student_{i}", password="1234567890HTML", role='student', last_name=f"Student {i}"
+            )
+            for i in range(3)
+        ]
+        for student in self.students:
+            Enrollment.objects.create(course=self.course, student=student)
+        self.teacher_client = Client()
+        self.teacher_client.force_login(self.teacher)
+        self.assignments = []
+        for title in ("Essay", "Квіз"):
+            response = self.teacher_client.post(reverse('assignments-list'), {'course': self.course.id, 'title': title})
+            self.assignments.append(Assignment.objects.get(id=response.json()['id']))
+        Submission.objects.filter(assignment=self.assignments[0], student=self.students[0]).update(
+            status='graded', grade=90
+        )
+        Assignment.objects.filter(id=self.assignments[0].id).update(assigned_count=2, graded_count=1)
+
+    def export(self, file_type):
+        return self.teacher_client.get(
+            reverse('gradebook_export', args=[self.course.id]), {'file_type': file_type}
+        )
+
+    def upload(self, content, name="gradebook.csv", **params):
+        url = reverse('gradebook_import', args=[self.course.id])
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        return self.teacher_client.post(url, {'file': SimpleUploadedFile(name, content)})
+
+    def test_export_xlsx_pivots_grades(self):
+        with self.assertNumQueries(5):  # сесія, користувач, курс, завдання, один запит по здачах
+            response = self.export('xlsx')
+        self.assertEqual(response.status_code, 200)
+        workbook = openpyxl.load_workbook(BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook.worksheets[0].iter_rows(values_only=True))
+        self.assertEqual(rows[0], (
+            'student_id', 'username', 'first_name', 'last_name',
+            f"Essay (#{self.assignments[0].id})", f"Квіз (#{self.assignments[1].id})",
+        ))
+        self.assertEqual([row[0] for row in rows[1:]], [student.id for student in self.students])
+        self.assertEqual(rows[1][4:], (90, None))
+
+    def test_csv_round_trip_applies_only_changed_cells(self):
+        lines = b''.join(self.export('csv').streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 4)
+        # Незмінена оцінка 90 і нова оцінка другому студенту
+        lines[2] = lines[2] + '75'
+        content = '\n'.join(lines).encode('utf-8-sig')
+
+        response = self.upload(content, dry_run='1')
+        self.assertEqual((response.json()['changed'], response.json()['updated']), (1, 0))
+        self.assertFalse(Submission.objects.filter(grade=75).exists())
+
+        namespace = course_cache_namespace(self.course.id)
+        version = peek_cache_version(namespace)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload(content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['changes'][0]['student_id'], self.students[1].id)
+        # bulk_update без post_save: версію аналітики курсу піднімає сам імпорт
+        self.assertNotEqual(peek_cache_version(namespace), version)
+        submission = Submission.objects.get(assignment=self.assignments[1], student=self.students[1])
+        self.assertEqual((submission.status, submission.grade), ('graded', 75))
+        self.assignments[1].refresh_from_db()
+        self.assertEqual((self.assignments[1].assigned_count, self.assignments[1].graded_count), (2, 1))
+        self.assertEqual(Job.objects.filter(name='apps.notifications.delivery.deliver_each').count(), 1)
+
+    def test_invalid_file_is_rejected_without_changes(self):
+        content = (
+            f"student_id,Essay (#{self.assignments[0].id})\n"
+            f"{self.students[1].id},80\n"
+            f"{self.students[2].id},not a grade\n"
+            f"999999,50\n"
+        ).encode()
+        response = self.upload(content)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.json()['errors']], [3, 4])
+        self.assertFalse(Submission.objects.filter(grade=80).exists())
+
+        response = self.upload(b"student_id\n1\n", name="gradebook.ods")
+        self.assertEqual(response.status_code, 400)
+
+    def test_unreadable_csv_is_rejected(self):
+        header = f"student_id,Essay (#{self.assignments[0].id})\n"
+        # Excel в українській локалі зберігає CSV у cp1251
+        response = self.upload((header + f"{self.students[1].id},80,Іваненко\n").encode('cp1251'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], "The CSV file must be UTF-8 encoded.")
+
+        response = self.upload((header + f"{self.students[1].id},\"{'9' * 200_000}\"\n").encode())
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.json()['error'].startswith("The CSV file could not be read"))
+        self.assertFalse(Submission.objects.filter(grade=80).exists())
+
+    def test_grade_changed_during_import_is_a_conflict(self):
+        content = (
+            f"student_id,Essay (#{self.assignments[0].id})\n"
+            f"{self.students[0].id},95\n"
+            f"{self.students[1].id},80\n"
+        ).encode()
+
+        def diff_then_grade(course_id, rows):
+            changes = diff_gradebook(course_id, rows)
+            # Інший викладач оцінює здачу між читанням файлу і записом
+            Submission.objects.filter(assignment=self.assignments[0], student=self.students[1]).update(grade=60)
+            return changes
+
+        with mock.patch('apps.assignments.views.diff_gradebook', side_effect=diff_then_grade):
+            response = self.upload(content)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            [(error['row'], error['student_id']) for error in response.json()['errors']], [(3, self.students[1].id)]
+        )
+        grades = dict(Submission.objects.filter(assignment=self.assignments[0]).values_list('student_id', 'grade'))
+        self.assertEqual((grades[self.students[0].id], grades[self.students[1].id]), (90, 60))
+
+
+class AssignmentQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Межа кількості SQL-запитів для кожного ендпоінта apps.assignments. Студентів, здач і файлів
+    у фікстурі більше, ніж будь-яка межа, тож запит на кожен рядок (N+1) одразу її перевищить.
+    """
+    STUDENTS = 12
+
+    def setUp(self):
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        overrides = override_settings(
+            UPLOAD_SPOOL_DIR=spool_dir,
+            AWS_ACCESS_KEY_ID='testing',
+            AWS_SECRET_ACCESS_KEY='testing',
+            AWS_S3_REGION_NAME='us-east-1',
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        mock = mock_aws()
+        mock.start()
+        self.addCleanup(mock.stop)
+        reset_s3_client()
+        self.addCleanup(reset_s3_client)
+        boto3.client('s3', region_name='us-east-1').create_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=self.teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        self.students = [
+            CustomUser.objects.create_user(username=f"student_{i}", password="1234567890HTML", role='student')
+            for i in range(self.STUDENTS)
+        ]
+        for student in self.students:
+            Enrollment.objects.create(course=self.course, student=student)
+
+        self.teacher_client = Client()
+        self.teacher_client.force_login(self.teacher)
+        self.student_client = Client()
+        self.student_client.force_login(self.students[0])
+
+        self.assignments = [
+            Assignment.objects.create(
+                course=self.course, teacher=self.teacher, title=f"Essay {i}", due_date=timezone.now() + timedelta(days=1)
+            )
+            for i in range(3)
+        ]
+        self.assignment = self.assignments[0]
+        for i in range(self.STUDENTS):
+            AssignmentFile.objects.create(
+                assignment=self.assignment, file_url=public_url(f"assignment/file_{i}.pdf"), file_type='pdf',
+                file_size=1, is_temp=i % 2 == 0
+            )
+            AssignmentLink.objects.create(assignment=self.assignment, link_url=f"https://example.com/{i}")
+        Submission.objects.filter(assignment=self.assignment).update(status='submitted', submission_date=timezone.now())
+        for submission in Submission.objects.filter(assignment=self.assignment):
+            for i in range(2):
+                SubmissionFile.objects.create(
+                    submission=submission, file_url=public_url(f"submission/{submission.id}_{i}.pdf"),
+                    file_type='pdf', file_size=1
+                )
+        reconcile_counters()
+        self.submission = Submission.objects.get(assignment=self.assignment, student=self.students[0])
+
+    def assertRequestWithin(self, budget, client, method, url, data=None, **kwargs):
+        with self.assertMaxQueries(budget):
+            response = getattr(client, method)(url, data, **kwargs)
+        self.assertLess(response.status_code, 400, getattr(response, 'content', b'')[:500])
+        return response
+
+    def test_read_endpoints(self):
+        teacher_reads = [
+            (5, reverse('assignments-list')),
+            (5, reverse('assignments-detail', args=[self.assignment.id])),
+            (6, reverse('assignment_detail', args=[self.assignment.id])),
+            (3, reverse('teacher_assignments', args=[self.course.id])),
+            (4, reverse('submitted_assignments', args=[self.assignment.id])),
+            (4, reverse('submission_detail', args=[self.submission.id])),
+            (5, reverse('gradebook_export', args=[self.course.id])),
+        ]
+        student_reads = [
+            (6, reverse('assignment_detail', args=[self.assignment.id])),
+            (4, reverse('student_assignments', args=[self.course.id])),
+        ]
+        for budget, url in teacher_reads:
+            with self.subTest(url=url):
+                self.assertRequestWithin(budget, self.teacher_client, 'get', url)
+        for budget, url in student_reads:
+            with self.subTest(url=url):
+                self.assertRequestWithin(budget, self.student_client, 'get', url)
+
+        response = self.teacher_client.get(reverse('submitted_assignments', args=[self.assignment.id]))
+        self.assertEqual(len(response.json()), self.STUDENTS)
+        self.assertEqual(response.json()[0]['on_time'], 'вчасно')
+        response = self.teacher_client.get(reverse('submission_detail', args=[self.submission.id]))
+        self.assertEqual(
+            (response.json()['username'], len(response.json()['files'])), (self.students[0].username, 2)
+        )
+
+    def test_write_endpoints(self):
+        teacher, student = self.teacher_client, self.student_client
+        assignment_id = self.assignment.id
+        temp_file, confirmed_file = (
+            AssignmentFile.objects.filter(assignment=self.assignment, is_temp=True).first(),
+            AssignmentFile.objects.filter(assignment=self.assignment, is_temp=False).first(),
+        )
+        link = AssignmentLink.objects.filter(assignment=self.assignment).first()
+
+        self.assertRequestWithin(16, teacher, 'post', reverse('assignments-list'), {'course': self.course.id, 'title': "New"})
+        self.assertRequestWithin(6, teacher, 'patch', reverse('assignments-detail', args=[assignment_id]),
+                                 {'title': "Renamed"}, content_type='application/json')
+        self.assertRequestWithin(8, teacher, 'post', reverse('upload_assignment_file', args=[assignment_id]),
+                                 {'file': SimpleUploadedFile("task.pdf", b"pdf")})
+        self.assertRequestWithin(6, teacher, 'delete', reverse('delete_temp_assignment_file', args=[temp_file.id]))
+        self.assertRequestWithin(4, teacher, 'post', reverse('confirm_assignment_files', args=[assignment_id]))
+        self.assertRequestWithin(4, teacher, 'post', reverse('add_assignment_links', args=[assignment_id]),
+                                 {'links': [f"https://example.org/{i}" for i in range(self.STUDENTS)]},
+                                 content_type='application/json')
+        self.assertRequestWithin(4, teacher, 'delete', reverse('delete_assignment_link', args=[link.id]))
+        self.assertRequestWithin(6, teacher, 'delete', reverse('delete_assignment_file', args=[confirmed_file.id]))
+
+        self.assertRequestWithin(12, teacher, 'post', reverse('grade_submission', args=[assignment_id, self.students[0].id]),
+                                 {'grade': '90'})
+        self.assertRequestWithin(11, teacher, 'post', reverse('return_submission', args=[assignment_id, self.students[1].id]))
+        self.assertRequestWithin(9, teacher, 'post', reverse('bulk_grade_submissions', args=[assignment_id]),
+                                 {'items': [{'student_id': s.id, 'grade': '80'} for s in self.students[2:]]},
+                                 content_type='application/json')
+        gradebook = '\n'.join(
+            [f"student_id,Essay 1 (#{self.assignments[1].id})"] + [f"{s.id},70" for s in self.students]
+        ).encode()
+        self.assertRequestWithin(12, teacher, 'post', reverse('gradebook_import', args=[self.course.id]),
+                                 {'file': SimpleUploadedFile("gradebook.csv", gradebook)})
+
+        other = self.assignments[2]
+        self.assertRequestWithin(15, student, 'post', reverse('submit_assignment', args=[other.id]),
+                                 {'comment': "Done", 'files': [SimpleUploadedFile(f"{i}.pdf", b"pdf") for i in range(2)]})
+        self.assertRequestWithin(14, student, 'post', reverse('cancel_submission_assigment', args=[other.id]))
+        self.assertRequestWithin(14, student, 'post', reverse('cancel_submission', args=[self.submission.id]))
+
+        self.assertRequestWithin(20, teacher, 'delete', reverse('assignments-detail', args=[assignment_id]))
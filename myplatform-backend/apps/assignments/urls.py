@@ -18,14 +18,20 @@ from .views import (
     SubmissionDetailView,
     ReturnSubmissionView,
     GradeSubmissionView,
+    BulkGradeSubmissionsView,
     TeacherAssignmentListView,
+    GradebookExportView,
+    GradebookImportView,
     CancelSubmissionViewByAssigment
 )
+from .events import submission_events
 
 router = DefaultRouter()
 router.register(r'', AssignmentViewSet, basename='assignments')
 
 urlpatterns = [
+    # До router.urls: інакше 'events/' збігся б з деталями завдання (<pk>/)
+    path('events/', submission_events, name='submission_events'),
     path('', include(router.urls)),
     path('<int:assignment_id>/upload-file/', UploadAssignmentFileView.as_view(), name='upload_assignment_file'),
     path('files/<int:file_id>/delete/', DeleteTempAssignmentFileView.as_view(), name='delete_temp_assignment_file'),
@@ -37,6 +43,8 @@ urlpatterns = [
     path('student/course/<int:course_id>/assignments/', StudentAssignmentListView.as_view(), name='student_assignments'),
 
     path('teacher/course/<int:course_id>/assignments/', TeacherAssignmentListView.as_view(), name='teacher_assignments'),
+    path('teacher/course/<int:course_id>/gradebook/export/', GradebookExportView.as_view(), name='gradebook_export'),
+    path('teacher/course/<int:course_id>/gradebook/import/', GradebookImportView.as_view(), name='gradebook_import'),
 
     path('<int:assignment_id>/detail/', AssignmentDetailView.as_view(), name='assignment_detail'),
 
@@ -50,4 +58,5 @@ urlpatterns = [
 
     path('<int:assignment_id>/submissions/<int:student_id>/return/', ReturnSubmissionView.as_view(), name='return_submission'),
     path('<int:assignment_id>/submissions/<int:student_id>/grade/', GradeSubmissionView.as_view(), name='grade_submission'),
+    path('<int:assignment_id>/submissions/bulk-grade/', BulkGradeSubmissionsView.as_view(), name='bulk_grade_submissions'),
 ]
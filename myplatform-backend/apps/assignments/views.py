@@ -9,18 +9,31 @@ from apps.courses.models import Course
 from apps.users.models import CustomUser
 
 from django.db import transaction
+from django.db.models import Count, Prefetch, Q
 from rest_framework import generics, viewsets, status
 from rest_framework.response import Response
 from .models import Assignment, AssignmentFile, AssignmentLink, Submission, SubmissionFile
-from .serializers import AssignmentSerializer, AssignmentFileSerializer, AssignmentLinkSerializer, SubmissionSerializer, SubmissionFileSerializer, MultipleAssignmentLinksSerializer
+from .serializers import AssignmentSerializer, AssignmentFileSerializer, AssignmentLinkSerializer, SubmissionSerializer, SubmissionFileSerializer, MultipleAssignmentLinksSerializer, BulkGradeItemSerializer
 from apps.enrollments.models import Enrollment
 from rest_framework.views import APIView
-import boto3
 from django.conf import settings
 from botocore.exceptions import ClientError
 from urllib.parse import urlparse
 import uuid
 from .mixins import CsrfExemptSessionAuthentication
+from apps.storage.cleanup import file_keys, schedule_key_deletion
+from apps.storage.client import get_s3_client, public_url
+from apps.storage.serializers import UploadSerializer
+from apps.storage.uploads import discard_uploads, enqueue_upload, with_upload_status
+from apps.analytics.signals import bump_course_version
+from apps.notifications.delivery import notify_each, notify_users
+from .counters import apply_status_transitions, save_submission
+from .events import publish_submission_status
+from .gradebook import (
+    GradebookConflictError, GradebookImportError, apply_gradebook, course_assignments, diff_gradebook, iter_csv,
+    read_sheet, write_xlsx,
+)
+from django.http import FileResponse, StreamingHttpResponse
 
 from rest_framework.permissions import BasePermission
 from rest_framework.permissions import AllowAny
@@ -31,15 +44,12 @@ import urllib.parse
 
 from django.utils import timezone
 
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_S3_REGION_NAME
-)
 
 class AssignmentViewSet(viewsets.ModelViewSet):
-    queryset = Assignment.objects.all()
+    # files (зі статусом завантаження) / links серіалізуються для кожного завдання списку
+    queryset = Assignment.objects.prefetch_related(
+        Prefetch('files', queryset=with_upload_status(AssignmentFile.objects.all())), 'links'
+    )
     serializer_class = AssignmentSerializer
     authentication_classes = [CsrfExemptSessionAuthentication]
     permission_classes = [IsAuthenticated]
@@ -49,21 +59,11 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         data['teacher'] = request.user.id  # Встановлюємо вчителя, який створює завдання
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        assignment = serializer.save()
-
-        # Створюємо записи у Submission для кожного учня курсу
-        course_id = data.get('course')
-        if course_id:
-            enrollments = Enrollment.objects.filter(course_id=course_id)
-            submissions = []
-            for enrollment in enrollments:
-                submission = Submission(
-                    student=enrollment.student,
-                    assignment=assignment,
-                    status='assigned'
-                )
-                submissions.append(submission)
-            Submission.objects.bulk_create(submissions)
+        # Записи Submission для кожного учня курсу створює сигнал (apps.assignments.signals)
+        with transaction.atomic():
+            assignment = serializer.save()
+        # Лічильники здач оновив сигнал окремим UPDATE
+        assignment.refresh_from_db(fields=Assignment.STATUS_COUNTER_FIELDS)
 
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
@@ -89,41 +89,15 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def perform_destroy(self, instance):
-        self.delete_assignment_files(instance)
-        instance.links.all().delete()
-
-        submissions = instance.submissions.all()  # Використовуємо 'submissions' замість 'submission_set'
-        for submission in submissions:
-            self.delete_submission_files(submission)
-            submission.delete()
-
-        instance.delete()
-
-
-    def delete_assignment_files(self, assignment):
-        assignment_files = assignment.files.all()
-        for file in assignment_files:
-            self.delete_file_from_s3(file.file_url)
-            file.delete()
-
-    def delete_submission_files(self, submission):
-        submission_files = submission.files.all()
-        for file in submission_files:
-            self.delete_file_from_s3(file.file_url)
-            file.delete()
-
-    def delete_file_from_s3(self, file_url):
-        from urllib.parse import urlparse, unquote
-        import botocore
-
-        try:
-            parsed_url = urlparse(file_url)
-            encoded_s3_file_path = parsed_url.path.lstrip('/')
-            s3_file_path = unquote(encoded_s3_file_path)
-
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
-        except botocore.exceptions.ClientError as e:
-            print(f"Error deleting file from S3: {e}")
+        # Ключі збираємо до видалення рядків; файли, посилання і здачі видаляються каскадом
+        keys = file_keys(instance.files.all())
+        keys += file_keys(SubmissionFile.objects.filter(submission__assignment=instance))
+        with transaction.atomic():
+            # Незавершені фонові завантаження файлів завдання скасовуються разом з рядками
+            discard_uploads(AssignmentFile, instance.files.values('id'))
+            discard_uploads(SubmissionFile, SubmissionFile.objects.filter(submission__assignment=instance).values('id'))
+            instance.delete()
+            schedule_key_deletion(keys)
 
 
 
@@ -141,15 +115,10 @@ class UploadAssignmentFileView(APIView):
         if not file:
             return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            s3_file_path = f"Courses/Course_{assignment.course.id}/assignments/assignment_{assignment_id}/{file.name}"
-
-            s3_client.upload_fileobj(file, settings.AWS_STORAGE_BUCKET_NAME, s3_file_path)
-
-            encoded_file_path = urllib.parse.quote(s3_file_path, safe='/')
-
-            file_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/{encoded_file_path}"
+        s3_file_path = f"Courses/Course_{assignment.course_id}/assignments/assignment_{assignment_id}/{file.name}"
+        file_url = public_url(s3_file_path)
 
+        with transaction.atomic():
             assignment_file = AssignmentFile.objects.create(
                 assignment=assignment,
                 file_url=file_url,
@@ -157,10 +126,9 @@ class UploadAssignmentFileView(APIView):
                 file_size=file.size,
                 is_temp=True
             )
+            upload = enqueue_upload(file, s3_file_path, uploaded_by=request.user, target=assignment_file)
 
-            return Response({'file_url': file_url}, status=status.HTTP_201_CREATED)
-        except ClientError as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({'file_url': file_url, 'upload': UploadSerializer(upload).data}, status=status.HTTP_201_CREATED)
         
 class DeleteTempAssignmentFileView(APIView):
     authentication_classes = [CsrfExemptSessionAuthentication]
@@ -177,8 +145,9 @@ class DeleteTempAssignmentFileView(APIView):
 
             s3_file_path = urllib.parse.unquote(encoded_s3_file_path)
 
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
+            get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
 
+            discard_uploads(AssignmentFile, [assignment_file.id])
             assignment_file.delete()
 
             return Response({"message": "Temporary file deleted successfully"}, status=status.HTTP_200_OK)
@@ -217,15 +186,10 @@ class AddAssignmentLinksView(APIView):
         serializer = MultipleAssignmentLinksSerializer(data=request.data)
         if serializer.is_valid():
             links = serializer.validated_data['links']
-            created_links = []
-            for link_url in links:
-                assignment_link = AssignmentLink.objects.create(
-                    assignment=assignment,
-                    link_url=link_url,
-                    description=""
-                )
-                created_links.append(AssignmentLinkSerializer(assignment_link).data)
-            return Response(created_links, status=status.HTTP_201_CREATED)
+            created_links = AssignmentLink.objects.bulk_create([
+                AssignmentLink(assignment=assignment, link_url=link_url, description="") for link_url in links
+            ])
+            return Response(AssignmentLinkSerializer(created_links, many=True).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -260,8 +224,9 @@ class DeleteAssignmentFileView(APIView):
 
             s3_file_path = urllib.parse.unquote(encoded_s3_file_path)
 
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
+            get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
 
+            discard_uploads(AssignmentFile, [assignment_file.id])
             assignment_file.delete()
 
             return Response({"message": "File deleted successfully"}, status=status.HTTP_200_OK)
@@ -313,28 +278,41 @@ class TeacherAssignmentListView(APIView):
         if teacher.role != 'teacher':
             return Response({"error": "You are not authorized to view this."}, status=status.HTTP_403_FORBIDDEN)
 
-        course = Course.objects.get(id=course_id)
-        
-        assignments = Assignment.objects.filter(course=course)
-
+        # Усі лічильники - одним GROUP BY по submissions, а не три COUNT на кожне завдання
+        status_counts = {
+            f'{status_value}_total': Count('submissions', filter=Q(submissions__status=status_value))
+            for status_value, _ in Submission.STATUS_CHOICES
+        }
+        assignments = (
+            Assignment.objects.filter(course_id=course_id)
+            .annotate(submissions_total=Count('submissions'), **status_counts)
+            .values('id', 'title', 'description', 'due_date', 'created_at', 'submissions_total', *status_counts)
+        )
+
+        # ?ordering=pending / -pending - за кількістю здач, що чекають на оцінку (status='submitted')
+        ordering = request.GET.get('ordering')
+        if ordering in ('pending', '-pending'):
+            assignments = assignments.order_by(ordering.replace('pending', 'submitted_total'), 'id')
+
+        breakdown = request.GET.get('breakdown') in ('1', 'true')
         assignment_list = []
 
         for assignment in assignments:
-            
-            total_submissions = Submission.objects.filter(assignment=assignment).count()
-            graded_submissions = Submission.objects.filter(assignment=assignment, status='graded').count()
-            returned_submissions = Submission.objects.filter(assignment=assignment, status='returned').count()
-
             data = {
-                "id": assignment.id,
-                "title": assignment.title,
-                "description": assignment.description,
-                "due_date": assignment.due_date,
-                "created_at": assignment.created_at,
-                "total_submissions": total_submissions,
-                "graded_submissions": graded_submissions,
-                "returned_submissions": returned_submissions,
+                "id": assignment['id'],
+                "title": assignment['title'],
+                "description": assignment['description'],
+                "due_date": assignment['due_date'],
+                "created_at": assignment['created_at'],
+                "total_submissions": assignment['submissions_total'],
+                "graded_submissions": assignment['graded_total'],
+                "returned_submissions": assignment['returned_total'],
             }
+            if breakdown:
+                data["pending_submissions"] = assignment['submitted_total']
+                data["status_counts"] = {
+                    status_value: assignment[f'{status_value}_total'] for status_value, _ in Submission.STATUS_CHOICES
+                }
 
             assignment_list.append(data)
 
@@ -347,21 +325,20 @@ class AssignmentDetailView(APIView):
 
     def get(self, request, assignment_id):
         try:
-            assignment = Assignment.objects.get(id=assignment_id)
+            assignment = Assignment.objects.prefetch_related(
+                Prefetch('files', queryset=with_upload_status(AssignmentFile.objects.all())), 'links'
+            ).get(id=assignment_id)
         except Assignment.DoesNotExist:
             return Response({"error": "Assignment not found"}, status=status.HTTP_404_NOT_FOUND)
 
         user = request.user
 
         if user.role == 'student':
-            if not Enrollment.objects.filter(course=assignment.course, student=user).exists():
+            if not Enrollment.objects.filter(course_id=assignment.course_id, student=user).exists():
                 return Response({"error": "You do not have access to this assignment"}, status=status.HTTP_403_FORBIDDEN)
 
-            files = AssignmentFile.objects.filter(assignment=assignment)
-            links = AssignmentLink.objects.filter(assignment=assignment)
-
-            files_data = AssignmentFileSerializer(files, many=True).data
-            links_data = AssignmentLinkSerializer(links, many=True).data
+            files_data = AssignmentFileSerializer(assignment.files.all(), many=True).data
+            links_data = AssignmentLinkSerializer(assignment.links.all(), many=True).data
 
             assignment_data = {
                 'id': assignment.id,
@@ -373,21 +350,15 @@ class AssignmentDetailView(APIView):
             }
 
         elif user.role == 'teacher':
-            if assignment.teacher != user:
+            if assignment.teacher_id != user.id:
                 return Response({"error": "You do not have access to this assignment"}, status=status.HTTP_403_FORBIDDEN)
 
-            total_students = Enrollment.objects.filter(course=assignment.course).count()  # Усі студенти на курсі
-            submitted_students = Submission.objects.filter(assignment=assignment, status='submitted').count()
-            returned_students = Submission.objects.filter(assignment=assignment, status='returned').count()
-            graded_students = Submission.objects.filter(assignment=assignment, status='graded').count()
-            assigned_students = total_students - submitted_students - returned_students - graded_students
-
-            files = AssignmentFile.objects.filter(assignment=assignment)
-            links = AssignmentLink.objects.filter(assignment=assignment)
-
-            files_data = AssignmentFileSerializer(files, many=True).data
-            links_data = AssignmentLinkSerializer(links, many=True).data
+            files_data = AssignmentFileSerializer(assignment.files.all(), many=True).data
+            links_data = AssignmentLinkSerializer(assignment.links.all(), many=True).data
 
+            # Лічильники статусів зберігаються на рядку завдання (apps.assignments.counters). Кількість
+            # студентів - з Enrollment: Submission лишається після відрахування і є не в усіх студентів
+            total_students = Enrollment.objects.filter(course_id=assignment.course_id).count()
             assignment_data = {
                 'id': assignment.id,
                 'title': assignment.title,
@@ -396,10 +367,10 @@ class AssignmentDetailView(APIView):
                 'files': files_data,
                 'links': links_data,
                 'total_students': total_students,
-                'submitted_students': submitted_students,
-                'returned_students': returned_students,
-                'graded_students': graded_students,
-                'assigned_students': assigned_students
+                'submitted_students': assignment.submitted_count,
+                'returned_students': assignment.returned_count,
+                'graded_students': assignment.graded_count,
+                'assigned_students': assignment.assigned_count
             }
 
         else:
@@ -426,33 +397,31 @@ class SubmitAssignmentView(APIView):
         except Submission.DoesNotExist:
             return Response({"error": "You do not have access to submit this assignment"}, status=status.HTTP_403_FORBIDDEN)
 
-        submission.comment = request.data.get('comment', '')
-        submission.status = 'submitted'
-        submission.submission_date = timezone.now()
-        submission.save()
-
         files = request.FILES.getlist('files')
         saved_files = []
-        for file in files:
-            s3_file_path = f"Courses/Course_{assignment.course.id}/submissions/submission_{submission.id}/{file.name}"
-
-            s3_client.upload_fileobj(file, settings.AWS_STORAGE_BUCKET_NAME, s3_file_path)
-
-            encoded_file_path = urllib.parse.quote(s3_file_path, safe='/')
-
-            file_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/{encoded_file_path}"
-
-            submission_file = SubmissionFile.objects.create(
-                submission=submission,
-                file_url=file_url,
-                file_type=file.name.split('.')[-1].lower(),
-                file_size=file.size
-            )
-            saved_files.append(SubmissionFileSerializer(submission_file).data)
+        uploads = []
+        with transaction.atomic():
+            submission.comment = request.data.get('comment', '')
+            submission.status = 'submitted'
+            submission.submission_date = timezone.now()
+            save_submission(submission)
+
+            for file in files:
+                s3_file_path = f"Courses/Course_{assignment.course_id}/submissions/submission_{submission.id}/{file.name}"
+
+                submission_file = SubmissionFile.objects.create(
+                    submission=submission,
+                    file_url=public_url(s3_file_path),
+                    file_type=file.name.split('.')[-1].lower(),
+                    file_size=file.size
+                )
+                uploads.append(enqueue_upload(file, s3_file_path, uploaded_by=user, target=submission_file))
+                saved_files.append(SubmissionFileSerializer(submission_file).data)
 
         return Response({
             'message': 'Assignment submitted successfully',
-            'files': saved_files
+            'files': saved_files,
+            'uploads': UploadSerializer(uploads, many=True).data
         }, status=status.HTTP_201_CREATED)
 
 class CancelSubmissionViewByAssigment(APIView):
@@ -466,18 +435,18 @@ class CancelSubmissionViewByAssigment(APIView):
         except Submission.DoesNotExist:
             return Response({"error": "Submission not found or access denied"}, status=status.HTTP_404_NOT_FOUND)
 
-        for file in submission.files.all():
-            encoded_s3_file_path = file.file_url.split(f"{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/")[-1]
-            s3_file_path = urllib.parse.unquote(encoded_s3_file_path)
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
-            file.delete()
+        with transaction.atomic():
+            files = submission.files.all()
+            schedule_key_deletion(file_keys(files))
+            discard_uploads(SubmissionFile, files.values('id'))
+            files.delete()
 
-        submission.comment = ""
-        submission.status = 'assigned'
-        submission.submission_date = None
-        submission.grade = None  
-        submission.feedback = "" 
-        submission.save()
+            submission.comment = ""
+            submission.status = 'assigned'
+            submission.submission_date = None
+            submission.grade = None  
+            submission.feedback = "" 
+            save_submission(submission)
 
         return Response({"message": "Submission canceled and files deleted"}, status=status.HTTP_200_OK)
 
@@ -493,22 +462,25 @@ class CancelSubmissionView(APIView):
         except Submission.DoesNotExist:
             return Response({"error": "Submission not found or access denied"}, status=status.HTTP_404_NOT_FOUND)
 
-        for file in submission.files.all():
-            
-            encoded_s3_file_path = file.file_url.split(f"{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/")[-1]
+        with transaction.atomic():
+            files = submission.files.all()
+            schedule_key_deletion(file_keys(files))
+            discard_uploads(SubmissionFile, files.values('id'))
+            files.delete()
 
-            s3_file_path = urllib.parse.unquote(encoded_s3_file_path)
+            submission.comment = ""
+            submission.status = 'assigned'
+            submission.submission_date = None
+            save_submission(submission)
 
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
+        return Response({"message": "Submission canceled and files deleted"}, status=status.HTTP_200_OK)
 
-            file.delete()
+def on_time_label(submission_date, due_date):
+    # Без терміну здачі (due_date порожній) будь-яка здача вчасна
+    if due_date is None or submission_date is None or submission_date <= due_date:
+        return 'вчасно'
+    return 'пізно'
 
-        submission.comment = ""
-        submission.status = 'assigned'
-        submission.submission_date = None
-        submission.save()
-
-        return Response({"message": "Submission canceled and files deleted"}, status=status.HTTP_200_OK)
 
 class SubmittedAssignmentsView(APIView):
     authentication_classes = [CsrfExemptSessionAuthentication]
@@ -524,18 +496,20 @@ class SubmittedAssignmentsView(APIView):
         except Assignment.DoesNotExist:
             return Response({"error": "Assignment not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        submissions = Submission.objects.filter(assignment=assignment, status='submitted')
-        submission_data = []
-
-        for submission in submissions:
-            submission_info = {
-                'id': submission.id,
-                'username': submission.student.username,
-                'email': submission.student.email,
-                'submission_date': submission.submission_date,
-                'on_time': 'вчасно' if submission.submission_date <= assignment.due_date else 'пізно'
+        # Дані студента - JOIN у тому ж запиті, а не окремий запит на кожну здачу
+        submissions = Submission.objects.filter(assignment=assignment, status='submitted').values(
+            'id', 'submission_date', 'student__username', 'student__email'
+        )
+        submission_data = [
+            {
+                'id': submission['id'],
+                'username': submission['student__username'],
+                'email': submission['student__email'],
+                'submission_date': submission['submission_date'],
+                'on_time': on_time_label(submission['submission_date'], assignment.due_date)
             }
-            submission_data.append(submission_info)
+            for submission in submissions
+        ]
 
         return Response(submission_data, status=status.HTTP_200_OK)
 
@@ -545,27 +519,32 @@ class SubmissionDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, submission_id):
+        if request.user.role != 'teacher':
+            return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
+
+        # Здача, студент і термін завдання - одним запитом, файли - другим
         try:
-            submission = Submission.objects.get(id=submission_id)
+            submission = (
+                Submission.objects.select_related('student', 'assignment')
+                .prefetch_related(Prefetch('files', queryset=with_upload_status(SubmissionFile.objects.all())))
+                .only('id', 'comment', 'submission_date', 'student__id', 'student__username', 'student__email',
+                      'assignment__id', 'assignment__due_date')
+                .get(id=submission_id)
+            )
         except Submission.DoesNotExist:
             return Response({"error": "Submission not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        if request.user.role != 'teacher':
-            return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
-
         submission_data = {
-            'student_id': submission.student.id, 
-
+            'student_id': submission.student.id,
             'username': submission.student.username,
             'email': submission.student.email,
             'submission_date': submission.submission_date,
-            'on_time': 'вчасно' if submission.submission_date <= submission.assignment.due_date else 'пізно',
+            'on_time': on_time_label(submission.submission_date, submission.assignment.due_date),
             'comment': submission.comment,
             'files': SubmissionFileSerializer(submission.files.all(), many=True).data
         }
 
         return Response(submission_data, status=status.HTTP_200_OK)
-    
 
 
 class ReturnSubmissionView(APIView):
@@ -589,7 +568,9 @@ class ReturnSubmissionView(APIView):
         submission.feedback = feedback
         submission.status = 'returned'
         submission.returned_at = timezone.now() 
-        submission.save()
+        with transaction.atomic():
+            save_submission(submission)
+            publish_submission_status(submission)
 
         return Response({"message": "Submission returned to student."}, status=status.HTTP_200_OK)
 
@@ -620,6 +601,175 @@ class GradeSubmissionView(APIView):
         submission.feedback = feedback
         submission.grade = grade
         submission.status = 'graded'
-        submission.save()
+        with transaction.atomic():
+            save_submission(submission)
+            publish_submission_status(submission)
+            notify_users(
+                'submission_graded', [student.id], f"Your submission for \"{assignment.title}\" was graded",
+                course_id=assignment.course_id, object_id=submission.id
+            )
 
         return Response({"message": "Submission graded successfully."}, status=status.HTTP_200_OK)
+
+
+# Стільки рядків приймає один запит масового оцінювання
+BULK_GRADE_MAX_ITEMS = 1000
+
+
+class BulkGradeSubmissionsView(APIView):
+    """
+    Оцінювання / повернення багатьох здач одним запитом:
+    {"items": [{"student_id": 1, "action": "grade" | "return", "grade": "95", "feedback": "..."}]}.
+    Права перевіряються один раз, усі валідні рядки зберігаються одним bulk_update в одній
+    транзакції; для кожного рядка повертається результат або помилка.
+    """
+    authentication_classes = [CsrfExemptSessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, assignment_id):
+        user = request.user
+
+        if user.role != 'teacher':
+            return Response({"error": "Only teachers can grade submissions."}, status=status.HTTP_403_FORBIDDEN)
+
+        items = request.data.get('items') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({"error": "A non-empty list of items is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > BULK_GRADE_MAX_ITEMS:
+            return Response(
+                {"error": f"At most {BULK_GRADE_MAX_ITEMS} items per request."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        assignment = Assignment.objects.filter(id=assignment_id, teacher=user).only('id', 'title', 'course_id').first()
+        if assignment is None:
+            return Response({"error": "Assignment not found or you do not have permission."}, status=status.HTTP_404_NOT_FOUND)
+
+        results = [None] * len(items)
+        valid = {}
+        for index, item in enumerate(items):
+            serializer = BulkGradeItemSerializer(data=item)
+            if not serializer.is_valid():
+                results[index] = {'student_id': item.get('student_id') if isinstance(item, dict) else None,
+                                  'status': 'error', 'errors': serializer.errors}
+            elif serializer.validated_data['student_id'] in valid:
+                results[index] = {'student_id': serializer.validated_data['student_id'],
+                                  'status': 'error', 'errors': {'student_id': ["Duplicate student_id."]}}
+            else:
+                valid[serializer.validated_data['student_id']] = (index, serializer.validated_data)
+
+        now = timezone.now()
+        with transaction.atomic():
+            submissions = {
+                submission.student_id: submission
+                for submission in Submission.objects.select_for_update().filter(
+                    assignment_id=assignment.id, student_id__in=list(valid)
+                ).only('id', 'student_id', 'assignment_id', 'status', 'grade', 'feedback', 'returned_at', 'updated_at')
+            }
+
+            changed = []
+            transitions = []
+            for student_id, (index, data) in valid.items():
+                submission = submissions.get(student_id)
+                if submission is None:
+                    results[index] = {'student_id': student_id, 'status': 'error',
+                                      'errors': {'student_id': ["Submission not found."]}}
+                    continue
+                transitions.append((submission.status, 'graded' if data['action'] == 'grade' else 'returned'))
+                submission.feedback = data['feedback']
+                submission.updated_at = now
+                if data['action'] == 'grade':
+                    submission.grade = data['grade']
+                    submission.status = 'graded'
+                else:
+                    submission.status = 'returned'
+                    submission.returned_at = now
+                changed.append(submission)
+                results[index] = {'student_id': student_id, 'status': submission.status,
+                                  'submission_id': submission.id, 'grade': submission.grade}
+
+            # Один UPDATE ... CASE на всі рядки замість save() на кожен
+            Submission.objects.bulk_update(changed, ['status', 'grade', 'feedback', 'returned_at', 'updated_at'])
+            apply_status_transitions(assignment.id, transitions)
+            if changed:
+                # bulk_update не надсилає post_save, тож кеш аналітики курсу інвалідовуємо тут
+                bump_course_version(assignment.course_id)
+
+            for submission in changed:
+                publish_submission_status(submission)
+            notify_each(
+                'submission_graded',
+                [(submission.student_id, submission.id) for submission in changed if submission.status == 'graded'],
+                f"Your submission for \"{assignment.title}\" was graded", course_id=assignment.course_id
+            )
+
+        return Response({
+            'updated': len(changed),
+            'failed': len(items) - len(changed),
+            'results': results,
+        }, status=status.HTTP_200_OK)
+
+
+class GradebookExportView(APIView):
+    """Журнал оцінок курсу: ?file_type=xlsx (за замовчуванням) або csv"""
+    authentication_classes = [CsrfExemptSessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, course_id):
+        user = request.user
+
+        if user.role != 'teacher':
+            return Response({"error": "Only teachers can export the gradebook."}, status=status.HTTP_403_FORBIDDEN)
+        if not Course.objects.filter(id=course_id, teacher=user).exists():
+            return Response({"error": "Course not found or you do not have permission."}, status=status.HTTP_404_NOT_FOUND)
+
+        file_type = request.GET.get('file_type', 'xlsx')
+        if file_type not in ('xlsx', 'csv'):
+            return Response({"error": "file_type must be xlsx or csv."}, status=status.HTTP_400_BAD_REQUEST)
+
+        assignments = course_assignments(course_id)
+        filename = f"gradebook_course_{course_id}.{file_type}"
+        if file_type == 'csv':
+            response = StreamingHttpResponse(iter_csv(assignments), content_type='text/csv; charset=utf-8')
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            return response
+        return FileResponse(
+            write_xlsx(assignments), as_attachment=True, filename=filename,
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+
+
+class GradebookImportView(APIView):
+    """
+    Імпорт журналу (файл у полі file, формат як у експорті). Записуються лише клітинки, де оцінка
+    відрізняється від поточної; ?dry_run=1 - лише повернути зміни. Файл з помилками не застосовується зовсім.
+    """
+    authentication_classes = [CsrfExemptSessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, course_id):
+        user = request.user
+
+        if user.role != 'teacher':
+            return Response({"error": "Only teachers can import the gradebook."}, status=status.HTTP_403_FORBIDDEN)
+        if not Course.objects.filter(id=course_id, teacher=user).exists():
+            return Response({"error": "Course not found or you do not have permission."}, status=status.HTTP_404_NOT_FOUND)
+
+        file = request.FILES.get('file')
+        if not file:
+            return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.GET.get('dry_run') in ('1', 'true')
+        try:
+            changes = diff_gradebook(course_id, read_sheet(file))
+            updated = 0 if dry_run else apply_gradebook(course_id, changes)
+        except GradebookConflictError as e:
+            return Response({"error": e.message, "errors": e.errors}, status=status.HTTP_409_CONFLICT)
+        except GradebookImportError as e:
+            return Response({"error": e.message, "errors": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'dry_run': dry_run,
+            'changed': len(changes),
+            'updated': updated,
+            'changes': changes,
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,32 @@
+# apps/courses/management/commands/purge_course_storage.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.courses.models import Course
+from apps.storage.cleanup import course_storage_prefix, purge_prefix
+
+
+class Command(BaseCommand):
+    help = "Видаляє з S3 усі файли курсу (Courses/Course_<id>/), напр. залишки після видалення курсу"
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', type=int)
+        parser.add_argument('--workers', type=int, default=None, help="Кількість потоків для видалення")
+        parser.add_argument('--force', action='store_true', help="Видалити файли, навіть якщо курс ще існує")
+
+    def handle(self, *args, **options):
+        course_id = options['course_id']
+        if Course.objects.filter(id=course_id).exists() and not options['force']:
+            raise CommandError(f"Course {course_id} still exists, use --force to purge its files anyway")
+
+        prefix = course_storage_prefix(course_id)
+        verbosity = options['verbosity']
+
+        def progress(deleted, listed):
+            if verbosity:
+                self.stdout.write(f"Deleted {deleted} of {listed} objects listed so far")
+
+        deleted, listed = purge_prefix(prefix, workers=options['workers'], progress=progress)
+        if deleted < listed:
+            raise CommandError(f"Deleted {deleted} of {listed} objects under {prefix}, see log for errors")
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} objects under {prefix}"))
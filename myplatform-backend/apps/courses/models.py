@@ -2,6 +2,42 @@
 
 from django.db import models
 from django.conf import settings
+from django.db.models.functions import Coalesce
+
+
+def count_per_course(queryset, course_path):
+    """Підзапит з кількістю рядків queryset для поточного курсу (0, якщо їх немає)"""
+    return Coalesce(models.Subquery(
+        queryset.filter(**{course_path: models.OuterRef('pk')}).order_by().values(course_path).annotate(
+            count=models.Count('id')
+        ).values('count')
+    ), 0)
+
+
+class CourseQuerySet(models.QuerySet):
+
+    def for_catalog(self, user=None):
+        """
+        Курси з усім, що потрібно CourseSerializer, без запитів на кожен курс:
+        категорії через prefetch, total_lessons і completed_lessons (для студента user) - підзапитами.
+        """
+        from apps.categories.models import CourseCategoryRelation
+        from apps.lessons.models import Lesson
+        from apps.progress_tracking.models import LessonProgress
+
+        queryset = self.annotate(total_lessons=count_per_course(Lesson.objects.all(), 'module__course'))
+        if user is not None and user.is_authenticated and user.role == 'student':
+            queryset = queryset.annotate(completed_lessons=count_per_course(
+                LessonProgress.objects.filter(student=user), 'lesson__module__course'
+            ))
+        else:
+            queryset = queryset.annotate(completed_lessons=models.Value(0))
+
+        return queryset.prefetch_related(models.Prefetch(
+            'course_categories',
+            queryset=CourseCategoryRelation.objects.select_related('category').order_by('id'),
+        ))
+
 
 class Course(models.Model):
     title = models.CharField(max_length=255)
@@ -19,5 +55,13 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CourseQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset-пагінація каталогу (myplatform.pagination.KeysetPagination)
+            models.Index(fields=['created_at', 'id']),
+        ]
+
     def __str__(self):
         return self.title
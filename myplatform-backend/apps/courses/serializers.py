@@ -21,7 +21,11 @@ class CourseSerializer(serializers.ModelSerializer):
                   'created_at', 'updated_at', 'completed_lessons', 'total_lessons', 'categories', 'category_ids']
 
     def get_categories(self, obj):
-        relations = CourseCategoryRelation.objects.filter(course=obj).select_related('category')
+        # Course.objects.for_catalog() уже підтягнув категорії через prefetch
+        if 'course_categories' in getattr(obj, '_prefetched_objects_cache', {}):
+            relations = obj.course_categories.all()
+        else:
+            relations = CourseCategoryRelation.objects.filter(course=obj).select_related('category')
         categories = [relation.category for relation in relations]
         return CourseCategorySerializer(categories, many=True).data
 
@@ -46,6 +50,9 @@ class CourseSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
     
     def get_completed_lessons(self, obj):
+        if hasattr(obj, 'completed_lessons'):
+            return obj.completed_lessons
+
         request = self.context.get('request', None)
         user = request.user if request else None
 
@@ -57,6 +64,9 @@ class CourseSerializer(serializers.ModelSerializer):
         return 0
 
     def get_total_lessons(self, obj):
+        if hasattr(obj, 'total_lessons'):
+            return obj.total_lessons
+
         return Lesson.objects.filter(
             module__course=obj
         ).count()
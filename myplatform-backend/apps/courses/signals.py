@@ -0,0 +1,23 @@
+# apps/courses/signals.py
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.categories.models import CourseCategoryRelation
+from apps.lessons.models import Lesson
+from myplatform.cache import bump_cache_version
+from .models import Course
+
+CATALOG_CACHE_NAMESPACE = 'catalog'
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=CourseCategoryRelation)
+@receiver(post_delete, sender=CourseCategoryRelation)
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def invalidate_catalog_cache(sender, **kwargs):
+    # Після коміту, інакше паралельний запит може закешувати старі дані вже під новою версією
+    transaction.on_commit(lambda: bump_cache_version(CATALOG_CACHE_NAMESPACE))
@@ -1,3 +1,92 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from apps.categories.models import CourseCategory, CourseCategoryRelation
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.modules.models import Module
+from apps.progress_tracking.models import LessonProgress
+from apps.users.models import CustomUser
+
+
+class CourseCatalogQueryCountTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.student = CustomUser.objects.create_user(username="student", password="1234567890HTML", role='student')
+        self.categories = [CourseCategory.objects.create(name=f"Category {i}") for i in range(3)]
+
+        self.courses = []
+        for i in range(100):
+            course = Course.objects.create(
+                title=f"Course {i}",
+                description="Course Description",
+                teacher=self.teacher,
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=30),
+                duration=30,
+                batch_number=1,
+                status='free'
+            )
+            for category in self.categories[:i % 4]:
+                CourseCategoryRelation.objects.create(course=course, category=category)
+            self.courses.append(course)
+
+        for course in self.courses[:10]:
+            Enrollment.objects.create(course=course, student=self.student)
+            module = Module.objects.create(course=course, title="Module", description="Module Description")
+            lessons = [Lesson.objects.create(module=module, title=f"Lesson {j}", content="Content") for j in range(3)]
+            for lesson in lessons[:course.id % 3]:
+                LessonProgress.objects.create(student=self.student, lesson=lesson)
+
+    def expected(self, course, student=None):
+        return {
+            'total_lessons': Lesson.objects.filter(module__course=course).count(),
+            'completed_lessons': LessonProgress.objects.filter(student=student, lesson__module__course=course).count()
+            if student else 0,
+            'categories': list(CourseCategoryRelation.objects.filter(course=course).order_by('id').values_list(
+                'category__name', flat=True
+            )),
+        }
+
+    def actual(self, row):
+        return {
+            'total_lessons': row['total_lessons'],
+            'completed_lessons': row['completed_lessons'],
+            'categories': [category['name'] for category in row['categories']],
+        }
+
+    def test_catalog_listing_query_count(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('course-list'))
+        rows = {row['id']: row for row in response.json()}
+        self.assertEqual(len(rows), 100)
+        for course in self.courses:
+            self.assertEqual(self.actual(rows[course.id]), self.expected(course))
+
+    def test_student_catalog_listing_query_count(self):
+        self.client.login(username="student", password="1234567890HTML")
+
+        # сесія + користувач + курси + категорії
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('course-list'))
+        rows = {row['id']: row for row in response.json()}
+        for course in self.courses:
+            self.assertEqual(self.actual(rows[course.id]), self.expected(course, self.student))
+
+    def test_enrolled_courses_query_count(self):
+        self.client.login(username="student", password="1234567890HTML")
+
+        # сесія + користувач + студент + курси + категорії
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('user_enrolled_courses', kwargs={'user_id': self.student.id}))
+        rows = response.json()['courses']
+        self.assertEqual([row['id'] for row in rows], [course.id for course in self.courses[:10]])
+        for row, course in zip(rows, self.courses):
+            self.assertEqual(self.actual(row), self.expected(course, self.student))
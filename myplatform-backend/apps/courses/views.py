@@ -7,8 +7,8 @@ from .serializers import CourseSerializer
 from .mixins import CsrfExemptSessionAuthentication
 from rest_framework.permissions import AllowAny
 
-import boto3
 from django.conf import settings
+from django.db import transaction
 from botocore.exceptions import ClientError
 
 from rest_framework.views import APIView
@@ -23,16 +23,19 @@ from apps.courses.models import Course
 from apps.assignments.models import Assignment
 from apps.questions.models import Question
 from .serializers import UserSerializer
+from .signals import CATALOG_CACHE_NAMESPACE
+from myplatform.cache import get_or_compute, versioned_key
+from myplatform.pagination import KeysetPagination
+from apps.storage.cleanup import course_storage_prefix, schedule_prefix_purge
+from apps.storage.client import get_s3_client
+from apps.storage.serializers import UploadSerializer
+from apps.storage.uploads import enqueue_upload
 
+CATALOG_CACHE_TIMEOUT = 60
 
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_S3_REGION_NAME
-)
 
 def create_course_folders_in_s3(course_id):
+    s3_client = get_s3_client()
     try:
         base_path = f'Courses/Course_{course_id}/'
         s3_client.put_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=f'{base_path}assignments/')
@@ -46,10 +49,26 @@ def create_course_folders_in_s3(course_id):
 class CourseViewSet(viewsets.ModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
+    pagination_class = KeysetPagination
     
     authentication_classes = (CsrfExemptSessionAuthentication,)
     permission_classes = [AllowAny]
 
+    def get_queryset(self):
+        return Course.objects.for_catalog(self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        user = request.user
+        if user.is_authenticated and user.role == 'student':
+            return super().list(request, *args, **kwargs)
+
+        # Для всіх, крім студентів, каталог не залежить від користувача - кешуємо спільно
+        cache_key = versioned_key(CATALOG_CACHE_NAMESPACE, 'courses', request.get_full_path())
+        data = get_or_compute(
+            cache_key, lambda: super(CourseViewSet, self).list(request, *args, **kwargs).data, CATALOG_CACHE_TIMEOUT
+        )
+        return Response(data)
+
     @action(detail=True, methods=['post'], url_path='add-categories')
     def add_categories(self, request, pk=None):
         course = self.get_object()
@@ -82,28 +101,16 @@ class CourseViewSet(viewsets.ModelViewSet):
         return Response({'message': 'Course created successfully', 'course': serializer.data}, status=status.HTTP_201_CREATED)
 
     def perform_destroy(self, instance):
-        instance.delete()
+        # Файли курсу видаляються з S3 лише після коміту видалення з БД
+        with transaction.atomic():
+            schedule_prefix_purge(course_storage_prefix(instance.id))
+            instance.delete()
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        try:
-            self.delete_course_files_from_s3(instance.id)
-        except ClientError as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
         self.perform_destroy(instance)
         return Response({'message': 'Course deleted successfully'}, status=status.HTTP_200_OK)
 
-    def delete_course_files_from_s3(self, course_id):
-
-        course_folder = f"Courses/Course_{course_id}/"
-
-        response = s3_client.list_objects_v2(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Prefix=course_folder)
-
-        if 'Contents' in response:
-            objects_to_delete = [{'Key': obj['Key']} for obj in response['Contents']]
-            s3_client.delete_objects(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Delete={'Objects': objects_to_delete})
-
     def perform_update(self, serializer):
         serializer.save()
 
@@ -114,6 +121,10 @@ class CourseViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
 
+        if getattr(instance, '_prefetched_objects_cache', None):
+            # Категорії могли змінитися - скидаємо prefetch, як це робить UpdateModelMixin
+            instance._prefetched_objects_cache = {}
+
         return Response({'message': 'Course updated successfully', 'course': serializer.data}, status=status.HTTP_200_OK)
 
 import urllib.parse
@@ -133,28 +144,22 @@ class CourseUpdateIntroVideoView(APIView):
         if not file:
             return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            
-            if course.intro_video_url:
-                parsed_url = urllib.parse.urlparse(course.intro_video_url)
-                encoded_old_video_key = parsed_url.path.lstrip('/')
-                old_video_key = urllib.parse.unquote(encoded_old_video_key)
-                s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=old_video_key)
-
+        replaces_key = ''
+        if course.intro_video_url:
+            parsed_url = urllib.parse.urlparse(course.intro_video_url)
+            replaces_key = urllib.parse.unquote(parsed_url.path.lstrip('/'))
 
-            s3_file_path = f"Courses/Course_{course.id}/course_files/{file.name}"
-            s3_client.upload_fileobj(file, settings.AWS_STORAGE_BUCKET_NAME, s3_file_path)
-
-            encoded_file_path = urllib.parse.quote(s3_file_path, safe='/')
-
-            file_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/{encoded_file_path}"
-
-            course.intro_video_url = file_url
-            course.save()
+        # Файл іде в S3 у фоні; intro_video_url і видалення старого файлу - після успішного завантаження
+        s3_file_path = f"Courses/Course_{course.id}/course_files/{file.name}"
+        upload = enqueue_upload(
+            file, s3_file_path, uploaded_by=request.user, target=course, target_field='intro_video_url', replaces_key=replaces_key
+        )
 
-            return Response({'message': 'Intro video uploaded successfully', 'course': CourseSerializer(course).data}, status=status.HTTP_200_OK)
-        except ClientError as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({
+            'message': 'Intro video upload started',
+            'course': CourseSerializer(course).data,
+            'upload': UploadSerializer(upload).data
+        }, status=status.HTTP_202_ACCEPTED)
 
 class CourseUpdateImageView(APIView):
     authentication_classes = (CsrfExemptSessionAuthentication,)
@@ -170,26 +175,22 @@ class CourseUpdateImageView(APIView):
         if not file:
             return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            if course.image_url:
-                parsed_url = urllib.parse.urlparse(course.image_url)
-                encoded_old_image_key = parsed_url.path.lstrip('/')
-                old_image_key = urllib.parse.unquote(encoded_old_image_key)
-                s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=old_image_key)
+        replaces_key = ''
+        if course.image_url:
+            parsed_url = urllib.parse.urlparse(course.image_url)
+            replaces_key = urllib.parse.unquote(parsed_url.path.lstrip('/'))
 
-            s3_file_path = f"Courses/Course_{course.id}/course_files/{file.name}"
-            s3_client.upload_fileobj(file, settings.AWS_STORAGE_BUCKET_NAME, s3_file_path)
-
-            encoded_file_path = urllib.parse.quote(s3_file_path, safe='/')
-
-            file_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/{encoded_file_path}"
-
-            course.image_url = file_url
-            course.save()
+        # Файл іде в S3 у фоні; image_url і видалення старого файлу - після успішного завантаження
+        s3_file_path = f"Courses/Course_{course.id}/course_files/{file.name}"
+        upload = enqueue_upload(
+            file, s3_file_path, uploaded_by=request.user, target=course, target_field='image_url', replaces_key=replaces_key
+        )
 
-            return Response({'message': 'Image uploaded successfully', 'course': CourseSerializer(course).data}, status=status.HTTP_200_OK)
-        except ClientError as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({
+            'message': 'Image upload started',
+            'course': CourseSerializer(course).data,
+            'upload': UploadSerializer(upload).data
+        }, status=status.HTTP_202_ACCEPTED)
         
 
 class CourseParticipantsView(APIView):
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='enrollment',
+            name='enrollment_date',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
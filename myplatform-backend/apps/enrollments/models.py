@@ -7,7 +7,7 @@ from apps.users.models import CustomUser
 class Enrollment(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     student = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
-    enrollment_date = models.DateTimeField(auto_now_add=True)
+    enrollment_date = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return f"{self.student.username} enrolled in {self.course.title}"
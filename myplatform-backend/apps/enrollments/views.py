@@ -82,8 +82,7 @@ class UserEnrolledCoursesView(APIView):
         except CustomUser.DoesNotExist:
             return Response({'error': 'Student not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        enrollments = Enrollment.objects.filter(student=student)
-        courses = [enrollment.course for enrollment in enrollments]
+        courses = Course.objects.for_catalog(request.user).filter(enrollment__student=student).order_by('enrollment__id')
 
         serializer = CourseSerializer(courses, many=True, context={'request': request})
         return Response({'courses': serializer.data}, status=status.HTTP_200_OK)
@@ -0,0 +1,55 @@
+# apps/jobs/management/commands/run_workers.py
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.queue import job_metrics, purge_finished_jobs, requeue_stalled_jobs, run_pending
+from apps.jobs.worker import WorkerPool
+
+
+class Command(BaseCommand):
+    help = "Запускає процеси-воркери фонової черги завдань (apps.jobs)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help="Кількість процесів-воркерів")
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help="Пауза між опитуваннями порожньої черги, секунд")
+        parser.add_argument('--burst', action='store_true',
+                            help="Виконати готові завдання і завершитися (напр. з cron)")
+        parser.add_argument('--inline', action='store_true',
+                            help="Разом з --burst: виконати завдання в цьому процесі, без дочірніх")
+        parser.add_argument('--stats', action='store_true', help="Вивести метрики завдань і завершитися")
+        parser.add_argument('--purge-done-days', type=int, default=None,
+                            help="Видалити успішно завершені завдання, старші за N днів, і завершитися")
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            return self.print_stats()
+
+        if options['purge_done_days'] is not None:
+            deleted = purge_finished_jobs(timedelta(days=options['purge_done_days']))
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} finished jobs"))
+            return
+
+        if options['burst'] and options['inline']:
+            requeue_stalled_jobs()
+            processed = run_pending(worker='inline')
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs"))
+            return
+
+        self.stdout.write(f"Starting {options['processes']} job workers")
+        WorkerPool(options['processes'], poll_interval=options['poll_interval'], burst=options['burst']).run()
+        self.stdout.write(self.style.SUCCESS("Job workers stopped"))
+
+    def print_stats(self):
+        self.stdout.write(
+            f"{'job':<60} {'queued':>7} {'running':>7} {'done':>7} {'failed':>7} {'retried':>7} "
+            f"{'avg, s':>8} {'max, s':>8} {'wait, s':>8}"
+        )
+        for row in job_metrics():
+            avg_wait = row['avg_wait'].total_seconds() if row['avg_wait'] is not None else 0
+            self.stdout.write(
+                f"{row['name']:<60} {row['queued']:>7} {row['running']:>7} {row['done']:>7} {row['failed']:>7} "
+                f"{row['retried']:>7} {row['avg_duration'] or 0:>8.3f} {row['max_duration'] or 0:>8.3f} {avg_wait:>8.3f}"
+            )
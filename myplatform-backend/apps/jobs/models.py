@@ -0,0 +1,51 @@
+# apps/jobs/models.py
+
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """Завдання фонової черги: виклик функції name(*args, **kwargs) у процесі manage.py run_workers"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    # Повний шлях до функції, напр. 'apps.storage.cleanup.delete_keys'
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+
+    # Не раніше цього часу (відкладений повтор після помилки)
+    run_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Воркер оновлює поле кожні JOBS_HEARTBEAT_INTERVAL секунд, поки виконує завдання
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Тривалість останньої спроби, секунд
+    duration = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Вибірка наступного завдання: WHERE status = 'queued' AND run_at <= now ORDER BY run_at, id
+            models.Index(fields=['status', 'run_at', 'id']),
+            models.Index(fields=['name', 'finished_at']),
+        ]
+
+    @property
+    def wait_time(self):
+        """Скільки завдання чекало в черзі до останнього запуску, секунд"""
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.created_at).total_seconds()
+
+    def __str__(self):
+        return f"{self.name} #{self.id} ({self.status})"
@@ -0,0 +1,205 @@
+# apps/jobs/queue.py
+"""
+Черга фонових завдань у таблиці Job.
+
+enqueue() вставляє рядок у поточній транзакції, тож завдання з'являється в черзі лише разом
+з даними, які його породили. Воркери (manage.py run_workers) забирають завдання через
+SELECT ... FOR UPDATE SKIP LOCKED на PostgreSQL; на SQLite, де блокувань рядків немає,
+ексклюзивність дає умовний UPDATE ... WHERE status = 'queued'. Невдала спроба повторюється
+з експоненційною затримкою, доки не вичерпано max_attempts. Поки завдання виконується, воркер
+оновлює heartbeat_at; завдання без heartbeat довше за JOBS_STALLED_AFTER повертається в чергу.
+
+BACKGROUND_TASKS_EAGER = True виконує завдання одразу після коміту в поточному процесі (тести).
+"""
+
+import logging
+import random
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Avg, Count, F, Max, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Скільки разів на SQLite пробувати наступне завдання, якщо інший воркер забрав попереднє
+CLAIM_ATTEMPTS = 10
+
+
+def job_name(fn):
+    name = f"{fn.__module__}.{fn.__qualname__}"
+    if '<' in name:
+        raise ValueError(f"{name} is not importable, only module-level functions can be queued")
+    return name
+
+
+def enqueue(fn, *args, **kwargs):
+    """Ставить fn(*args, **kwargs) у чергу; аргументи мають серіалізуватися в JSON"""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        transaction.on_commit(lambda: fn(*args, **kwargs))
+        return None
+    return Job.objects.create(
+        name=job_name(fn), args=list(args), kwargs=kwargs, max_attempts=settings.JOBS_MAX_ATTEMPTS
+    )
+
+
+def retry_delay(attempts):
+    """Затримка перед повтором: JOBS_RETRY_BACKOFF * 2^(n-1) з розкидом ±25%, не більше години"""
+    delay = min(settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1), 60 * 60)
+    return timedelta(seconds=delay * random.uniform(0.75, 1.25))
+
+
+def _mark_running(job_id, worker):
+    now = timezone.now()
+    return Job.objects.filter(id=job_id, status='queued').update(
+        status='running', attempts=F('attempts') + 1, started_at=now, heartbeat_at=now, worker=worker
+    )
+
+
+def claim_job(worker=''):
+    """Забирає наступне готове завдання (status -> running) або повертає None"""
+    ready = Job.objects.filter(status='queued', run_at__lte=timezone.now()).order_by('run_at', 'id')
+
+    if connection.features.has_select_for_update_skip_locked:
+        # PostgreSQL: рядки, заблоковані іншими воркерами, пропускаються без очікування
+        with transaction.atomic():
+            job_id = ready.select_for_update(skip_locked=True).values_list('id', flat=True).first()
+            if job_id is None or not _mark_running(job_id, worker):
+                return None
+    else:
+        # SQLite: без транзакції навколо SELECT (інакше підвищення блокування дає "database is locked");
+        # хто перший виконав умовний UPDATE, той і забрав завдання
+        for _ in range(CLAIM_ATTEMPTS):
+            job_id = ready.values_list('id', flat=True).first()
+            if job_id is None:
+                return None
+            if _mark_running(job_id, worker):
+                break
+        else:
+            return None
+
+    return Job.objects.get(id=job_id)
+
+
+class Heartbeat(threading.Thread):
+    """Потік, що кожні interval секунд оновлює heartbeat_at завдання, поки воно виконується"""
+
+    def __init__(self, job_id, interval):
+        super().__init__(name=f'job-heartbeat-{job_id}', daemon=True)
+        self.job_id = job_id
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def beat(self):
+        try:
+            Job.objects.filter(id=self.job_id, status='running').update(heartbeat_at=timezone.now())
+        except DatabaseError as e:
+            logger.warning("Heartbeat of job #%s failed: %s", self.job_id, e)
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                self.beat()
+        finally:
+            # У цьому потоці з'єднання з БД ніхто інший не закриє
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_job(job):
+    """Виконує забране завдання і записує результат, тривалість і, за потреби, повтор"""
+    started = time.monotonic()
+    heartbeat = Heartbeat(job.id, settings.JOBS_HEARTBEAT_INTERVAL)
+    heartbeat.start()
+    try:
+        import_string(job.name)(*job.args, **job.kwargs)
+    except Exception:
+        job.duration = time.monotonic() - started
+        job.finished_at = timezone.now()
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = 'queued'
+            job.run_at = timezone.now() + retry_delay(job.attempts)
+            logger.warning("Job %s failed (attempt %d), retrying at %s", job, job.attempts, job.run_at)
+        else:
+            job.status = 'failed'
+            logger.error("Job %s failed after %d attempts:\n%s", job, job.attempts, job.last_error)
+    else:
+        job.duration = time.monotonic() - started
+        job.finished_at = timezone.now()
+        job.status = 'done'
+        job.last_error = ''
+        logger.info("Job %s done in %.3fs", job, job.duration)
+    finally:
+        heartbeat.stop()
+
+    try:
+        job.save(update_fields=['status', 'run_at', 'duration', 'finished_at', 'last_error'])
+    except DatabaseError:
+        # Воркер живе далі; завдання лишається running без heartbeat і повертається в чергу requeue_stalled_jobs
+        logger.exception("Failed to record the result of job %s", job)
+    return job
+
+
+def requeue_stalled_jobs(stalled_after=None):
+    """Повертає в чергу завдання, чий воркер зник посеред виконання (running без heartbeat довше за stalled_after)"""
+    if stalled_after is None:
+        stalled_after = timedelta(seconds=settings.JOBS_STALLED_AFTER)
+    cutoff = timezone.now() - stalled_after
+    # Рядки без heartbeat_at - завдання, забрані до появи поля
+    stalled = Job.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff), status='running'
+    )
+    failed = stalled.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', last_error="Worker stopped while running the job", finished_at=timezone.now()
+    )
+    requeued = stalled.update(status='queued', run_at=timezone.now())
+    return requeued, failed
+
+
+def run_pending(worker='', limit=None):
+    """Виконує готові завдання, доки черга не спорожніє (або limit завдань); повертає кількість"""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_job(worker)
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
+
+
+def purge_finished_jobs(older_than):
+    """Видаляє завершені успішно завдання, старші за older_than"""
+    deleted, _ = Job.objects.filter(status='done', finished_at__lt=timezone.now() - older_than).delete()
+    return deleted
+
+
+def job_metrics(since=None):
+    """Кількість, тривалість і черга очікування по кожному типу завдань"""
+    jobs = Job.objects.all()
+    if since is not None:
+        jobs = jobs.filter(created_at__gte=since)
+    return list(
+        jobs.values('name').annotate(
+            total=Count('id'),
+            queued=Count('id', filter=Q(status='queued')),
+            running=Count('id', filter=Q(status='running')),
+            done=Count('id', filter=Q(status='done')),
+            failed=Count('id', filter=Q(status='failed')),
+            retried=Count('id', filter=Q(attempts__gt=1)),
+            avg_duration=Avg('duration'),
+            max_duration=Max('duration'),
+            avg_wait=Avg(F('started_at') - F('created_at')),
+        ).order_by('name')
+    )
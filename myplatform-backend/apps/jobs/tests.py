@@ -0,0 +1,139 @@
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.jobs.models import Job
+from apps.jobs.queue import claim_job, enqueue, job_metrics, requeue_stalled_jobs, run_job, run_pending
+from apps.users.models import CustomUser
+
+CALLS = []
+
+
+def record_call(*args, **kwargs):
+    CALLS.append((args, kwargs))
+
+
+def always_fail():
+    raise RuntimeError("boom")
+
+
+def slow_call():
+    time.sleep(0.5)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=False, JOBS_MAX_ATTEMPTS=3, JOBS_RETRY_BACKOFF=10)
+class JobQueueTest(TestCase):
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueued_job_runs_once(self):
+        job = enqueue(record_call, 1, [2, 3], key='value')
+        self.assertEqual((job.name, job.status), ('apps.jobs.tests.record_call', 'queued'))
+
+        self.assertEqual(run_pending(worker='test'), 1)
+        self.assertEqual(CALLS, [((1, [2, 3]), {'key': 'value'})])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.worker), ('done', 1, 'test'))
+        self.assertIsNotNone(job.duration)
+        self.assertIsNotNone(job.wait_time)
+
+        self.assertEqual(run_pending(), 0)
+        self.assertEqual(len(CALLS), 1)
+
+    def test_failed_job_is_retried_with_backoff(self):
+        job = enqueue(always_fail)
+        with self.assertLogs('apps.jobs.queue', 'WARNING'):
+            run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        self.assertIn("RuntimeError: boom", job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=5))
+
+        # Повтор ще не настав
+        self.assertIsNone(claim_job())
+
+        for attempt in (2, 3):
+            Job.objects.filter(id=job.id).update(run_at=timezone.now())
+            with self.assertLogs('apps.jobs.queue', 'WARNING'):
+                run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 3))
+
+        metrics = {row['name']: row for row in job_metrics()}
+        self.assertEqual((metrics['apps.jobs.tests.always_fail']['failed'], metrics['apps.jobs.tests.always_fail']['retried']), (1, 1))
+
+    def test_stalled_jobs_are_requeued(self):
+        job = enqueue(record_call)
+        long_running = enqueue(record_call)
+        claimed = claim_job(worker='crashed')
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claim_job(worker='busy').id, long_running.id)
+        two_hours_ago = timezone.now() - timedelta(hours=2)
+        Job.objects.filter(id=job.id).update(started_at=two_hours_ago, heartbeat_at=two_hours_ago)
+        # Довге завдання живого воркера: почалося давно, але heartbeat свіжий
+        Job.objects.filter(id=long_running.id).update(started_at=two_hours_ago)
+
+        self.assertEqual(requeue_stalled_jobs(timedelta(hours=1)), (1, 0))
+        self.assertEqual(Job.objects.get(id=long_running.id).status, 'running')
+        self.assertEqual(run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('done', 2))
+
+    def test_failed_status_write_does_not_kill_worker(self):
+        enqueue(record_call)
+        job = claim_job(worker='test')
+        with mock.patch.object(Job, 'save', side_effect=OperationalError("connection lost")), \
+                self.assertLogs('apps.jobs.queue', 'ERROR'):
+            run_job(job)
+        self.assertEqual(len(CALLS), 1)
+        # Результат не записано - завдання лишається running, доки його не поверне requeue_stalled_jobs
+        self.assertEqual(Job.objects.get(id=job.id).status, 'running')
+
+    def test_run_workers_command(self):
+        for i in range(3):
+            enqueue(record_call, i)
+        out = StringIO()
+        call_command('run_workers', '--burst', '--inline', stdout=out)
+        self.assertIn("Processed 3 jobs", out.getvalue())
+        self.assertEqual(sorted(args for args, _ in CALLS), [(0,), (1,), (2,)])
+
+        out = StringIO()
+        call_command('run_workers', '--stats', stdout=out)
+        self.assertIn("apps.jobs.tests.record_call", out.getvalue())
+
+    def test_password_reset_email_is_queued(self):
+        CustomUser.objects.create_user(username="student", email="student@example.com", password="1234567890HTML")
+        response = Client().post(
+            reverse('reset_password_request'), {'email': "student@example.com"}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+
+        run_pending()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["student@example.com"])
+        self.assertIn("reset-password?uid=", mail.outbox[0].body)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=False, JOBS_HEARTBEAT_INTERVAL=0.1)
+class JobHeartbeatTest(TransactionTestCase):
+    # Heartbeat пише з окремого потоку - потрібні закомічені дані, тож без обгортки TestCase
+
+    def test_heartbeat_updated_while_job_runs(self):
+        enqueue(slow_call)
+        job = claim_job(worker='test')
+        started = Job.objects.get(id=job.id).heartbeat_at
+
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertGreater(job.heartbeat_at, started + timedelta(seconds=0.2))
@@ -0,0 +1,106 @@
+# apps/jobs/worker.py
+"""
+Процеси-воркери черги Job. Батьківський процес (manage.py run_workers) запускає N дочірніх,
+перезапускає ті, що впали, і періодично повертає в чергу завдання завислих воркерів.
+SIGTERM / SIGINT - м'яка зупинка: поточне завдання довиконується.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def worker_main(index, poll_interval, burst):
+    """Точка входу дочірнього процесу (spawn - з чистим інтерпретатором)"""
+    import django
+
+    django.setup()
+
+    from django.db import DatabaseError, close_old_connections, connection
+
+    from .queue import claim_job, run_job
+
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop.set())
+
+    name = f"{socket.gethostname()}:{os.getpid()}:{index}"
+    logger.info("Worker %s started", name)
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                job = claim_job(name)
+            except DatabaseError as e:
+                # Напр. розрив з'єднання або "database is locked" на SQLite - пробуємо знову
+                logger.warning("Worker %s failed to claim a job: %s", name, e)
+                connection.close()
+                stop.wait(poll_interval)
+                continue
+            if job is not None:
+                run_job(job)
+            elif burst:
+                break
+            else:
+                stop.wait(poll_interval)
+    finally:
+        connection.close()
+    logger.info("Worker %s stopped", name)
+
+
+class WorkerPool:
+
+    def __init__(self, processes, poll_interval=1.0, burst=False, maintenance_interval=60.0):
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.maintenance_interval = maintenance_interval
+        self.context = multiprocessing.get_context('spawn')
+        self.workers = {}
+        self.stop = threading.Event()
+
+    def start_worker(self, index):
+        process = self.context.Process(
+            target=worker_main, args=(index, self.poll_interval, self.burst), name=f'job-worker-{index}'
+        )
+        process.start()
+        self.workers[index] = process
+
+    def run(self):
+        from django.db import connection
+
+        from .queue import requeue_stalled_jobs
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: self.stop.set())
+
+        requeue_stalled_jobs()
+        connection.close()
+        for index in range(self.processes):
+            self.start_worker(index)
+
+        while self.workers:
+            self.stop.wait(self.maintenance_interval if not self.burst else self.poll_interval)
+            for index, process in list(self.workers.items()):
+                if process.is_alive():
+                    continue
+                del self.workers[index]
+                if process.exitcode != 0 and not self.stop.is_set() and not self.burst:
+                    logger.warning("Worker %s exited with code %s, restarting", process.name, process.exitcode)
+                    self.start_worker(index)
+
+            if self.stop.is_set():
+                for process in self.workers.values():
+                    process.terminate()  # SIGTERM - воркер довиконає поточне завдання
+                for process in self.workers.values():
+                    process.join()
+                break
+
+            if not self.burst:
+                requeue_stalled_jobs()
+                connection.close()
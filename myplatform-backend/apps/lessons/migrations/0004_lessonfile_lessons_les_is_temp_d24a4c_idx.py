@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-18 17:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lessons', '0003_alter_lessonlink_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lessonfile',
+            index=models.Index(fields=['is_temp', 'created_at'], name='lessons_les_is_temp_d24a4c_idx'),
+        ),
+    ]
@@ -21,6 +21,12 @@ class LessonFile(models.Model):
     is_temp = models.BooleanField(default=True)  # Позначення тимчасового файлу
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Пошук покинутих тимчасових файлів (manage.py gc_temp_files)
+            models.Index(fields=['is_temp', 'created_at']),
+        ]
+
     def __str__(self):
         return f'{self.file_type} - {self.file_url}'
 
@@ -5,6 +5,7 @@ from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError
 from .models import Lesson
 from apps.progress_tracking.models import LessonProgress
+from apps.storage.serializers import FileListSerializer, UploadStatusField
 import urllib.parse
 
 
@@ -28,6 +29,11 @@ class LessonSerializer(serializers.ModelSerializer):
         return lesson
     
     def get_is_completed(self, obj):
+        # LessonsByModuleView передає ID пройдених уроків модуля одним набором
+        completed_lesson_ids = self.context.get('completed_lesson_ids')
+        if completed_lesson_ids is not None:
+            return obj.id in completed_lesson_ids
+
         request = self.context.get('request', None)
         user = request.user if request else None
         if user and user.is_authenticated and user.role == 'student':
@@ -37,10 +43,12 @@ class LessonSerializer(serializers.ModelSerializer):
 
 class LessonFileSerializer(serializers.ModelSerializer):
     file_name = serializers.SerializerMethodField() 
+    upload_status = UploadStatusField()
 
     class Meta:
         model = LessonFile
-        fields = ['id', 'lesson_id', 'file_url', 'file_type', 'file_size', 'is_temp', 'created_at', 'file_name']
+        fields = ['id', 'lesson_id', 'file_url', 'file_type', 'file_size', 'is_temp', 'created_at', 'file_name', 'upload_status']
+        list_serializer_class = FileListSerializer
 
     def get_file_name(self, obj):
         
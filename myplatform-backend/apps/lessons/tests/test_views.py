@@ -6,6 +6,7 @@ from apps.lessons.models import Lesson
 from apps.modules.models import Module
 from apps.courses.models import Course
 from apps.lessons.models import LessonLink  # Імпортуємо модель для посилань
+from apps.progress_tracking.models import LessonProgress
 from datetime import date, timedelta
 
 class LessonsAPITest(TestCase):
@@ -58,3 +59,24 @@ class LessonsAPITest(TestCase):
         links = response.json()
         link_urls = [link['link_url'] for link in links]
         self.assertIn("https://example.com", link_urls)
+
+    def test_get_lessons_completion_for_student(self):
+        student = get_user_model().objects.create_user(username="student", password=self.password, role="student")
+        lessons = [self.lesson] + [
+            Lesson.objects.create(module=self.module, title=f"Lesson {i}", content="Lesson Content") for i in range(9)
+        ]
+        completed_ids = {lesson.id for lesson in lessons[::3]}
+        for lesson_id in completed_ids:
+            LessonProgress.objects.create(student=student, lesson_id=lesson_id)
+        self.client.login(username="student", password=self.password)
+
+        # сесія + користувач + уроки + пройдені уроки, незалежно від кількості уроків
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("lessons_by_module", kwargs={"module_id": self.module.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {lesson['id'] for lesson in response.json() if lesson['is_completed']}, completed_ids
+        )
+
+        response = self.client.get(reverse("lesson_detail", kwargs={"pk": self.lesson.id}))
+        self.assertTrue(response.json()['is_completed'])
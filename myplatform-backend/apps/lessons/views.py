@@ -1,4 +1,3 @@
-import boto3
 from botocore.exceptions import ClientError
 from django.conf import settings
 from rest_framework import status
@@ -13,16 +12,15 @@ from rest_framework.generics import RetrieveAPIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from .mixins import CsrfExemptSessionAuthentication
+from apps.progress_tracking.models import LessonProgress
+from apps.storage.client import get_s3_client, public_url
+from apps.storage.serializers import UploadSerializer
+from apps.storage.uploads import discard_uploads, enqueue_upload
+from django.db import transaction
 from rest_framework.permissions import IsAuthenticated
 
 from urllib.parse import urlparse, unquote
 
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_S3_REGION_NAME
-)
 
 class AddLessonLinksView(APIView):
     def post(self, request, lesson_id):
@@ -74,8 +72,9 @@ class DeleteTempFileView(APIView):
 
         try:
             
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
+            get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
             
+            discard_uploads(LessonFile, [file.id])
             file.delete()
 
             return Response({"message": "Temporary file successfully deleted"}, status=status.HTTP_200_OK)
@@ -84,7 +83,6 @@ class DeleteTempFileView(APIView):
         except Exception as e:
             return Response({"error": f"Error deleting file: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-import urllib.parse
 
 class UploadLessonFileView(APIView):
     def post(self, request, lesson_id):
@@ -102,26 +100,21 @@ class UploadLessonFileView(APIView):
         if file_type not in ['mp4', 'pdf', 'doc', 'docx']:
             return Response({"error": "Invalid file type"}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            s3_file_path = f"Courses/Course_{course_id}/lessons/lesson_{lesson_id}/{file.name}"
-            s3_client.upload_fileobj(file, settings.AWS_STORAGE_BUCKET_NAME, s3_file_path)
-            
-            encoded_file_path = urllib.parse.quote(s3_file_path, safe='/')
+        s3_file_path = f"Courses/Course_{course_id}/lessons/lesson_{lesson_id}/{file.name}"
 
-            file_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/{encoded_file_path}"
-            
+        # Файл іде в S3 у фоні; запис створюється одразу з кінцевим URL
+        with transaction.atomic():
             lesson_file = LessonFile.objects.create(
                 lesson=lesson,
-                file_url=file_url,
+                file_url=public_url(s3_file_path),
                 file_type=file_type,
                 file_size=file.size,
                 is_temp=True
             )
+            upload = enqueue_upload(file, s3_file_path, uploaded_by=request.user, target=lesson_file)
 
-            serializer = LessonFileSerializer(lesson_file)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        except ClientError as e:
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        serializer = LessonFileSerializer(lesson_file)
+        return Response({**serializer.data, 'upload': UploadSerializer(upload).data}, status=status.HTTP_201_CREATED)
 
 class LessonCreateView(generics.CreateAPIView):
     queryset = Lesson.objects.all()
@@ -152,6 +145,14 @@ class LessonsByModuleView(generics.ListAPIView):
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context.update({"request": self.request})
+
+        user = self.request.user
+        if user.is_authenticated and user.role == 'student':
+            context["completed_lesson_ids"] = set(LessonProgress.objects.filter(
+                student=user, lesson__module_id=self.kwargs['module_id']
+            ).values_list('lesson_id', flat=True))
+        else:
+            context["completed_lesson_ids"] = set()
         return context
 
 
@@ -212,8 +213,9 @@ class DeleteConfirmedFileView(APIView):
         s3_file_path = unquote(encoded_s3_file_path)
 
         try:
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
+            get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
 
+            discard_uploads(LessonFile, [file.id])
             file.delete()
 
             return Response({"message": "Confirmed file successfully deleted"}, status=status.HTTP_200_OK)
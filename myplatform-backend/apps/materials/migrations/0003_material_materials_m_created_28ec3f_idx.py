@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_courses_cou_created_7ad857_idx'),
+        ('materials', '0002_alter_materialfile_file_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['created_at', 'id'], name='materials_m_created_28ec3f_idx'),
+        ),
+    ]
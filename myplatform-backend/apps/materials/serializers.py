@@ -1,13 +1,16 @@
 from rest_framework import serializers
 from .models import Material, MaterialFile
+from apps.storage.serializers import FileListSerializer, UploadStatusField
 import urllib.parse
 
 class MaterialFileSerializer(serializers.ModelSerializer):
     file_name = serializers.SerializerMethodField()  
+    upload_status = UploadStatusField()
 
     class Meta:
         model = MaterialFile
-        fields = ['id', 'material', 'file_url', 'file_type', 'file_size', 'uploaded_at', 'file_name']
+        fields = ['id', 'material', 'file_url', 'file_type', 'file_size', 'uploaded_at', 'file_name', 'upload_status']
+        list_serializer_class = FileListSerializer
 
     def get_file_name(self, obj):
         
@@ -6,7 +6,6 @@ from .serializers import MaterialSerializer, MaterialFileSerializer
 from django.shortcuts import get_object_or_404
 from apps.courses.models import Course
 from django.conf import settings
-import boto3
 from urllib.parse import urlparse, unquote
 from apps.assignments.mixins import CsrfExemptSessionAuthentication
 from rest_framework.permissions import IsAuthenticated
@@ -14,14 +13,29 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.generics import ListAPIView
 from apps.enrollments.models import Enrollment
 from rest_framework.generics import RetrieveAPIView
-
-import urllib.parse
-
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-)
+from django.db import transaction
+from django.db.models import Prefetch
+from apps.storage.cleanup import file_keys, schedule_key_deletion
+from apps.storage.client import get_s3_client, public_url
+from apps.storage.serializers import UploadSerializer
+from apps.storage.uploads import discard_uploads, enqueue_upload, with_upload_status
+from myplatform.pagination import KeysetPagination
+
+
+def enqueue_material_files(material, files, user):
+    """Створює MaterialFile для кожного файлу і ставить файли у фонове завантаження в S3"""
+    uploads = []
+    for file in files:
+        s3_file_path = f"Courses/Course_{material.course_id}/materials/material_{material.id}/{file.name}"
+
+        material_file = MaterialFile.objects.create(
+            material=material,
+            file_url=public_url(s3_file_path),
+            file_type=file.content_type,
+            file_size=file.size,
+        )
+        uploads.append(enqueue_upload(file, s3_file_path, uploaded_by=user, target=material_file))
+    return uploads
 
 class MaterialCreateView(APIView):
     authentication_classes = [CsrfExemptSessionAuthentication]
@@ -46,30 +60,16 @@ class MaterialCreateView(APIView):
         if course.teacher != user:
             return Response({'error': 'You are not the teacher of this course.'}, status=status.HTTP_403_FORBIDDEN)
 
-        material = Material.objects.create(
-            course=course,
-            title=title,
-            description=description,
-        )
-
-        for file in files:
-            s3_file_path = f"Courses/Course_{course.id}/materials/material_{material.id}/{file.name}"
-
-            s3_client.upload_fileobj(file, settings.AWS_STORAGE_BUCKET_NAME, s3_file_path)
-
-            encoded_file_path = urllib.parse.quote(s3_file_path, safe='/')
-
-            file_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/{encoded_file_path}"
-
-            MaterialFile.objects.create(
-                material=material,
-                file_url=file_url,
-                file_type=file.content_type,
-                file_size=file.size,
+        with transaction.atomic():
+            material = Material.objects.create(
+                course=course,
+                title=title,
+                description=description,
             )
+            uploads = enqueue_material_files(material, files, user)
 
         serializer = MaterialSerializer(material)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response({**serializer.data, 'uploads': UploadSerializer(uploads, many=True).data}, status=status.HTTP_201_CREATED)
 
 class MaterialUpdateView(APIView):
     authentication_classes = [CsrfExemptSessionAuthentication]
@@ -107,22 +107,12 @@ class MaterialDeleteView(APIView):
         if user.role != 'teacher' or material.course.teacher != user:
             return Response({'error': 'You are not authorized to delete this material.'}, status=status.HTTP_403_FORBIDDEN)
 
-        for file in material.files.all():
-            self.delete_file_from_s3(file.file_url)
-            file.delete()
-
-        material.delete()
+        with transaction.atomic():
+            schedule_key_deletion(file_keys(material.files.all()))
+            discard_uploads(MaterialFile, material.files.values('id'))
+            material.delete()
         return Response({'message': 'Material deleted successfully.'}, status=status.HTTP_200_OK)
 
-    def delete_file_from_s3(self, file_url):
-        parsed_url = urlparse(file_url)
-        s3_file_path = unquote(parsed_url.path.lstrip('/'))
-
-        try:
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
-        except Exception as e:
-            print(f"Error deleting file from S3: {e}")
-
 class MaterialAddFilesView(APIView):
     authentication_classes = [CsrfExemptSessionAuthentication]
     permission_classes = [IsAuthenticated]
@@ -141,24 +131,11 @@ class MaterialAddFilesView(APIView):
         if not files:
             return Response({'error': 'No files provided.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        for file in files:
-            s3_file_path = f"Courses/Course_{material.course.id}/materials/material_{material.id}/{file.name}"
-
-            s3_client.upload_fileobj(file, settings.AWS_STORAGE_BUCKET_NAME, s3_file_path)
-
-            encoded_file_path = urllib.parse.quote(s3_file_path, safe='/')
-
-            file_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/{encoded_file_path}"
-
-            MaterialFile.objects.create(
-                material=material,
-                file_url=file_url,
-                file_type=file.content_type,
-                file_size=file.size,
-            )
+        with transaction.atomic():
+            uploads = enqueue_material_files(material, files, user)
 
         serializer = MaterialSerializer(material)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response({**serializer.data, 'uploads': UploadSerializer(uploads, many=True).data}, status=status.HTTP_200_OK)
 
 class MaterialFileDeleteView(APIView):
     authentication_classes = [CsrfExemptSessionAuthentication]
@@ -177,6 +154,7 @@ class MaterialFileDeleteView(APIView):
         self.delete_file_from_s3(material_file.file_url)
         print("Returned from delete_file_from_s3.")
 
+        discard_uploads(MaterialFile, [material_file.id])
         material_file.delete()
         return Response({'message': 'File deleted successfully.'}, status=status.HTTP_200_OK)
 
@@ -189,7 +167,7 @@ class MaterialFileDeleteView(APIView):
         print(f"S3 file path: {s3_file_path}")
 
         try:
-            response = s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
+            response = get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_file_path)
             print(f"Deleted {s3_file_path} from S3. Response: {response}")
         except Exception as e:
             print(f"Error deleting file from S3: {e}")
@@ -198,12 +176,12 @@ class MaterialFileDeleteView(APIView):
     def delete_files_from_s3(self, prefix):
         try:
             
-            response = s3_client.list_objects_v2(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Prefix=prefix)
+            response = get_s3_client().list_objects_v2(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Prefix=prefix)
             if 'Contents' in response:
                 
                 objects_to_delete = [{'Key': obj['Key']} for obj in response['Contents']]
                 
-                s3_client.delete_objects(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Delete={'Objects': objects_to_delete})
+                get_s3_client().delete_objects(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Delete={'Objects': objects_to_delete})
                 print(f"Deleted all objects under prefix {prefix}")
             else:
                 print(f"No objects found under prefix {prefix}")
@@ -212,18 +190,21 @@ class MaterialFileDeleteView(APIView):
 
 class MaterialListView(ListAPIView):
     serializer_class = MaterialSerializer
+    pagination_class = KeysetPagination
     authentication_classes = [CsrfExemptSessionAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
+        # Файли всіх матеріалів зі статусом завантаження - одним запитом
+        files = Prefetch('files', queryset=with_upload_status(MaterialFile.objects.all()))
 
         if user.role == 'teacher':
             
-            return Material.objects.filter(course__teacher=user)
+            return Material.objects.filter(course__teacher=user).prefetch_related(files)
         elif user.role == 'student':
             enrolled_courses = Enrollment.objects.filter(student=user).values_list('course', flat=True)
-            return Material.objects.filter(course__in=enrolled_courses)
+            return Material.objects.filter(course__in=enrolled_courses).prefetch_related(files)
         else:
             return Material.objects.none()
         
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 17:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usernote',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='notes_usern_user_id_12ab9e_idx'),
+        ),
+    ]
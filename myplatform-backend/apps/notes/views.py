@@ -5,6 +5,7 @@ from .models import UserNote, NoteFolder
 from .serializers import UserNoteSerializer, NoteFolderSerializer
 from rest_framework.permissions import IsAuthenticated
 from .mixins import CsrfExemptSessionAuthentication
+from myplatform.pagination import KeysetPagination
 
 class UserNoteCreateView(generics.CreateAPIView):
     queryset = UserNote.objects.all()
@@ -17,6 +18,7 @@ class UserNoteCreateView(generics.CreateAPIView):
 
 class UserNoteListView(generics.ListAPIView):
     serializer_class = UserNoteSerializer
+    pagination_class = KeysetPagination
     permission_classes = [IsAuthenticated]
     authentication_classes = (CsrfExemptSessionAuthentication,)
 
@@ -0,0 +1,74 @@
+# apps/notifications/delivery.py
+"""
+Розсилка сповіщень.
+
+Отримувачі вибираються лише як id (values_list), сповіщення вставляються пакетами по
+NOTIFICATIONS_BATCH_SIZE через bulk_create, а лічильники непрочитаних кожного пакета
+збільшуються одним UPDATE. Якщо NOTIFICATIONS_DEFERRED, розсилка - завдання черги apps.jobs,
+тож запит, що породив подію, не чекає на вставку тисяч рядків.
+"""
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.enrollments.models import Enrollment
+from apps.jobs.queue import enqueue
+from .models import Notification, NotificationCounter
+
+
+def deliver(kind, user_ids, message, course_id=None, object_id=None, batch_size=None):
+    """Створює сповіщення для user_ids; повертає кількість отримувачів"""
+    return deliver_each(kind, [(user_id, object_id) for user_id in user_ids], message, course_id, batch_size)
+
+
+def deliver_each(kind, recipients, message, course_id=None, batch_size=None):
+    """Сповіщення зі своїм object_id для кожного отримувача: recipients - пари (user_id, object_id)"""
+    batch_size = batch_size or settings.NOTIFICATIONS_BATCH_SIZE
+    recipients = sorted({user_id: object_id for user_id, object_id in recipients}.items())
+    for start in range(0, len(recipients), batch_size):
+        batch = recipients[start:start + batch_size]
+        with transaction.atomic():
+            Notification.objects.bulk_create([
+                Notification(recipient_id=user_id, kind=kind, course_id=course_id, object_id=object_id, message=message)
+                for user_id, object_id in batch
+            ])
+            NotificationCounter.objects.increment([user_id for user_id, _ in batch])
+    return len(recipients)
+
+
+def deliver_to_course(kind, course_id, message, object_id=None, exclude=()):
+    """Сповіщення кожному студенту курсу (крім exclude)"""
+    student_ids = (
+        Enrollment.objects.filter(course_id=course_id)
+        .exclude(student_id__in=list(exclude))
+        .values_list('student_id', flat=True)
+        .distinct()
+    )
+    return deliver(kind, student_ids, message, course_id=course_id, object_id=object_id)
+
+
+def notify_course(kind, course_id, message, object_id=None, exclude=()):
+    if settings.NOTIFICATIONS_DEFERRED:
+        enqueue(deliver_to_course, kind, course_id, message, object_id, list(exclude))
+    else:
+        deliver_to_course(kind, course_id, message, object_id, exclude)
+
+
+def notify_users(kind, user_ids, message, course_id=None, object_id=None):
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    if settings.NOTIFICATIONS_DEFERRED:
+        enqueue(deliver, kind, user_ids, message, course_id, object_id)
+    else:
+        deliver(kind, user_ids, message, course_id, object_id)
+
+
+def notify_each(kind, recipients, message, course_id=None):
+    recipients = [list(recipient) for recipient in recipients]
+    if not recipients:
+        return
+    if settings.NOTIFICATIONS_DEFERRED:
+        enqueue(deliver_each, kind, recipients, message, course_id)
+    else:
+        deliver_each(kind, recipients, message, course_id)
@@ -1,3 +1,66 @@
+# apps/notifications/models.py
+
+from django.conf import settings
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+
+class Notification(models.Model):
+    """Запис у вхідних користувача; створюється масово (apps.notifications.delivery)"""
+    KIND_CHOICES = [
+        ('assignment_created', 'New assignment'),
+        ('submission_graded', 'Submission graded'),
+        ('answer_created', 'New answer'),
+        ('material_created', 'New material'),
+    ]
+
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    course = models.ForeignKey('courses.Course', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    # id об'єкта події (Assignment / Submission / Answer / Material - залежно від kind)
+    object_id = models.PositiveBigIntegerField(null=True, blank=True)
+    message = models.CharField(max_length=255)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Вхідні з keyset-пагінацією: WHERE recipient_id = ? ORDER BY created_at DESC, id DESC
+            models.Index(fields=['recipient', '-created_at', '-id']),
+            # "Позначити все прочитаним" зачіпає лише непрочитані
+            models.Index(fields=['recipient'], condition=Q(is_read=False), name='notification_unread_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} for {self.recipient_id}: {self.message}"
+
+
+class NotificationCounterManager(models.Manager):
+
+    def unread(self, user_id):
+        return self.filter(user_id=user_id).values_list('unread', flat=True).first() or 0
+
+    def increment(self, user_ids, by=1):
+        user_ids = list(user_ids)
+        self.bulk_create([NotificationCounter(user_id=user_id) for user_id in user_ids], ignore_conflicts=True)
+        self.filter(user_id__in=user_ids).update(unread=F('unread') + by)
+
+    def decrement(self, user_id, by=1):
+        self.filter(user_id=user_id).update(unread=Greatest(F('unread') - by, 0))
+
+    def reset(self, user_id):
+        self.filter(user_id=user_id).update(unread=0)
+
+
+class NotificationCounter(models.Model):
+    """Кількість непрочитаних сповіщень: опитування клієнтом - один пошук за первинним ключем"""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='notification_counter'
+    )
+    unread = models.PositiveIntegerField(default=0)
+
+    objects = NotificationCounterManager()
 
-# Create your models here.
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
@@ -0,0 +1,7 @@
+from rest_framework import serializers
+from .models import Notification
+
+class NotificationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Notification
+        fields = ['id', 'kind', 'course', 'object_id', 'message', 'is_read', 'created_at']
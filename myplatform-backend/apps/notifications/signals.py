@@ -0,0 +1,36 @@
+# apps/notifications/signals.py
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.assignments.models import Assignment
+from apps.materials.models import Material
+from apps.questions.models import Answer
+from .delivery import notify_course, notify_users
+
+
+@receiver(post_save, sender=Assignment)
+def notify_assignment_created(sender, instance, created, **kwargs):
+    if created:
+        notify_course('assignment_created', instance.course_id, f"New assignment: {instance.title}", instance.id)
+
+
+@receiver(post_save, sender=Material)
+def notify_material_created(sender, instance, created, **kwargs):
+    if created:
+        notify_course('material_created', instance.course_id, f"New material: {instance.title}", instance.id)
+
+
+@receiver(post_save, sender=Answer)
+def notify_answer_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+    question = instance.question
+    # Учасники обговорення: автор питання і всі, хто вже відповідав
+    participants = set(Answer.objects.filter(question_id=question.id).values_list('user_id', flat=True))
+    participants.add(question.teacher_id)
+    participants.discard(instance.user_id)
+    notify_users(
+        'answer_created', participants, f"New answer to \"{question.title}\"",
+        course_id=question.course_id, object_id=instance.id
+    )
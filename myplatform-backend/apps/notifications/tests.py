@@ -1,3 +1,99 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.assignments.models import Assignment
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.jobs.queue import run_pending
+from apps.notifications.delivery import deliver
+from apps.notifications.models import Notification, NotificationCounter
+from apps.questions.models import Question, Answer
+from apps.users.models import CustomUser
+
+
+@override_settings(NOTIFICATIONS_DEFERRED=False, NOTIFICATIONS_BATCH_SIZE=50)
+class NotificationFanOutTest(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=self.teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        self.students = CustomUser.objects.bulk_create([
+            CustomUser(username=f"student_{i}", email=f"student_{i}@example.com", password='!', role='student')
+            for i in range(120)
+        ])
+        Enrollment.objects.bulk_create([Enrollment(course=self.course, student=student) for student in self.students])
+        self.student = CustomUser.objects.create_user(username="student", password="1234567890HTML", role='student')
+        Enrollment.objects.create(course=self.course, student=self.student)
+
+    def test_new_assignment_fans_out_in_batches(self):
+        with CaptureQueriesContext(connection) as queries:
+            assignment = Assignment.objects.create(course=self.course, teacher=self.teacher, title="Essay")
+        self.assertEqual(Notification.objects.filter(kind='assignment_created', object_id=assignment.id).count(), 121)
+        self.assertEqual(NotificationCounter.objects.unread(self.students[0].id), 1)
+        # 121 отримувач пакетами по 50: по одному INSERT сповіщень на пакет, а не на студента
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "notifications_notification"')]
+        self.assertEqual(len(inserts), 3)
+
+    def test_answer_notifies_discussion_participants(self):
+        question = Question.objects.create(course=self.course, teacher=self.teacher, title="Deadline?")
+        Answer.objects.create(question=question, user=self.students[0], content="Friday")
+        Answer.objects.create(question=question, user=self.student, content="Thanks")
+
+        self.assertEqual(
+            set(Notification.objects.filter(kind='answer_created').values_list('recipient_id', flat=True)),
+            {self.teacher.id, self.students[0].id}
+        )
+        self.assertEqual(NotificationCounter.objects.unread(self.teacher.id), 2)
+        self.assertEqual(NotificationCounter.objects.unread(self.student.id), 0)
+
+    def test_inbox_and_unread_counter(self):
+        for i in range(5):
+            deliver('material_created', [self.student.id], f"New material: {i}", course_id=self.course.id)
+        self.client.login(username="student", password="1234567890HTML")
+
+        with self.assertNumQueries(3):  # сесія, користувач, лічильник
+            response = self.client.get(reverse('notifications_unread_count'))
+        self.assertEqual(response.json(), {'unread': 5})
+
+        response = self.client.get(reverse('notifications'), {'page_size': 3})
+        data = response.json()
+        self.assertEqual([item['message'] for item in data['results']], ["New material: 4", "New material: 3", "New material: 2"])
+        self.assertIsNotNone(data['next'])
+        rest = self.client.get(data['next']).json()
+        self.assertEqual(len(rest['results']), 2)
+        self.assertIsNone(rest['next'])
+
+        notification_id = data['results'][0]['id']
+        for _ in range(2):
+            response = self.client.post(reverse('notification_read', args=[notification_id]))
+            self.assertEqual(response.json(), {'unread': 4})
+        self.assertEqual(len(self.client.get(reverse('notifications'), {'unread': '1'}).json()['results']), 4)
+
+        response = self.client.post(reverse('notifications_read_all'))
+        self.assertEqual(response.json(), {'marked': 4, 'unread': 0})
+
+        deliver('material_created', [self.students[0].id], "Other")
+        other = Notification.objects.get(recipient=self.students[0])
+        response = self.client.post(reverse('notification_read', args=[other.id]))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(NOTIFICATIONS_DEFERRED=True, BACKGROUND_TASKS_EAGER=False)
+    def test_deferred_delivery_runs_as_job(self):
+        Assignment.objects.create(course=self.course, teacher=self.teacher, title="Essay")
+        self.assertFalse(Notification.objects.exists())
+        run_pending()
+        self.assertEqual(Notification.objects.filter(kind='assignment_created').count(), 121)
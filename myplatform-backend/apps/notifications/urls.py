@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import (
+    NotificationListView, UnreadCountView, MarkNotificationReadView, MarkAllNotificationsReadView
+)
+
+urlpatterns = [
+    path('', NotificationListView.as_view(), name='notifications'),
+    path('unread-count/', UnreadCountView.as_view(), name='notifications_unread_count'),
+    path('<int:notification_id>/read/', MarkNotificationReadView.as_view(), name='notification_read'),
+    path('read-all/', MarkAllNotificationsReadView.as_view(), name='notifications_read_all'),
+]
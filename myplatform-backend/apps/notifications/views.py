@@ -1,3 +1,75 @@
-from django.shortcuts import render
+# apps/notifications/views.py
 
-# Create your views here.
+from django.db import transaction
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.assignments.mixins import CsrfExemptSessionAuthentication
+from myplatform.pagination import KeysetPagination
+from .models import Notification, NotificationCounter
+from .serializers import NotificationSerializer
+
+
+class InboxPagination(KeysetPagination):
+    default_page_size = 20
+    max_page_size = 100
+
+    def is_requested(self, request):
+        # Вхідні ростуть без меж - сторінками завжди, навіть без ?page_size=
+        return True
+
+
+class NotificationListView(APIView):
+    authentication_classes = [CsrfExemptSessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        notifications = Notification.objects.filter(recipient=request.user)
+        if request.GET.get('unread') in ('1', 'true'):
+            notifications = notifications.filter(is_read=False)
+
+        paginator = InboxPagination()
+        page = paginator.paginate_queryset(notifications, request, view=self)
+        data = paginator.get_paginated_data(NotificationSerializer(page, many=True).data)
+        data['unread'] = NotificationCounter.objects.unread(request.user.id)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class UnreadCountView(APIView):
+    authentication_classes = [CsrfExemptSessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # Один пошук за первинним ключем у NotificationCounter, без підрахунку по Notification
+        return Response({'unread': NotificationCounter.objects.unread(request.user.id)}, status=status.HTTP_200_OK)
+
+
+class MarkNotificationReadView(APIView):
+    authentication_classes = [CsrfExemptSessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, notification_id):
+        notifications = Notification.objects.filter(id=notification_id, recipient=request.user)
+        with transaction.atomic():
+            # Умовний UPDATE: повторний запит не зменшує лічильник удруге
+            if notifications.filter(is_read=False).update(is_read=True):
+                NotificationCounter.objects.decrement(request.user.id)
+            elif not notifications.exists():
+                return Response({"error": "Notification not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'unread': NotificationCounter.objects.unread(request.user.id)}, status=status.HTTP_200_OK)
+
+
+class MarkAllNotificationsReadView(APIView):
+    authentication_classes = [CsrfExemptSessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        with transaction.atomic():
+            updated = Notification.objects.filter(recipient=request.user, is_read=False).update(is_read=True)
+            # Саме на updated, а не в нуль: сповіщення, вставлені паралельно, лишаються в лічильнику
+            NotificationCounter.objects.decrement(request.user.id, updated)
+        return Response(
+            {'marked': updated, 'unread': NotificationCounter.objects.unread(request.user.id)}, status=status.HTTP_200_OK
+        )
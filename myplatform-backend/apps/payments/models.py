@@ -10,5 +10,10 @@ class Transaction(models.Model):
     transaction_date = models.DateTimeField(auto_now_add=True)
     description = models.TextField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'transaction_date', 'id']),
+        ]
+
     def __str__(self):
         return f"Transaction for {self.course.title} by {self.user.username}"
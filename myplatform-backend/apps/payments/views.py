@@ -10,6 +10,8 @@ from apps.assignments.mixins import CsrfExemptSessionAuthentication
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 
+from myplatform.pagination import KeysetPagination
+
 class PurchaseCourseView(APIView):
     authentication_classes = (CsrfExemptSessionAuthentication,)
     permission_classes = [IsAuthenticated]
@@ -45,6 +47,7 @@ class PurchaseCourseView(APIView):
 class UserTransactionHistoryView(APIView):
     authentication_classes = (CsrfExemptSessionAuthentication,)
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-transaction_date', '-id')
 
     def get(self, request, user_id):
         user = request.user
@@ -53,5 +56,11 @@ class UserTransactionHistoryView(APIView):
             return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
         transactions = Transaction.objects.filter(user_id=user_id)
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(transactions, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(TransactionSerializer(page, many=True).data)
+
         serializer = TransactionSerializer(transactions, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
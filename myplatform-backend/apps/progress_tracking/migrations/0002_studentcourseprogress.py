@@ -0,0 +1,63 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_student_course_progress(apps, schema_editor):
+    LessonProgress = apps.get_model('progress_tracking', 'LessonProgress')
+    ModuleProgress = apps.get_model('progress_tracking', 'ModuleProgress')
+    StudentCourseProgress = apps.get_model('progress_tracking', 'StudentCourseProgress')
+
+    totals = {}
+    sources = (
+        ('completed_lessons', LessonProgress.objects.values('student_id', course_id=models.F('lesson__module__course_id'))),
+        ('completed_modules', ModuleProgress.objects.values('student_id', course_id=models.F('module__course_id'))),
+    )
+    for field, queryset in sources:
+        for row in queryset.annotate(total=Count('id'), last=Max('completed_at')):
+            entry = totals.setdefault(
+                (row['student_id'], row['course_id']),
+                {'completed_lessons': 0, 'completed_modules': 0, 'last_activity': None}
+            )
+            entry[field] = row['total']
+            if entry['last_activity'] is None or row['last'] > entry['last_activity']:
+                entry['last_activity'] = row['last']
+
+    StudentCourseProgress.objects.bulk_create(
+        [
+            StudentCourseProgress(student_id=student_id, course_id=course_id, **entry)
+            for (student_id, course_id), entry in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_intro_video_url'),
+        ('progress_tracking', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentCourseProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed_lessons', models.PositiveIntegerField(default=0)),
+                ('completed_modules', models.PositiveIntegerField(default=0)),
+                ('last_activity', models.DateTimeField(blank=True, null=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='courses.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['course', 'student'], name='progress_tr_course__5aac0a_idx')],
+                'unique_together': {('student', 'course')},
+            },
+        ),
+        migrations.RunPython(backfill_student_course_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress_tracking', '0002_studentcourseprogress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentcourseprogress',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -1,15 +1,53 @@
 # apps/progress_tracking/models.py
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Max
+from django.utils import timezone
 from apps.users.models import CustomUser  # Імпортуйте вашу модель користувача
+from apps.courses.models import Course
 from apps.modules.models import Module  # Імпортуйте модель модуля
 from apps.lessons.models import Lesson  # Імпортуйте модель уроку
+from apps.enrollments.models import Enrollment
+
+
+class ModuleProgressManager(models.Manager):
+
+    def recompute(self, module_id, course_id):
+        """
+        Перераховує завершення модуля для всіх студентів курсу: один згрупований запит
+        по LessonProgress, далі одна масова вставка і одне масове видалення ModuleProgress.
+        """
+        enrolled = Enrollment.objects.filter(course_id=course_id).values('student_id')
+        total_lessons = Lesson.objects.filter(module_id=module_id).count()
+
+        completed = (
+            LessonProgress.objects.filter(lesson__module_id=module_id, student_id__in=enrolled)
+            .values('student_id')
+            .annotate(completed=Count('id'))
+            .filter(completed=total_lessons)
+            .values('student_id')
+        )
+        completed_ids = [row['student_id'] for row in completed] if total_lessons else []
+
+        with transaction.atomic():
+            self.bulk_create(
+                [self.model(student_id=student_id, module_id=module_id) for student_id in completed_ids],
+                ignore_conflicts=True,
+            )
+            stale = self.filter(module_id=module_id, student_id__in=enrolled)
+            if total_lessons:
+                stale = stale.exclude(student_id__in=completed)
+            # Одним DELETE, без post_delete на кожен рядок
+            stale._raw_delete(stale.db)
+
 
 class ModuleProgress(models.Model):
     student = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     module = models.ForeignKey(Module, on_delete=models.CASCADE)
     completed_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ModuleProgressManager()
+
     class Meta:
         unique_together = ('student', 'module')
         indexes = [
@@ -33,3 +71,69 @@ class LessonProgress(models.Model):
 
     def __str__(self):
         return f"{self.student} - {self.lesson}"
+
+
+class StudentCourseProgressManager(models.Manager):
+
+    def record(self, student_id, course_id, lessons=0, modules=0):
+        """Інкрементально додає завершені уроки/модулі до зведення студента по курсу"""
+        updated = self.filter(student_id=student_id, course_id=course_id).update(
+            completed_lessons=F('completed_lessons') + lessons,
+            completed_modules=F('completed_modules') + modules,
+            last_activity=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            self.rebuild(course_id, student_ids=[student_id])
+
+    def rebuild(self, course_id, student_ids=None):
+        """Перераховує зведення по курсу з LessonProgress/ModuleProgress згрупованими запитами"""
+        lessons = LessonProgress.objects.filter(lesson__module__course_id=course_id)
+        modules = ModuleProgress.objects.filter(module__course_id=course_id)
+        existing = self.filter(course_id=course_id)
+        if student_ids is not None:
+            lessons = lessons.filter(student_id__in=student_ids)
+            modules = modules.filter(student_id__in=student_ids)
+            existing = existing.filter(student_id__in=student_ids)
+
+        totals = {
+            student_id: {'completed_lessons': 0, 'completed_modules': 0, 'last_activity': None}
+            for student_id in existing.values_list('student_id', flat=True)
+        }
+        for field, queryset in (('completed_lessons', lessons), ('completed_modules', modules)):
+            for row in queryset.values('student_id').annotate(total=Count('id'), last=Max('completed_at')):
+                entry = totals.setdefault(
+                    row['student_id'],
+                    {'completed_lessons': 0, 'completed_modules': 0, 'last_activity': None}
+                )
+                entry[field] = row['total']
+                if entry['last_activity'] is None or row['last'] > entry['last_activity']:
+                    entry['last_activity'] = row['last']
+
+        self.bulk_create(
+            [self.model(student_id=student_id, course_id=course_id, **entry) for student_id, entry in totals.items()],
+            update_conflicts=True,
+            unique_fields=['student', 'course'],
+            update_fields=['completed_lessons', 'completed_modules', 'last_activity', 'updated_at'],
+        )
+
+
+class StudentCourseProgress(models.Model):
+    """Денормалізоване зведення прогресу студента по курсу для аналітики"""
+    student = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    completed_lessons = models.PositiveIntegerField(default=0)
+    completed_modules = models.PositiveIntegerField(default=0)
+    last_activity = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = StudentCourseProgressManager()
+
+    class Meta:
+        unique_together = ('student', 'course')
+        indexes = [
+            models.Index(fields=['course', 'student']),
+        ]
+
+    def __str__(self):
+        return f"{self.student} - {self.course}"
@@ -1,42 +1,45 @@
 # apps/progress_tracking/signals.py
 
+from django.db import transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from django.conf import settings
 from apps.lessons.models import Lesson
-from .models import LessonProgress, ModuleProgress
-from apps.enrollments.models import Enrollment
+from apps.modules.models import Module
+from apps.jobs.queue import enqueue
+from apps.analytics.signals import bump_course_version
+from .models import ModuleProgress, StudentCourseProgress
 
 @receiver(post_delete, sender=Lesson)
 def update_module_progress_on_lesson_delete(sender, instance, **kwargs):
-    module = instance.module
-    enrollments = Enrollment.objects.filter(course=module.course)
-    students = enrollments.values_list('student', flat=True)
-
-    for student_id in students:
-        total_lessons = module.lessons.count()  # Updated line
-        if total_lessons == 0:
-            ModuleProgress.objects.filter(student_id=student_id, module=module).delete()
-            continue
-
-        completed_lessons = LessonProgress.objects.filter(student_id=student_id, lesson__module=module).count()
-
-        if total_lessons == completed_lessons:
-            ModuleProgress.objects.get_or_create(student_id=student_id, module=module)
-        else:
-            ModuleProgress.objects.filter(student_id=student_id, module=module).delete()
+    schedule_module_progress_recompute(instance.module_id)
 
 @receiver(post_save, sender=Lesson)
 def update_module_progress_on_lesson_add(sender, instance, created, **kwargs):
     if created:
-        module = instance.module
-        enrollments = Enrollment.objects.filter(course=module.course)
-        students = enrollments.values_list('student', flat=True)
-
-        for student_id in students:
-            total_lessons = module.lessons.count()  # Updated line
-            completed_lessons = LessonProgress.objects.filter(student_id=student_id, lesson__module=module).count()
-
-            if total_lessons == completed_lessons:
-                ModuleProgress.objects.get_or_create(student_id=student_id, module=module)
-            else:
-                ModuleProgress.objects.filter(student_id=student_id, module=module).delete()
+        schedule_module_progress_recompute(instance.module_id)
+
+
+def schedule_module_progress_recompute(module_id):
+    """Одразу або, якщо PROGRESS_RECOMPUTE_DEFERRED, завданням черги apps.jobs"""
+    if settings.PROGRESS_RECOMPUTE_DEFERRED:
+        enqueue(recompute_module_progress, module_id)
+    else:
+        recompute_module_progress(module_id)
+
+
+def recompute_module_progress(module_id):
+    course_id = Module.objects.filter(id=module_id).values_list('course_id', flat=True).first()
+    if course_id is None:
+        # Модуль видалено (каскадом разом з уроками) - його ModuleProgress уже видалено теж
+        return
+    ModuleProgress.objects.recompute(module_id, course_id)
+    rebuild_student_course_progress(course_id)
+    # recompute пише bulk_create / _raw_delete без сигналів, а з PROGRESS_RECOMPUTE_DEFERRED ще й
+    # пізніше за коміт уроку - версію аналітики курсу піднімаємо після власного коміту
+    bump_course_version(course_id)
+
+
+def rebuild_student_course_progress(course_id):
+    # Після коміту: при каскадному видаленні курсу зведення вже не буде на що посилатися
+    transaction.on_commit(lambda: StudentCourseProgress.objects.rebuild(course_id))
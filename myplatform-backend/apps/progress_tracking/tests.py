@@ -1,3 +1,148 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from apps.analytics.aggregates import build_student_completion_stats, build_student_progress
+from apps.analytics.signals import course_cache_namespace
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.modules.models import Module
+from apps.progress_tracking.models import LessonProgress, ModuleProgress, StudentCourseProgress
+from apps.users.models import CustomUser
+from myplatform.cache import peek_cache_version
+
+
+class StudentCourseProgressTest(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.student = CustomUser.objects.create_user(
+            username="student", password="1234567890HTML", role='student', first_name="Ivan", last_name="Petrenko"
+        )
+        self.client.login(username="student", password="1234567890HTML")
+
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=self.teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        Enrollment.objects.create(course=self.course, student=self.student)
+        self.module = Module.objects.create(course=self.course, title="Sample Module", description="Module Description")
+        self.lessons = [
+            Lesson.objects.create(module=self.module, title=f"Lesson {i}", content="Lesson Content") for i in range(2)
+        ]
+
+    def complete(self, lesson):
+        response = self.client.post(reverse('mark_lesson_completed', kwargs={'lesson_id': lesson.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def progress(self):
+        return StudentCourseProgress.objects.get(student=self.student, course=self.course)
+
+    def test_marking_lessons_updates_rollup(self):
+        self.complete(self.lessons[0])
+        self.assertEqual((self.progress().completed_lessons, self.progress().completed_modules), (1, 0))
+
+        self.complete(self.lessons[1])
+        self.complete(self.lessons[1])
+        progress = self.progress()
+        self.assertEqual((progress.completed_lessons, progress.completed_modules), (2, 1))
+        self.assertIsNotNone(progress.last_activity)
+
+    def test_lesson_changes_rebuild_rollup(self):
+        for lesson in self.lessons:
+            self.complete(lesson)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Lesson.objects.create(module=self.module, title="Lesson 3", content="Lesson Content")
+        self.assertEqual((self.progress().completed_lessons, self.progress().completed_modules), (2, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lessons[0].delete()
+        self.assertEqual((self.progress().completed_lessons, self.progress().completed_modules), (1, 0))
+
+    def test_analytics_read_rollup(self):
+        self.complete(self.lessons[0])
+
+        with self.assertNumQueries(1):
+            completion = build_student_completion_stats()
+        self.assertEqual(completion, [{
+            'student_name': "Ivan Petrenko",
+            'username': "student",
+            'completed_lessons': 1,
+            'completed_modules': 0,
+        }])
+
+        with self.assertNumQueries(1):
+            progress = build_student_progress(self.course)
+        self.assertEqual(progress[0]['completed_lessons'], 1)
+        self.assertEqual(progress[0]['last_activity'], self.progress().last_activity)
+
+
+class ModuleProgressRecomputeTest(TestCase):
+
+    def setUp(self):
+        teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        self.module = Module.objects.create(course=self.course, title="Sample Module", description="Module Description")
+        self.lessons = [
+            Lesson.objects.create(module=self.module, title=f"Lesson {i}", content="Lesson Content") for i in range(2)
+        ]
+        self.students = CustomUser.objects.bulk_create([
+            CustomUser(username=f"student_{i}", email=f"student_{i}@example.com", password='!', role='student')
+            for i in range(60)
+        ])
+        Enrollment.objects.bulk_create([Enrollment(course=self.course, student=student) for student in self.students])
+
+        # Перша третина пройшла обидва уроки, друга - лише перший
+        LessonProgress.objects.bulk_create(
+            [LessonProgress(student=student, lesson=lesson) for student in self.students[:20] for lesson in self.lessons] +
+            [LessonProgress(student=student, lesson=self.lessons[0]) for student in self.students[20:40]]
+        )
+        ModuleProgress.objects.bulk_create([ModuleProgress(student=student, module=self.module) for student in self.students[:20]])
+
+    def completed_students(self):
+        return set(ModuleProgress.objects.filter(module=self.module).values_list('student_id', flat=True))
+
+    def test_lesson_add_and_delete_recompute_in_constant_queries(self):
+        # insert уроку, course_id модуля, кількість уроків, згрупований запит, savepoint + DELETE
+        # (INSERT ModuleProgress пропускається - модуль ніхто не завершив) - незалежно від кількості студентів
+        with self.assertNumQueries(7):
+            lesson = Lesson.objects.create(module=self.module, title="Lesson 3", content="Lesson Content")
+        self.assertEqual(self.completed_students(), set())
+
+        LessonProgress.objects.bulk_create([LessonProgress(student=student, lesson=lesson) for student in self.students[:5]])
+        self.lessons[1].delete()
+        self.assertEqual(self.completed_students(), {student.id for student in self.students[:5]})
+
+    @override_settings(PROGRESS_RECOMPUTE_DEFERRED=True, BACKGROUND_TASKS_EAGER=True)
+    def test_recompute_can_be_deferred(self):
+        namespace = course_cache_namespace(self.course.id)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.lessons[1].delete()
+            self.assertEqual(len(self.completed_students()), 20)
+        with self.captureOnCommitCallbacks(execute=True):
+            for callback in callbacks:
+                callback()
+            # Версія, піднята сигналом уроку, - ще до того, як завдання перерахувало прогрес
+            version = peek_cache_version(namespace)
+        self.assertEqual(self.completed_students(), {student.id for student in self.students[:40]})
+        self.assertNotEqual(peek_cache_version(namespace), version)
@@ -1,7 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from .models import LessonProgress, ModuleProgress
+from .models import LessonProgress, ModuleProgress, StudentCourseProgress
 from apps.lessons.models import Lesson
 from apps.modules.models import Module 
 from apps.enrollments.models import Enrollment
@@ -37,9 +37,14 @@ class MarkLessonAsCompletedView(APIView):
             total_lessons = lesson.module.lessons.count()
             completed_lessons = LessonProgress.objects.filter(student=user, lesson__module=lesson.module).count()
 
+            module_completed = False
             if total_lessons == completed_lessons:
 
-                ModuleProgress.objects.get_or_create(student=user, module=lesson.module)
+                _, module_completed = ModuleProgress.objects.get_or_create(student=user, module=lesson.module)
+
+            StudentCourseProgress.objects.record(
+                user.id, lesson.module.course_id, lessons=1, modules=int(module_completed)
+            )
 
             return Response({"message": "Lesson marked as completed"}, status=status.HTTP_200_OK)
         else:
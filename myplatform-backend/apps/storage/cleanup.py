@@ -0,0 +1,155 @@
+# apps/storage/cleanup.py
+"""
+Видалення файлів з S3 пакетами через DeleteObjects (до 1000 ключів за запит).
+
+Ключі збираються до видалення рядків з БД, а самі об'єкти видаляються після коміту
+транзакції - завданням черги apps.jobs (STORAGE_DELETE_DEFERRED = True) або одразу в запиті.
+Цілі "теки" (напр. Courses/Course_{id}/) видаляє purge_prefix: сторінки list_objects_v2
+читаються за continuation token, а пакети видаляються паралельно в пулі потоків.
+"""
+
+import logging
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from django.db import transaction
+
+from apps.jobs.queue import enqueue
+from .client import get_s3_client
+
+logger = logging.getLogger(__name__)
+
+# Максимум ключів в одному запиті DeleteObjects
+DELETE_BATCH_SIZE = 1000
+
+
+def course_storage_prefix(course_id):
+    return f"Courses/Course_{course_id}/"
+
+
+def key_from_url(file_url):
+    """Ключ S3 з публічного URL файлу (https://<bucket>.s3.amazonaws.com/<key>)"""
+    return urllib.parse.unquote(urllib.parse.urlparse(file_url).path.lstrip('/'))
+
+
+def file_keys(queryset, field='file_url'):
+    """Ключі S3 файлів queryset одним запитом, без завантаження моделей"""
+    return [key_from_url(file_url) for file_url in queryset.values_list(field, flat=True) if file_url]
+
+
+def delete_keys(keys):
+    """Видаляє ключі з S3 пакетами по DELETE_BATCH_SIZE; повертає кількість видалених"""
+    keys = list(dict.fromkeys(key for key in keys if key))
+    deleted = 0
+    for start in range(0, len(keys), DELETE_BATCH_SIZE):
+        batch = keys[start:start + DELETE_BATCH_SIZE]
+        try:
+            response = get_s3_client().delete_objects(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+            )
+        except (BotoCoreError, ClientError) as e:
+            logger.warning("Failed to delete %d objects from S3: %s", len(batch), e)
+            continue
+
+        errors = response.get('Errors', [])
+        for error in errors:
+            logger.warning("Failed to delete %s from S3: %s", error.get('Key'), error.get('Message'))
+        deleted += len(batch) - len(errors)
+    return deleted
+
+
+class StorageCleanupError(Exception):
+    pass
+
+
+def delete_keys_job(keys):
+    """Завдання черги: якщо частину ключів не видалено, виняток - і черга повторить спробу"""
+    expected = len(set(key for key in keys if key))
+    deleted = delete_keys(keys)
+    if deleted < expected:
+        raise StorageCleanupError(f"Deleted {deleted} of {expected} objects")
+
+
+def iter_prefix_batches(prefix):
+    """Ключі під prefix сторінками list_objects_v2 (до 1000 ключів - якраз один пакет DeleteObjects)"""
+    paginator = get_s3_client().get_paginator('list_objects_v2')
+    pages = paginator.paginate(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME, Prefix=prefix,
+        PaginationConfig={'PageSize': DELETE_BATCH_SIZE}
+    )
+    for page in pages:
+        keys = [obj['Key'] for obj in page.get('Contents', [])]
+        if keys:
+            yield keys
+
+
+def purge_prefix(prefix, workers=None, progress=None):
+    """
+    Видаляє всі об'єкти під prefix; повертає (видалено, знайдено).
+    Наступна сторінка читається, поки попередні пакети видаляються в пулі з workers потоків;
+    у черзі тримається не більше 2 * workers пакетів. progress(deleted, listed) - після кожного пакета.
+    """
+    if not prefix:
+        raise ValueError("Refusing to purge an empty prefix")
+    workers = workers or settings.STORAGE_PURGE_WORKERS
+    deleted = listed = 0
+    pending = set()
+
+    def collect(done):
+        nonlocal deleted
+        for future in done:
+            deleted += future.result()
+            if progress is not None:
+                progress(deleted, listed)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='purge') as pool:
+        for keys in iter_prefix_batches(prefix):
+            listed += len(keys)
+            pending.add(pool.submit(delete_keys, keys))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(wait(pending).done)
+
+    logger.info("Purged %d of %d objects under %s", deleted, listed, prefix)
+    return deleted, listed
+
+
+def purge_prefix_job(prefix):
+    deleted, listed = purge_prefix(prefix)
+    if deleted < listed:
+        raise StorageCleanupError(f"Deleted {deleted} of {listed} objects under {prefix}")
+
+
+def schedule_prefix_purge(prefix, defer=None):
+    """purge_prefix після коміту поточної транзакції; defer - як у schedule_key_deletion"""
+    if defer is None:
+        defer = settings.STORAGE_DELETE_DEFERRED
+
+    if defer:
+        enqueue(purge_prefix_job, prefix)
+    else:
+        # robust: помилка S3 не має ламати відповідь - рядки вже видалено,
+        # залишки прибере manage.py purge_course_storage
+        transaction.on_commit(lambda: purge_prefix(prefix), robust=True)
+
+
+def schedule_key_deletion(keys, defer=None):
+    """
+    Видаляє ключі з S3 після коміту поточної транзакції (поза транзакцією - одразу).
+    defer=True ставить видалення в чергу apps.jobs (у тій самій транзакції),
+    за замовчуванням - settings.STORAGE_DELETE_DEFERRED.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    if defer is None:
+        defer = settings.STORAGE_DELETE_DEFERRED
+
+    if defer:
+        enqueue(delete_keys_job, keys)
+    else:
+        transaction.on_commit(lambda: delete_keys(keys))
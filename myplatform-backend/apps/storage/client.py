@@ -0,0 +1,69 @@
+# apps/storage/client.py
+"""
+Єдиний S3-клієнт проєкту. Створюється ліниво, при першому зверненні, а не під час імпорту
+модулів views; пул з'єднань, повтори і таймаути налаштовуються через settings.S3_*.
+"""
+
+import threading
+import urllib.parse
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from django.conf import settings
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    Один S3-клієнт на процес (клієнти boto3 потокобезпечні). Перше звернення будує його під локом,
+    інакше паралельні перші запити створили б кожен свій клієнт.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def reset_s3_client():
+    """Наступний get_s3_client() збудує новий клієнт (тести з іншими settings / mock_aws)"""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+def _build_client():
+    # Окрема сесія: сесія boto3 за замовчуванням не потокобезпечна при одночасному створенні клієнтів
+    config = Config(
+        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        retries={'total_max_attempts': settings.S3_MAX_ATTEMPTS, 'mode': 'standard'},
+        connect_timeout=settings.S3_CONNECT_TIMEOUT,
+        read_timeout=settings.S3_READ_TIMEOUT,
+        tcp_keepalive=True,
+    )
+    return boto3.session.Session().client(
+        's3',
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION_NAME,
+        config=config,
+    )
+
+
+def transfer_config():
+    """Налаштування upload_file/upload_fileobj: multipart-частини завантажуються паралельно"""
+    return TransferConfig(
+        multipart_threshold=settings.UPLOAD_MULTIPART_THRESHOLD,
+        multipart_chunksize=settings.UPLOAD_MULTIPART_THRESHOLD,
+        max_concurrency=settings.UPLOAD_MULTIPART_CONCURRENCY,
+    )
+
+
+def public_url(key):
+    encoded_key = urllib.parse.quote(key, safe='/')
+    return f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/{encoded_key}"
@@ -0,0 +1,34 @@
+# apps/storage/management/commands/gc_temp_files.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.storage.temp_files import gc_temp_files
+
+
+class Command(BaseCommand):
+    help = "Видаляє непідтверджені тимчасові файли уроків і завдань (рядки в БД і об'єкти в S3)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-hours', type=float, default=None,
+                            help="Вік тимчасового файлу, після якого він вважається покинутим "
+                                 "(за замовчуванням - settings.TEMP_FILES_MAX_AGE)")
+        parser.add_argument('--dry-run', action='store_true', help="Лише порахувати файли, нічого не видаляючи")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['older_than_hours'] is None:
+            older_than = timedelta(seconds=settings.TEMP_FILES_MAX_AGE)
+        else:
+            older_than = timedelta(hours=options['older_than_hours'])
+
+        result = gc_temp_files(older_than, dry_run=options['dry_run'], batch_size=options['batch_size'])
+
+        action = "Would remove" if options['dry_run'] else "Removed"
+        for model_name, totals in result.items():
+            self.stdout.write(f"{action} {totals['files']} {model_name} files, {totals['bytes']} bytes")
+        files = sum(totals['files'] for totals in result.values())
+        reclaimed = sum(totals['bytes'] for totals in result.values())
+        self.stdout.write(self.style.SUCCESS(f"{action} {files} temporary files, {reclaimed} bytes in total"))
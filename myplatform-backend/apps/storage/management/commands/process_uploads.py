@@ -0,0 +1,28 @@
+# apps/storage/management/commands/process_uploads.py
+
+from concurrent.futures import wait
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.storage.uploads import resubmit_stalled_uploads
+
+
+class Command(BaseCommand):
+    help = "Дозавантажує в S3 файли, що лишилися в spool-каталозі (після перезапуску процесу або помилки)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true', help="Повторити також завантаження зі статусом failed")
+        parser.add_argument('--stalled-minutes', type=int, default=30,
+                            help="Через скільки хвилин статус uploading вважається завислим")
+
+    def handle(self, *args, **options):
+        futures = resubmit_stalled_uploads(
+            stalled_after=timedelta(minutes=options['stalled_minutes']),
+            retry_failed=options['retry_failed'],
+        )
+        wait(futures)
+
+        uploads = [future.result() for future in futures if future.exception() is None]
+        ready = sum(1 for upload in uploads if upload is not None and upload.status == 'ready')
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(futures)} uploads, {ready} ready"))
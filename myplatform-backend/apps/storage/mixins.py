@@ -0,0 +1,5 @@
+from rest_framework.authentication import SessionAuthentication
+
+class CsrfExemptSessionAuthentication(SessionAuthentication):
+    def enforce_csrf(self, request):
+        return  # Це вимикає CSRF перевірку
\ No newline at end of file
@@ -0,0 +1,50 @@
+# apps/storage/models.py
+
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+from .client import public_url
+
+
+class Upload(models.Model):
+    """Файл, що чекає на фонове завантаження в S3 з локального spool-каталогу"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('uploading', 'Uploading'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    key = models.CharField(max_length=1024)
+    spool_path = models.CharField(max_length=1024)
+    content_type = models.CharField(max_length=255, blank=True)
+    size = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', db_index=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    # Запис, до якого належить файл (LessonFile, MaterialFile, Course ...)
+    target_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True)
+    target_id = models.PositiveBigIntegerField(null=True, blank=True)
+    target = GenericForeignKey('target_type', 'target_id')
+    # Поле target, у яке після завантаження записується URL (напр. Course.image_url), і ключ старого файлу на заміну
+    target_field = models.CharField(max_length=100, blank=True)
+    replaces_key = models.CharField(max_length=1024, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['target_type', 'target_id']),
+        ]
+
+    @property
+    def url(self):
+        return public_url(self.key)
+
+    def __str__(self):
+        return f"{self.key} ({self.status})"
@@ -0,0 +1,213 @@
+# apps/storage/presign.py
+"""
+Пряме завантаження файлів з клієнта в S3 за presigned URL, без проходження байтів через Django.
+
+1. create_direct_upload видає presigned POST (або PUT) для одного запиту, а для файлів,
+   більших за UPLOAD_MULTIPART_THRESHOLD, - multipart upload з presigned URL на кожну частину.
+   Ключ будується на сервері за звичною схемою Courses/Course_{id}/...
+2. confirm_direct_upload завершує multipart (якщо був), перевіряє об'єкт через HEAD і створює
+   LessonFile / AssignmentFile / MaterialFile / SubmissionFile з розміром, який повернуло S3.
+   LessonFile і AssignmentFile створюються тимчасовими (is_temp=True) і підтверджуються
+   як і раніше - через confirm-temp-files / confirm-files.
+
+Незавершені multipart upload-и прибирає lifecycle-правило бакета (AbortIncompleteMultipartUpload).
+"""
+
+import math
+import os
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+
+from apps.assignments.models import Assignment, AssignmentFile, Submission, SubmissionFile
+from apps.lessons.models import Lesson, LessonFile
+from apps.materials.models import Material, MaterialFile
+from .client import get_s3_client, public_url
+
+PRESIGNED_EXPIRES_IN = 60 * 60
+# file_size у моделях файлів - IntegerField
+MAX_FILE_SIZE = 2 ** 31 - 1
+# Обмеження S3 на кількість частин multipart upload
+MAX_PARTS = 10000
+LESSON_FILE_TYPES = ['mp4', 'pdf', 'doc', 'docx']
+DIRECT_UPLOAD_TARGETS = ('lesson', 'assignment', 'material', 'submission')
+
+
+class DirectUploadError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _get(queryset, pk, message):
+    try:
+        return queryset.get(id=pk)
+    except (queryset.model.DoesNotExist, ValueError, TypeError):
+        raise DirectUploadError(message, 404)
+
+
+def _check_teacher(user, course):
+    if user.role != 'admin' and course.teacher_id != user.id:
+        raise DirectUploadError("Only the course teacher can upload files", 403)
+
+
+def resolve_target(target, target_id, user):
+    """Повертає (запис, до якого додається файл; префікс ключа в S3) з перевіркою доступу"""
+    if target == 'lesson':
+        lesson = _get(Lesson.objects.select_related('module__course'), target_id, "Lesson not found")
+        course = lesson.module.course
+        _check_teacher(user, course)
+        return lesson, f"Courses/Course_{course.id}/lessons/lesson_{lesson.id}/"
+
+    if target == 'assignment':
+        assignment = _get(Assignment.objects.select_related('course'), target_id, "Assignment not found")
+        _check_teacher(user, assignment.course)
+        return assignment, f"Courses/Course_{assignment.course_id}/assignments/assignment_{assignment.id}/"
+
+    if target == 'material':
+        material = _get(Material.objects.select_related('course'), target_id, "Material not found")
+        _check_teacher(user, material.course)
+        return material, f"Courses/Course_{material.course_id}/materials/material_{material.id}/"
+
+    if target == 'submission':
+        # target_id - id завдання; файли додаються до здачі поточного студента
+        assignment = _get(Assignment.objects.all(), target_id, "Assignment not found")
+        try:
+            submission = Submission.objects.get(assignment=assignment, student_id=user.id)
+        except Submission.DoesNotExist:
+            raise DirectUploadError("You do not have access to submit this assignment", 403)
+        return submission, f"Courses/Course_{assignment.course_id}/submissions/submission_{submission.id}/"
+
+    raise DirectUploadError(f"Unknown target, expected one of: {', '.join(DIRECT_UPLOAD_TARGETS)}")
+
+
+def _file_type(target, file_name):
+    file_type = file_name.split('.')[-1].lower()
+    if target == 'lesson' and file_type not in LESSON_FILE_TYPES:
+        raise DirectUploadError("Invalid file type")
+    return file_type
+
+
+def create_direct_upload(target, target_id, user, file_name, size, content_type='', method='post'):
+    """Видає presigned URL для завантаження file_name (size байт) прямо в S3"""
+    file_name = os.path.basename(file_name or '')
+    if not file_name:
+        raise DirectUploadError("No file name provided")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise DirectUploadError("Invalid file size")
+    if not 0 < size <= MAX_FILE_SIZE:
+        raise DirectUploadError("Invalid file size")
+
+    _, key_prefix = resolve_target(target, target_id, user)
+    _file_type(target, file_name)
+
+    key = key_prefix + file_name
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
+    s3_client = get_s3_client()
+    content_type = content_type or 'application/octet-stream'
+    result = {'key': key, 'file_url': public_url(key)}
+
+    if size > settings.UPLOAD_MULTIPART_THRESHOLD:
+        part_size = max(settings.UPLOAD_MULTIPART_THRESHOLD, math.ceil(size / MAX_PARTS))
+        upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key, ContentType=content_type)['UploadId']
+        parts = [
+            {
+                'part_number': part_number,
+                'url': s3_client.generate_presigned_url('upload_part', Params={
+                    'Bucket': bucket, 'Key': key, 'UploadId': upload_id, 'PartNumber': part_number,
+                }, ExpiresIn=PRESIGNED_EXPIRES_IN),
+            }
+            for part_number in range(1, math.ceil(size / part_size) + 1)
+        ]
+        return {**result, 'method': 'multipart', 'upload_id': upload_id, 'part_size': part_size, 'parts': parts}
+
+    if method == 'put':
+        url = s3_client.generate_presigned_url('put_object', Params={
+            'Bucket': bucket, 'Key': key, 'ContentType': content_type, 'ContentLength': size,
+        }, ExpiresIn=PRESIGNED_EXPIRES_IN)
+        return {**result, 'method': 'PUT', 'url': url, 'headers': {'Content-Type': content_type}}
+
+    post = s3_client.generate_presigned_post(
+        Bucket=bucket, Key=key,
+        Fields={'Content-Type': content_type},
+        Conditions=[{'Content-Type': content_type}, ['content-length-range', size, size]],
+        ExpiresIn=PRESIGNED_EXPIRES_IN,
+    )
+    return {**result, 'method': 'POST', 'url': post['url'], 'fields': post['fields']}
+
+
+def _complete_multipart(key, upload_id, parts):
+    try:
+        parts = sorted(
+            ({'PartNumber': int(part['part_number']), 'ETag': part['etag']} for part in parts),
+            key=lambda part: part['PartNumber']
+        )
+    except (KeyError, TypeError, ValueError):
+        raise DirectUploadError("Invalid parts, expected [{part_number, etag}, ...]")
+    if not parts:
+        raise DirectUploadError("No parts provided")
+
+    try:
+        get_s3_client().complete_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key, UploadId=upload_id,
+            MultipartUpload={'Parts': parts}
+        )
+    except ClientError as e:
+        raise DirectUploadError(f"Failed to complete multipart upload: {e}")
+
+
+def create_file_record(target, parent, key, file_size, content_type):
+    """Створює (або повертає вже створений) запис файлу; повертає (запис, created)"""
+    file_url = public_url(key)
+    file_type = _file_type(target, key)
+    if target == 'lesson':
+        return LessonFile.objects.get_or_create(
+            lesson=parent, file_url=file_url,
+            defaults={'file_type': file_type, 'file_size': file_size, 'is_temp': True}
+        )
+    if target == 'assignment':
+        return AssignmentFile.objects.get_or_create(
+            assignment=parent, file_url=file_url,
+            defaults={'file_type': file_type, 'file_size': file_size, 'is_temp': True}
+        )
+    if target == 'material':
+        return MaterialFile.objects.get_or_create(
+            material=parent, file_url=file_url,
+            defaults={'file_type': content_type, 'file_size': file_size}
+        )
+    return SubmissionFile.objects.get_or_create(
+        submission=parent, file_url=file_url,
+        defaults={'file_type': file_type, 'file_size': file_size}
+    )
+
+
+def confirm_direct_upload(target, target_id, user, key, upload_id=None, parts=None):
+    """
+    Підтверджує пряме завантаження: ключ має належати target, а об'єкт - існувати в S3.
+    Повертає (запис файлу, created); повторне підтвердження того самого ключа нічого не дублює.
+    """
+    parent, key_prefix = resolve_target(target, target_id, user)
+    if not key or not key.startswith(key_prefix) or '/' in key[len(key_prefix):]:
+        raise DirectUploadError("Key does not belong to this target", 403)
+
+    if upload_id:
+        _complete_multipart(key, upload_id, parts or [])
+
+    try:
+        head = get_s3_client().head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+            raise DirectUploadError("File has not been uploaded")
+        raise DirectUploadError(f"Failed to check uploaded file: {e}", 502)
+    except BotoCoreError as e:
+        raise DirectUploadError(f"Failed to check uploaded file: {e}", 502)
+
+    file_size = head['ContentLength']
+    if file_size > MAX_FILE_SIZE:
+        get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+        raise DirectUploadError("File is too large")
+
+    return create_file_record(target, parent, key, file_size, head.get('ContentType', ''))
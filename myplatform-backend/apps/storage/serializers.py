@@ -0,0 +1,41 @@
+from django.db import models
+from rest_framework import serializers
+from .models import Upload
+from .uploads import upload_statuses
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    url = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Upload
+        fields = ['id', 'key', 'url', 'status', 'size', 'content_type', 'error', 'created_at', 'updated_at']
+
+
+class UploadStatusField(serializers.Field):
+    """
+    Статус фонового завантаження файлу (pending / uploading / ready / failed): доки не ready,
+    file_url ще не відкривається. Файл без Upload (завантажений напряму в S3) - ready.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, file):
+        if not hasattr(file, 'upload_status'):
+            file.upload_status = upload_statuses([file]).get(file.pk)
+        return file.upload_status or 'ready'
+
+
+class FileListSerializer(serializers.ListSerializer):
+    """Статуси Upload для всього списку файлів одним запитом, якщо queryset не анотовано with_upload_status"""
+
+    def to_representation(self, data):
+        files = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        missing = [file for file in files if not hasattr(file, 'upload_status')]
+        statuses = upload_statuses(missing)
+        for file in missing:
+            file.upload_status = statuses.get(file.pk)
+        return super().to_representation(files)
@@ -0,0 +1,71 @@
+# apps/storage/temp_files.py
+"""
+Прибирання покинутих тимчасових файлів (LessonFile / AssignmentFile з is_temp=True),
+які так і не підтвердили через confirm-temp-files / confirm-files.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from apps.assignments.models import AssignmentFile
+from apps.lessons.models import LessonFile
+from .cleanup import DELETE_BATCH_SIZE, delete_keys, key_from_url
+from .uploads import discard_uploads
+
+logger = logging.getLogger(__name__)
+
+TEMP_FILE_MODELS = (LessonFile, AssignmentFile)
+
+
+def stale_temp_files(model, older_than):
+    # Фільтр покривається індексом (is_temp, created_at)
+    return model.objects.filter(is_temp=True, created_at__lt=timezone.now() - older_than)
+
+
+def gc_model_temp_files(model, older_than, batch_size=DELETE_BATCH_SIZE):
+    """Видаляє застарілі тимчасові файли model пакетами; повертає (кількість файлів, байтів)"""
+    files = bytes_reclaimed = 0
+    while True:
+        batch = list(
+            stale_temp_files(model, older_than)
+            .order_by('created_at', 'id')
+            .values_list('id', 'file_url', 'file_size')[:batch_size]
+        )
+        if not batch:
+            break
+        ids = [file_id for file_id, _, _ in batch]
+
+        # Спершу рядки: файл, підтверджений між вибіркою і видаленням, лишається разом з об'єктом у S3
+        model.objects.filter(id__in=ids, is_temp=True).delete()
+        kept = set(model.objects.filter(id__in=ids).values_list('id', flat=True))
+        deleted = [(file_id, file_url, file_size) for file_id, file_url, file_size in batch if file_id not in kept]
+
+        discard_uploads(model, [file_id for file_id, _, _ in deleted])
+        delete_keys(key_from_url(file_url) for _, file_url, _ in deleted)
+        files += len(deleted)
+        bytes_reclaimed += sum(file_size for _, _, file_size in deleted)
+
+        if len(batch) < batch_size:
+            break
+    return files, bytes_reclaimed
+
+
+def gc_temp_files(older_than=timedelta(hours=24), dry_run=False, batch_size=DELETE_BATCH_SIZE):
+    """
+    Прибирає тимчасові файли, старші за older_than: об'єкти в S3 - пакетами DeleteObjects,
+    рядки - масовим delete(). Повертає {назва моделі: {'files': n, 'bytes': m}};
+    dry_run лише рахує, що було б видалено.
+    """
+    result = {}
+    for model in TEMP_FILE_MODELS:
+        if dry_run:
+            totals = stale_temp_files(model, older_than).aggregate(files=Count('id'), bytes=Sum('file_size'))
+            files, bytes_reclaimed = totals['files'], totals['bytes'] or 0
+        else:
+            files, bytes_reclaimed = gc_model_temp_files(model, older_than, batch_size)
+            logger.info("Removed %d temporary %s rows, %d bytes", files, model.__name__, bytes_reclaimed)
+        result[model.__name__] = {'files': files, 'bytes': bytes_reclaimed}
+    return result
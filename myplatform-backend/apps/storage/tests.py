@@ -0,0 +1,482 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import mock
+from datetime import date, timedelta
+
+import boto3
+import requests
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
+from django.urls import reverse
+from moto import mock_aws
+
+from apps.assignments.models import Assignment, AssignmentFile, Submission, SubmissionFile
+from apps.courses.models import Course
+from apps.jobs.models import Job
+from apps.jobs.queue import run_pending
+from apps.lessons.models import Lesson, LessonFile
+from apps.modules.models import Module
+from apps.storage.cleanup import delete_keys, purge_prefix
+from apps.storage.client import get_s3_client, public_url, reset_s3_client
+from apps.storage.models import Upload
+from apps.storage.uploads import discard_uploads, process_upload, resubmit_stalled_uploads
+from apps.users.models import CustomUser
+
+
+class S3ClientTest(TestCase):
+
+    @override_settings(S3_MAX_POOL_CONNECTIONS=32, S3_MAX_ATTEMPTS=3, AWS_S3_REGION_NAME='eu-central-1')
+    def test_single_configured_client(self):
+        reset_s3_client()
+        self.addCleanup(reset_s3_client)
+        client = get_s3_client()
+        self.assertIs(get_s3_client(), client)
+        self.assertEqual(client.meta.region_name, 'eu-central-1')
+        self.assertEqual(client.meta.config.max_pool_connections, 32)
+        self.assertEqual(client.meta.config.retries['total_max_attempts'], 3)
+        self.assertTrue(client.meta.config.tcp_keepalive)
+
+    def test_concurrent_first_calls_build_one_client(self):
+        reset_s3_client()
+        self.addCleanup(reset_s3_client)
+        barrier = threading.Barrier(8)
+
+        def slow_session():
+            time.sleep(0.05)
+            return mock.Mock()
+
+        def first_call(_):
+            barrier.wait()
+            return get_s3_client()
+
+        with mock.patch('apps.storage.client.boto3.session.Session', side_effect=slow_session) as session:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                clients = list(executor.map(first_call, range(8)))
+        self.assertEqual(session.call_count, 1)
+        self.assertEqual(len({id(client) for client in clients}), 1)
+
+
+class S3TestCase(TestCase):
+
+    def setUp(self):
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        overrides = override_settings(
+            BACKGROUND_TASKS_EAGER=True,
+            UPLOAD_SPOOL_DIR=spool_dir,
+            UPLOAD_MULTIPART_THRESHOLD=5 * 1024 * 1024,
+            AWS_ACCESS_KEY_ID='testing',
+            AWS_SECRET_ACCESS_KEY='testing',
+            AWS_S3_REGION_NAME='us-east-1',
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        mock = mock_aws()
+        mock.start()
+        self.addCleanup(mock.stop)
+        reset_s3_client()
+        self.addCleanup(reset_s3_client)
+        self.s3 = boto3.client('s3', region_name='us-east-1')
+        self.s3.create_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+
+        self.client = Client()
+        self.teacher = CustomUser.objects.create_user(username="andrii_teacher", password="1234567890HTML", role='teacher')
+        self.client.login(username="andrii_teacher", password="1234567890HTML")
+        self.course = Course.objects.create(
+            title="Sample Course",
+            description="Course Description",
+            teacher=self.teacher,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            duration=30,
+            batch_number=1,
+            status='free'
+        )
+        module = Module.objects.create(course=self.course, title="Sample Module", description="Module Description")
+        self.lesson = Lesson.objects.create(module=module, title="Sample Lesson", content="Lesson Content")
+
+    def s3_object(self, key):
+        return self.s3.get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+
+
+class UploadPipelineTest(S3TestCase):
+
+    def test_lesson_file_uploaded_in_background(self):
+        content = os.urandom(11 * 1024 * 1024)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse('upload-file', kwargs={'lesson_id': self.lesson.id}), {
+                'file': SimpleUploadedFile("lecture.mp4", content, content_type='video/mp4'),
+            })
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(response.json()['upload']['status'], 'pending')
+            self.assertEqual(response.json()['upload_status'], 'pending')
+
+        upload = Upload.objects.get(id=response.json()['upload']['id'])
+        self.assertEqual(upload.target, LessonFile.objects.get(id=response.json()['id']))
+        self.assertTrue(os.path.exists(upload.spool_path))
+
+        for callback in callbacks:
+            callback()
+
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, 'ready')
+        self.assertFalse(os.path.exists(upload.spool_path))
+        s3_object = self.s3_object(upload.key)
+        self.assertEqual(s3_object['Body'].read(), content)
+        self.assertEqual(s3_object['ContentType'], 'video/mp4')
+        # Файл більший за поріг - завантажено multipart-частинами
+        self.assertIn('-', s3_object['ETag'])
+
+        response = self.client.get(reverse('upload_status', kwargs={'upload_id': upload.id}))
+        self.assertEqual(response.json()['status'], 'ready')
+        response = self.client.get(reverse('lesson_files', kwargs={'lesson_id': self.lesson.id}))
+        self.assertEqual([file['upload_status'] for file in response.json()], ['ready'])
+
+    def test_course_image_replaced_after_upload(self):
+        old_key = f"Courses/Course_{self.course.id}/course_files/old.png"
+        self.s3.put_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=old_key, Body=b"old")
+        self.course.image_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/{old_key}"
+        self.course.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('upload_image', kwargs={'pk': self.course.id}), {
+                'image': SimpleUploadedFile("new image.png", b"new", content_type='image/png'),
+            })
+        self.assertEqual(response.status_code, 202)
+
+        self.course.refresh_from_db()
+        self.assertTrue(self.course.image_url.endswith("/course_files/new%20image.png"))
+        self.assertEqual(self.s3_object(f"Courses/Course_{self.course.id}/course_files/new image.png")['Body'].read(), b"new")
+        with self.assertRaises(self.s3.exceptions.NoSuchKey):
+            self.s3_object(old_key)
+
+    def test_failed_upload_can_be_retried(self):
+        self.s3.delete_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse('upload-file', kwargs={'lesson_id': self.lesson.id}), {
+                'file': SimpleUploadedFile("notes.pdf", b"%PDF", content_type='application/pdf'),
+            })
+        # Лише саме завантаження; повтор, який воно ставить у чергу, тут не виконується
+        with self.assertLogs('apps.storage.uploads', 'WARNING'):
+            callbacks[0]()
+        upload = Upload.objects.get(id=response.json()['upload']['id'])
+        self.assertEqual(upload.status, 'failed')
+        self.assertTrue(os.path.exists(upload.spool_path))
+
+        self.s3.create_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+        self.assertEqual(len(resubmit_stalled_uploads()), 0)
+        self.assertEqual(len(resubmit_stalled_uploads(retry_failed=True)), 1)
+
+        upload.refresh_from_db()
+        self.assertEqual((upload.status, upload.attempts), ('ready', 2))
+        self.assertEqual(self.s3_object(upload.key)['Body'].read(), b"%PDF")
+
+    @override_settings(BACKGROUND_TASKS_EAGER=False)
+    def test_failed_upload_retried_by_job_queue(self):
+        with self.captureOnCommitCallbacks():
+            response = self.client.post(reverse('upload-file', kwargs={'lesson_id': self.lesson.id}), {
+                'file': SimpleUploadedFile("notes.pdf", b"%PDF", content_type='application/pdf'),
+            })
+        upload = Upload.objects.get(id=response.json()['upload']['id'])
+
+        self.s3.delete_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+        with self.assertLogs('apps.storage.uploads', 'WARNING'):
+            process_upload(upload.id)
+        job = Job.objects.get()
+        self.assertEqual((job.name, job.args), ('apps.storage.uploads.retry_upload', [upload.id]))
+        response = self.client.get(reverse('lesson_files', kwargs={'lesson_id': self.lesson.id}))
+        self.assertEqual([file['upload_status'] for file in response.json()], ['failed'])
+
+        self.s3.create_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+        self.assertEqual(run_pending(), 1)
+
+        upload.refresh_from_db()
+        job.refresh_from_db()
+        self.assertEqual((upload.status, upload.attempts, job.status), ('ready', 2, 'done'))
+        self.assertEqual(self.s3_object(upload.key)['Body'].read(), b"%PDF")
+        response = self.client.get(reverse('lesson_files', kwargs={'lesson_id': self.lesson.id}))
+        self.assertEqual([file['upload_status'] for file in response.json()], ['ready'])
+
+    @override_settings(BACKGROUND_TASKS_EAGER=False, JOBS_MAX_ATTEMPTS=2, JOBS_RETRY_BACKOFF=0)
+    def test_upload_retries_are_bounded(self):
+        with self.captureOnCommitCallbacks():
+            response = self.client.post(reverse('upload-file', kwargs={'lesson_id': self.lesson.id}), {
+                'file': SimpleUploadedFile("notes.pdf", b"%PDF", content_type='application/pdf'),
+            })
+        upload = Upload.objects.get(id=response.json()['upload']['id'])
+
+        self.s3.delete_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+        with self.assertLogs('apps.storage.uploads', 'WARNING'), self.assertLogs('apps.jobs.queue', 'WARNING'):
+            process_upload(upload.id)
+            self.assertEqual(run_pending(), 2)
+
+        spool_path = upload.spool_path
+        upload.refresh_from_db()
+        self.assertEqual((upload.status, upload.attempts, upload.spool_path), ('failed', 3, ''))
+        self.assertEqual(Job.objects.get().status, 'failed')
+        self.assertFalse(os.path.exists(spool_path))
+        # Після останньої спроби ні черга, ні process_uploads --retry-failed його вже не беруть
+        self.assertEqual(len(resubmit_stalled_uploads(retry_failed=True)), 0)
+
+    def post_lesson_file(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse('upload-file', kwargs={'lesson_id': self.lesson.id}), {
+                'file': SimpleUploadedFile("notes.pdf", b"%PDF", content_type='application/pdf'),
+            })
+        return Upload.objects.get(id=response.json()['upload']['id']), callbacks
+
+    def test_deleting_file_cancels_pending_upload(self):
+        upload, callbacks = self.post_lesson_file()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse('delete-temp-file', kwargs={'file_id': upload.target_id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Upload.objects.filter(id=upload.id).exists())
+        self.assertFalse(os.path.exists(upload.spool_path))
+
+        for callback in callbacks:
+            callback()
+        with self.assertRaises(self.s3.exceptions.NoSuchKey):
+            self.s3_object(upload.key)
+
+    def test_upload_of_deleted_target_is_dropped(self):
+        upload, callbacks = self.post_lesson_file()
+        # Каскадне видалення (урок разом з файлами) Upload не чіпає - його відкидає сам воркер
+        self.lesson.delete()
+
+        for callback in callbacks:
+            callback()
+        self.assertFalse(Upload.objects.filter(id=upload.id).exists())
+        self.assertFalse(os.path.exists(upload.spool_path))
+        with self.assertRaises(self.s3.exceptions.NoSuchKey):
+            self.s3_object(upload.key)
+
+    def test_file_deleted_during_upload_leaves_no_object(self):
+        upload, _ = self.post_lesson_file()
+        client = get_s3_client()
+
+        def upload_then_delete_file(*args, **kwargs):
+            client.upload_file(*args, **kwargs)
+            discard_uploads(LessonFile, [upload.target_id])
+            LessonFile.objects.filter(id=upload.target_id).delete()
+
+        with mock.patch('apps.storage.uploads.get_s3_client', return_value=mock.Mock(
+            wraps=client, upload_file=upload_then_delete_file
+        )):
+            self.assertIsNone(process_upload(upload.id))
+        self.assertFalse(os.path.exists(upload.spool_path))
+        with self.assertRaises(self.s3.exceptions.NoSuchKey):
+            self.s3_object(upload.key)
+
+
+class DirectUploadTest(S3TestCase):
+
+    def direct_upload(self, **data):
+        return self.client.post(reverse('direct_upload'), data, content_type='application/json')
+
+    def confirm(self, **data):
+        return self.client.post(reverse('confirm_direct_upload'), data, content_type='application/json')
+
+    def test_presigned_post_then_confirm(self):
+        response = self.direct_upload(target='lesson', target_id=self.lesson.id, file_name='notes.pdf',
+                                      file_size=4, content_type='application/pdf')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['method'], 'POST')
+        self.assertEqual(data['key'], f"Courses/Course_{self.course.id}/lessons/lesson_{self.lesson.id}/notes.pdf")
+
+        # Ще не завантажено - запис не створюється
+        self.assertEqual(self.confirm(target='lesson', target_id=self.lesson.id, key=data['key']).status_code, 400)
+
+        upload = requests.post(data['url'], data=data['fields'], files={'file': ('notes.pdf', b'%PDF')})
+        self.assertLess(upload.status_code, 300)
+
+        response = self.confirm(target='lesson', target_id=self.lesson.id, key=data['key'])
+        self.assertEqual(response.status_code, 201)
+        lesson_file = LessonFile.objects.get(id=response.json()['id'])
+        self.assertEqual((lesson_file.file_type, lesson_file.file_size, lesson_file.is_temp), ('pdf', 4, True))
+
+        # Повторне підтвердження не дублює запис
+        self.assertEqual(self.confirm(target='lesson', target_id=self.lesson.id, key=data['key']).status_code, 200)
+        self.assertEqual(LessonFile.objects.filter(lesson=self.lesson).count(), 1)
+
+        response = self.client.post(reverse('confirm-temp-files', kwargs={'lesson_id': self.lesson.id}))
+        self.assertEqual(response.status_code, 200)
+        lesson_file.refresh_from_db()
+        self.assertFalse(lesson_file.is_temp)
+
+    def test_multipart_submission_upload(self):
+        student = CustomUser.objects.create_user(username="student", password="1234567890HTML", role='student')
+        assignment = Assignment.objects.create(course=self.course, teacher=self.teacher, title="Essay")
+        submission = Submission.objects.create(student=student, assignment=assignment)
+        self.client.login(username="student", password="1234567890HTML")
+
+        content = os.urandom(11 * 1024 * 1024)
+        response = self.direct_upload(target='submission', target_id=assignment.id, file_name='essay.docx',
+                                      file_size=len(content))
+        data = response.json()
+        self.assertEqual(data['method'], 'multipart')
+        self.assertEqual(len(data['parts']), 3)
+
+        parts = []
+        for part in data['parts']:
+            start = (part['part_number'] - 1) * data['part_size']
+            uploaded = requests.put(part['url'], data=content[start:start + data['part_size']])
+            parts.append({'part_number': part['part_number'], 'etag': uploaded.headers['ETag']})
+
+        response = self.confirm(target='submission', target_id=assignment.id, key=data['key'],
+                                upload_id=data['upload_id'], parts=parts)
+        self.assertEqual(response.status_code, 201)
+        submission_file = SubmissionFile.objects.get(submission=submission)
+        self.assertEqual((submission_file.file_type, submission_file.file_size), ('docx', len(content)))
+        self.assertEqual(self.s3_object(data['key'])['Body'].read(), content)
+
+    def test_access_checks(self):
+        CustomUser.objects.create_user(username="other", password="1234567890HTML", role='teacher')
+        self.client.login(username="other", password="1234567890HTML")
+        response = self.direct_upload(target='lesson', target_id=self.lesson.id, file_name='a.pdf', file_size=1)
+        self.assertEqual(response.status_code, 403)
+
+        self.client.login(username="andrii_teacher", password="1234567890HTML")
+        response = self.direct_upload(target='lesson', target_id=self.lesson.id, file_name='a.exe', file_size=1)
+        self.assertEqual(response.status_code, 400)
+
+        # Ключ з чужого курсу не підтверджується
+        foreign_key = f"Courses/Course_{self.course.id + 1}/lessons/lesson_{self.lesson.id}/a.pdf"
+        self.s3.put_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=foreign_key, Body=b"x")
+        response = self.confirm(target='lesson', target_id=self.lesson.id, key=foreign_key)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(LessonFile.objects.exists())
+
+
+class StorageCleanupTest(S3TestCase):
+
+    def put(self, key):
+        self.s3.put_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key, Body=b"x")
+        return public_url(key)
+
+    def bucket_keys(self):
+        paginator = self.s3.get_paginator('list_objects_v2')
+        return [obj['Key'] for page in paginator.paginate(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+                for obj in page.get('Contents', [])]
+
+    def test_delete_keys_in_batches(self):
+        keys = [f"Courses/Course_1/lessons/file_{i}.pdf" for i in range(1500)]
+        for key in keys:
+            self.put(key)
+        self.put("Courses/Course_1/keep.pdf")
+
+        self.assertEqual(delete_keys(keys + keys[:10]), 1500)
+        self.assertEqual(self.bucket_keys(), ["Courses/Course_1/keep.pdf"])
+
+    def test_assignment_destroy_deletes_all_files(self):
+        assignment = Assignment.objects.create(course=self.course, teacher=self.teacher, title="Essay")
+        prefix = f"Courses/Course_{self.course.id}"
+        for i in range(2):
+            AssignmentFile.objects.create(assignment=assignment, file_type='pdf', file_size=1, is_temp=False,
+                                          file_url=self.put(f"{prefix}/assignments/assignment_{assignment.id}/task {i}.pdf"))
+        for i in range(3):
+            student = CustomUser.objects.create_user(username=f"student_{i}", password="1234567890HTML", role='student')
+            submission = Submission.objects.create(student=student, assignment=assignment, status='submitted')
+            SubmissionFile.objects.create(submission=submission, file_type='pdf', file_size=1,
+                                          file_url=self.put(f"{prefix}/submissions/submission_{submission.id}/essay.pdf"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse('assignments-detail', kwargs={'pk': assignment.id}))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Submission.objects.exists())
+        self.assertFalse(SubmissionFile.objects.exists())
+        self.assertEqual(self.bucket_keys(), [])
+
+    def test_cancel_submission_deletes_files(self):
+        student = CustomUser.objects.create_user(username="student", password="1234567890HTML", role='student')
+        assignment = Assignment.objects.create(course=self.course, teacher=self.teacher, title="Essay")
+        submission = Submission.objects.create(student=student, assignment=assignment, status='submitted')
+        for name in ("a.pdf", "b c.pdf"):
+            SubmissionFile.objects.create(submission=submission, file_type='pdf', file_size=1,
+                                          file_url=self.put(f"Courses/Course_{self.course.id}/submissions/{name}"))
+        self.client.login(username="student", password="1234567890HTML")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('cancel_submission', kwargs={'submission_id': submission.id}))
+        self.assertEqual(response.status_code, 200)
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, 'assigned')
+        self.assertFalse(submission.files.exists())
+        self.assertEqual(self.bucket_keys(), [])
+
+    def test_purge_prefix_pages_through_listing(self):
+        prefix = f"Courses/Course_{self.course.id}/"
+        for i in range(2500):
+            self.put(f"{prefix}lessons/file_{i}.pdf")
+        self.put(f"Courses/Course_{self.course.id}0/keep.pdf")
+
+        progress = []
+        deleted, listed = purge_prefix(prefix, workers=2, progress=lambda *counts: progress.append(counts))
+        self.assertEqual((deleted, listed), (2500, 2500))
+        self.assertEqual(len(progress), 3)
+        self.assertEqual(progress[-1], (2500, 2500))
+        self.assertEqual(self.bucket_keys(), [f"Courses/Course_{self.course.id}0/keep.pdf"])
+
+    def test_course_destroy_and_purge_command(self):
+        course_id = self.course.id
+        self.put(f"Courses/Course_{course_id}/course_files/image.png")
+
+        with self.assertRaises(CommandError):
+            call_command('purge_course_storage', course_id, stdout=StringIO())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse('course-detail', kwargs={'pk': course_id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Course.objects.filter(id=course_id).exists())
+        self.assertEqual(self.bucket_keys(), [])
+
+        # Залишки після збою фонового видалення прибирає команда
+        self.put(f"Courses/Course_{course_id}/lessons/orphan.pdf")
+        out = StringIO()
+        call_command('purge_course_storage', course_id, stdout=out)
+        self.assertIn("Deleted 1 objects", out.getvalue())
+        self.assertEqual(self.bucket_keys(), [])
+
+    def test_gc_temp_files(self):
+        assignment = Assignment.objects.create(course=self.course, teacher=self.teacher, title="Essay")
+        prefix = f"Courses/Course_{self.course.id}"
+        stale = [
+            LessonFile.objects.create(lesson=self.lesson, file_type='pdf', file_size=100,
+                                      file_url=self.put(f"{prefix}/lessons/lesson_{self.lesson.id}/draft.pdf")),
+            AssignmentFile.objects.create(assignment=assignment, file_type='pdf', file_size=50,
+                                          file_url=self.put(f"{prefix}/assignments/assignment_{assignment.id}/draft.pdf")),
+        ]
+        confirmed = LessonFile.objects.create(lesson=self.lesson, file_type='pdf', file_size=1, is_temp=False,
+                                              file_url=self.put(f"{prefix}/lessons/lesson_{self.lesson.id}/final.pdf"))
+        fresh = LessonFile.objects.create(lesson=self.lesson, file_type='pdf', file_size=1,
+                                          file_url=self.put(f"{prefix}/lessons/lesson_{self.lesson.id}/new.pdf"))
+        two_days_ago = timezone.now() - timedelta(days=2)
+        for model in (LessonFile, AssignmentFile):
+            model.objects.exclude(id=fresh.id).update(created_at=two_days_ago)
+
+        out = StringIO()
+        call_command('gc_temp_files', '--dry-run', stdout=out)
+        self.assertIn("Would remove 2 temporary files, 150 bytes", out.getvalue())
+        self.assertEqual(len(self.bucket_keys()), 4)
+
+        out = StringIO()
+        call_command('gc_temp_files', '--batch-size', '1', stdout=out)
+        self.assertIn("Removed 1 LessonFile files, 100 bytes", out.getvalue())
+        self.assertIn("Removed 1 AssignmentFile files, 50 bytes", out.getvalue())
+        self.assertFalse(LessonFile.objects.filter(id=stale[0].id).exists())
+        self.assertFalse(AssignmentFile.objects.exists())
+        self.assertEqual(
+            sorted(self.bucket_keys()),
+            sorted([f"{prefix}/lessons/lesson_{self.lesson.id}/final.pdf", f"{prefix}/lessons/lesson_{self.lesson.id}/new.pdf"])
+        )
+        self.assertEqual(LessonFile.objects.filter(id__in=[confirmed.id, fresh.id]).count(), 2)
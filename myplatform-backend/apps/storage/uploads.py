@@ -0,0 +1,207 @@
+# apps/storage/uploads.py
+"""
+Асинхронне завантаження файлів у S3.
+
+Запит лише копіює файл у UPLOAD_SPOOL_DIR і створює Upload зі статусом pending;
+після коміту транзакції завантаження ставиться у фоновий пул (myplatform.background),
+де файл іде в S3 multipart-частинами паралельно, а Upload переходить у ready або failed.
+Невдале завантаження повторює черга apps.jobs (retry_upload) з експоненційною затримкою,
+не більше JOBS_MAX_ATTEMPTS разів. Завдання, що загубилися через перезапуск процесу,
+дозапускає manage.py process_uploads. Видаляючи рядок файлу, його Upload відкидають через discard_uploads.
+"""
+
+import logging
+import os
+import uuid
+from datetime import timedelta
+
+from boto3.exceptions import S3UploadFailedError
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from apps.jobs.queue import enqueue
+from myplatform.background import submit
+from .client import get_s3_client, transfer_config
+from .models import Upload
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_ERRORS = (BotoCoreError, ClientError, S3UploadFailedError, OSError)
+
+
+class UploadFailedError(Exception):
+    pass
+
+
+def spool(file):
+    """Копіює завантажений файл у spool-каталог порціями; повертає шлях"""
+    os.makedirs(settings.UPLOAD_SPOOL_DIR, exist_ok=True)
+    path = os.path.join(settings.UPLOAD_SPOOL_DIR, uuid.uuid4().hex)
+    with open(path, 'wb') as spooled:
+        for chunk in file.chunks():
+            spooled.write(chunk)
+    return path
+
+
+def enqueue_upload(file, key, uploaded_by=None, target=None, target_field='', replaces_key=''):
+    """
+    Ставить файл у чергу на завантаження під ключем key і одразу повертає Upload (status='pending').
+    target - запис, до якого належить файл; якщо задано target_field, після завантаження
+    в це поле target записується URL файлу, а об'єкт replaces_key видаляється з S3.
+    target отримує upload_status, як після with_upload_status, - серіалізатор файлу не робить запит.
+    """
+    if uploaded_by is not None and not uploaded_by.is_authenticated:
+        uploaded_by = None
+
+    upload = Upload.objects.create(
+        key=key,
+        spool_path=spool(file),
+        content_type=getattr(file, 'content_type', None) or '',
+        size=file.size,
+        uploaded_by=uploaded_by,
+        target=target,
+        target_field=target_field,
+        replaces_key=replaces_key if replaces_key != key else '',
+    )
+    if target is not None:
+        target.upload_status = upload.status
+    transaction.on_commit(lambda: submit(process_upload, upload.id))
+    return upload
+
+
+def remove_spool_file(spool_path):
+    try:
+        os.remove(spool_path)
+    except FileNotFoundError:
+        pass
+
+
+def discard_uploads(model, ids):
+    """
+    Видаляє записи Upload видалених файлів model, щоб воркер і process_uploads їх не дозавантажували;
+    spool-файли прибираються після коміту (у разі відкату Upload лишається разом із файлом).
+    """
+    uploads = Upload.objects.filter(target_type=ContentType.objects.get_for_model(model), target_id__in=ids)
+    spool_paths = [path for path in uploads.values_list('spool_path', flat=True) if path]
+    uploads.delete()
+    transaction.on_commit(lambda: [remove_spool_file(path) for path in spool_paths])
+
+
+def upload_attempts_exhausted(upload):
+    # Перша спроба з фонового пулу + JOBS_MAX_ATTEMPTS повторів через чергу apps.jobs
+    return upload.attempts > settings.JOBS_MAX_ATTEMPTS
+
+
+def process_upload(upload_id, schedule_retry=True):
+    """
+    Завантажує файл Upload у S3. Ідемпотентне: pending/failed-запис забирає лише один воркер.
+    Після невдачі (якщо schedule_retry) ставить повтор у чергу apps.jobs; коли спроби вичерпано,
+    spool-файл видаляється. Upload, чий файл (target) уже видалено, відкидається без завантаження.
+    """
+    # Порожній spool_path - спроби вичерпано, завантажувати нічого
+    claimed = Upload.objects.filter(id=upload_id, status__in=['pending', 'failed']).exclude(spool_path='').update(
+        status='uploading', attempts=F('attempts') + 1, updated_at=timezone.now()
+    )
+    if not claimed:
+        return None
+
+    upload = Upload.objects.filter(id=upload_id).first()
+    if upload is None:
+        return None
+    if upload.target_type_id is not None and upload.target is None:
+        logger.info("Upload %s discarded, its target no longer exists", upload.id)
+        upload.delete()
+        remove_spool_file(upload.spool_path)
+        return None
+
+    extra_args = {'ContentType': upload.content_type} if upload.content_type else None
+    try:
+        get_s3_client().upload_file(
+            upload.spool_path, settings.AWS_STORAGE_BUCKET_NAME, upload.key,
+            ExtraArgs=extra_args, Config=transfer_config()
+        )
+    except UPLOAD_ERRORS as e:
+        upload.status = 'failed'
+        upload.error = str(e)
+        if upload_attempts_exhausted(upload):
+            logger.error("Upload %s to %s failed after %d attempts: %s", upload.id, upload.key, upload.attempts, e)
+            remove_spool_file(upload.spool_path)
+            upload.spool_path = ''
+        else:
+            logger.warning("Upload %s to %s failed: %s", upload.id, upload.key, e)
+        Upload.objects.filter(id=upload.id).update(
+            status=upload.status, error=upload.error, spool_path=upload.spool_path, updated_at=timezone.now()
+        )
+        if schedule_retry and upload.spool_path:
+            enqueue(retry_upload, upload.id)
+        return upload
+
+    # Файл видалили, поки він завантажувався (discard_uploads прибрав Upload) - об'єкт нікому не належить
+    if not Upload.objects.filter(id=upload.id).update(status='ready', error='', updated_at=timezone.now()):
+        logger.info("Upload %s discarded while uploading, deleting %s", upload.id, upload.key)
+        try:
+            get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=upload.key)
+        except (BotoCoreError, ClientError) as e:
+            logger.warning("Failed to delete discarded object %s: %s", upload.key, e)
+        remove_spool_file(upload.spool_path)
+        return None
+    upload.status = 'ready'
+    upload.error = ''
+
+    if upload.target_field and upload.target is not None:
+        setattr(upload.target, upload.target_field, upload.url)
+        upload.target.save()
+
+    if upload.replaces_key:
+        try:
+            get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=upload.replaces_key)
+        except (BotoCoreError, ClientError) as e:
+            logger.warning("Failed to delete replaced object %s: %s", upload.replaces_key, e)
+
+    remove_spool_file(upload.spool_path)
+    return upload
+
+
+def retry_upload(upload_id):
+    """Завдання черги apps.jobs: помилка знову невдалого завантаження - сигнал черзі повторити пізніше"""
+    upload = process_upload(upload_id, schedule_retry=False)
+    if upload is not None and upload.status == 'failed':
+        raise UploadFailedError(f"Upload {upload.id} to {upload.key} failed: {upload.error}")
+
+
+def resubmit_stalled_uploads(stalled_after=timedelta(minutes=30), retry_failed=False):
+    """
+    Повертає в чергу завантаження, які загубилися: pending, "uploading" довше за stalled_after
+    (процес упав посеред завантаження) і, за бажанням, failed. Повертає список Future.
+    """
+    stalled = Q(status='uploading', updated_at__lt=timezone.now() - stalled_after)
+    Upload.objects.filter(stalled).update(status='pending', updated_at=timezone.now())
+
+    statuses = ['pending', 'failed'] if retry_failed else ['pending']
+    upload_ids = list(Upload.objects.filter(status__in=statuses).exclude(spool_path='').values_list('id', flat=True))
+    return [submit(process_upload, upload_id) for upload_id in upload_ids]
+
+
+def with_upload_status(queryset):
+    """Анотує файли queryset полем upload_status - статусом останнього Upload файлу (None - Upload немає)"""
+    opts = queryset.model._meta
+    uploads = Upload.objects.filter(
+        target_type__app_label=opts.app_label, target_type__model=opts.model_name, target_id=OuterRef('pk')
+    ).order_by('-id')
+    return queryset.annotate(upload_status=Subquery(uploads.values('status')[:1]))
+
+
+def upload_statuses(files):
+    """{id файлу: статус останнього Upload} для записів однієї моделі одним запитом"""
+    if not files:
+        return {}
+    opts = files[0]._meta
+    # Сортування за id: у dict лишається статус останнього Upload кожного файлу
+    return dict(Upload.objects.filter(
+        target_type__app_label=opts.app_label, target_type__model=opts.model_name,
+        target_id__in=[file.pk for file in files],
+    ).order_by('id').values_list('target_id', 'status'))
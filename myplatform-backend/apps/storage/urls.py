@@ -0,0 +1,11 @@
+# apps/storage/urls.py
+
+from django.urls import path
+
+from .views import ConfirmDirectUploadView, DirectUploadView, UploadStatusView
+
+urlpatterns = [
+    path('uploads/<int:upload_id>/', UploadStatusView.as_view(), name='upload_status'),
+    path('direct-uploads/', DirectUploadView.as_view(), name='direct_upload'),
+    path('direct-uploads/confirm/', ConfirmDirectUploadView.as_view(), name='confirm_direct_upload'),
+]
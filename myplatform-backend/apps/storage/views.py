@@ -0,0 +1,85 @@
+# apps/storage/views.py
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.assignments.serializers import AssignmentFileSerializer, SubmissionFileSerializer
+from apps.lessons.serializers import LessonFileSerializer
+from apps.materials.serializers import MaterialFileSerializer
+from .mixins import CsrfExemptSessionAuthentication
+from .models import Upload
+from .presign import DirectUploadError, confirm_direct_upload, create_direct_upload
+from .serializers import UploadSerializer
+
+FILE_SERIALIZERS = {
+    'lesson': LessonFileSerializer,
+    'assignment': AssignmentFileSerializer,
+    'material': MaterialFileSerializer,
+    'submission': SubmissionFileSerializer,
+}
+
+
+class UploadStatusView(APIView):
+    authentication_classes = [CsrfExemptSessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, upload_id):
+        try:
+            upload = Upload.objects.get(id=upload_id)
+        except Upload.DoesNotExist:
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        # Файли з ендпоінтів без сесійної автентифікації не мають власника
+        owner_id = upload.uploaded_by_id
+        if owner_id is not None and owner_id != request.user.id and request.user.role != 'admin':
+            return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
+
+        return Response(UploadSerializer(upload).data, status=status.HTTP_200_OK)
+
+
+class DirectUploadView(APIView):
+    """Presigned URL для завантаження файлу з клієнта прямо в S3"""
+    authentication_classes = [CsrfExemptSessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            data = create_direct_upload(
+                request.data.get('target'),
+                request.data.get('target_id'),
+                request.user,
+                file_name=request.data.get('file_name'),
+                size=request.data.get('file_size'),
+                content_type=request.data.get('content_type', ''),
+                method=str(request.data.get('method', 'post')).lower(),
+            )
+        except DirectUploadError as e:
+            return Response({"error": e.message}, status=e.status_code)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class ConfirmDirectUploadView(APIView):
+    """Перевіряє завантажений напряму об'єкт і створює запис файлу"""
+    authentication_classes = [CsrfExemptSessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        target = request.data.get('target')
+        try:
+            file_record, created = confirm_direct_upload(
+                target,
+                request.data.get('target_id'),
+                request.user,
+                key=request.data.get('key'),
+                upload_id=request.data.get('upload_id'),
+                parts=request.data.get('parts'),
+            )
+        except DirectUploadError as e:
+            return Response({"error": e.message}, status=e.status_code)
+
+        return Response(
+            FILE_SERIALIZERS[target](file_record).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
@@ -14,5 +14,10 @@ class CustomUser(AbstractUser):
     phone_number = models.CharField(max_length=255, blank=True, null=True)
     profile_image_url = models.CharField(max_length=255, blank=True, null=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['role', 'date_joined', 'id']),
+        ]
+
     def __str__(self):
         return self.username
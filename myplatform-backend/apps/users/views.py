@@ -5,7 +5,7 @@ from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
-from django.db.models import Q
+from django.db.models import F, Q
 from django.http import JsonResponse, Http404
 from django.shortcuts import render, get_object_or_404
 from django.utils.crypto import get_random_string
@@ -18,12 +18,17 @@ from google.oauth2 import id_token
 from google.auth.transport import requests
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-import boto3
 from botocore.exceptions import ClientError
 from django.conf import settings
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from rest_framework import status
+from rest_framework.exceptions import ParseError
+
+from apps.jobs.queue import enqueue
+from apps.storage.client import get_s3_client, transfer_config
+from myplatform.pagination import KeysetPagination
+from myplatform.streaming import stream_format, stream_rows
 
 from django.contrib.auth import login, get_user_model
 from django.contrib.auth.backends import ModelBackend
@@ -31,14 +36,6 @@ from django.contrib.auth.backends import ModelBackend
 logger = logging.getLogger(__name__)
 
 
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_S3_REGION_NAME
-)
-
-
 @csrf_exempt
 def register(request):
     if request.method == 'POST':
@@ -140,10 +137,26 @@ def delete_user(request, user_id):
         return JsonResponse({'message': 'User deleted successfully'})
     return JsonResponse({'message': 'Invalid request method'}, status=400)
 
+USER_KEYSET_ORDERING = ('-date_joined', '-id')
+USER_LIST_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'phone_number', 'profile_image_url')
+
 @csrf_exempt
 def list_teachers(request):
     if request.method == 'GET':
         teachers = CustomUser.objects.filter(role='teacher')
+
+        fmt = stream_format(request)
+        if fmt:
+            return stream_rows(teachers.values(*USER_LIST_FIELDS), fmt)
+
+        paginator = KeysetPagination(ordering=USER_KEYSET_ORDERING)
+        try:
+            page = paginator.paginate_queryset(teachers, request)
+        except ParseError as e:
+            return JsonResponse({'error': str(e.detail)}, status=400)
+        if page is not None:
+            teachers = page
+
         teachers_list = [{
             'id': teacher.id,
             'username': teacher.username,
@@ -153,6 +166,8 @@ def list_teachers(request):
             'phone_number': teacher.phone_number,
             'profile_image_url': teacher.profile_image_url
         } for teacher in teachers]
+        if page is not None:
+            return JsonResponse(paginator.get_paginated_data(teachers_list))
         return JsonResponse(teachers_list, safe=False)
     return JsonResponse({'message': 'Invalid request method'}, status=400)
 
@@ -160,6 +175,21 @@ def list_teachers(request):
 def list_students(request):
     if request.method == 'GET':
         students = CustomUser.objects.filter(role='student')
+
+        fmt = stream_format(request)
+        if fmt:
+            return stream_rows(students.values(
+                *USER_LIST_FIELDS, 'last_login', data_joined=F('date_joined')
+            ), fmt)
+
+        paginator = KeysetPagination(ordering=USER_KEYSET_ORDERING)
+        try:
+            page = paginator.paginate_queryset(students, request)
+        except ParseError as e:
+            return JsonResponse({'error': str(e.detail)}, status=400)
+        if page is not None:
+            students = page
+
         students_list = [{
             'id': student.id,
             'username': student.username,
@@ -171,6 +201,8 @@ def list_students(request):
             'last_login': student.last_login,
             'data_joined': student.date_joined,
         } for student in students]
+        if page is not None:
+            return JsonResponse(paginator.get_paginated_data(students_list))
         return JsonResponse(students_list, safe=False)
     return JsonResponse({'message': 'Invalid request method'}, status=400)
 
@@ -230,12 +262,13 @@ def reset_password_request(request):
             user = CustomUser.objects.get(email=email)
             token = default_token_generator.make_token(user)
             reset_url = f"http://localhost:3000/reset-password?uid={user.pk}&token={token}"
-            send_mail(
+            # Лист надсилає воркер черги (manage.py run_workers), з повторами при збої SMTP
+            enqueue(
+                send_mail,
                 'Password Reset Request',
                 f'Click the link below to reset your password:\n{reset_url}',
                 settings.DEFAULT_FROM_EMAIL,
                 [email],
-                fail_silently=False,
             )
             return JsonResponse({'message': 'Password reset link has been sent to your email.'})
         except CustomUser.DoesNotExist:
@@ -493,7 +526,7 @@ def upload_profile_image(request, user_id):
         s3_file_path = f"Users/User_{user.id}/{file.name}"
 
 
-        s3_client.upload_fileobj(file, settings.AWS_STORAGE_BUCKET_NAME, s3_file_path)
+        get_s3_client().upload_fileobj(file, settings.AWS_STORAGE_BUCKET_NAME, s3_file_path, Config=transfer_config())
 
         encoded_file_path = urllib.parse.quote(s3_file_path, safe='/')
 
@@ -503,7 +536,7 @@ def upload_profile_image(request, user_id):
             parsed_url = urllib.parse.urlparse(user.profile_image_url)
             encoded_old_image_key = parsed_url.path.lstrip('/')
             old_image_key = urllib.parse.unquote(encoded_old_image_key)
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=old_image_key)
+            get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=old_image_key)
 
         user.profile_image_url = file_url
         user.save()
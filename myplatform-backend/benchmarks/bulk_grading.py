@@ -0,0 +1,108 @@
+# benchmarks/bulk_grading.py
+"""
+Оцінювання N здач: N запитів POST .../grade/ проти одного POST .../submissions/bulk-grade/.
+
+Запуск з каталогу myplatform-backend (потрібні ті самі змінні оточення, що й для manage.py):
+
+    python benchmarks/bulk_grading.py --counts 10 100 1000
+
+Скрипт створює окрему тестову БД (як manage.py test), курс з N студентами і два завдання
+(по одному на кожен спосіб) і для кожного розміру виводить час і кількість SQL-запитів.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myplatform.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from datetime import date, timedelta  # noqa: E402
+
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from apps.assignments.models import Assignment, Submission  # noqa: E402
+from apps.courses.models import Course  # noqa: E402
+from apps.enrollments.models import Enrollment  # noqa: E402
+from apps.users.models import CustomUser  # noqa: E402
+
+
+def populate(count):
+    teacher = CustomUser.objects.create_user(username=f"bench_teacher_{count}", password='!', role='teacher')
+    course = Course.objects.create(
+        title="Bench course", description="", teacher=teacher, start_date=date.today(),
+        end_date=date.today() + timedelta(days=30), duration=30, batch_number=1, status='free'
+    )
+    students = CustomUser.objects.bulk_create([
+        CustomUser(username=f"bench_student_{count}_{i}", password='!', role='student') for i in range(count)
+    ])
+    Enrollment.objects.bulk_create([Enrollment(course=course, student=student) for student in students])
+    assignments = []
+    for title in ("Per request", "Bulk"):
+        assignment = Assignment.objects.create(course=course, teacher=teacher, title=title)
+        Submission.objects.filter(assignment=assignment).update(status='submitted')
+        assignments.append(assignment)
+    return teacher, [student.id for student in students], assignments
+
+
+def per_request(client, assignment, student_ids):
+    for student_id in student_ids:
+        response = client.post(reverse('grade_submission', args=[assignment.id, student_id]), {'grade': '90'})
+        assert response.status_code == 200, response.content
+
+
+def bulk(client, assignment, student_ids):
+    items = [{'student_id': student_id, 'grade': '90'} for student_id in student_ids]
+    response = client.post(
+        reverse('bulk_grade_submissions', args=[assignment.id]), {'items': items}, content_type='application/json'
+    )
+    assert response.status_code == 200 and response.json()['updated'] == len(student_ids), response.content
+
+
+def measure(grade, client, assignment, student_ids):
+    # execute_wrapper, а не CaptureQueriesContext: той зберігає лише останні 9000 запитів
+    queries = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        started = time.perf_counter()
+        grade(client, assignment, student_ids)
+        elapsed = time.perf_counter() - started
+    return elapsed, queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        print(f"{'rows':>6} {'mode':>12} {'time, s':>8} {'queries':>8}")
+        with override_settings(ALLOWED_HOSTS=['*']):
+            for count in args.counts:
+                teacher, student_ids, (first, second) = populate(count)
+                client = Client()
+                client.force_login(teacher)
+                for mode, grade, assignment in (('per-request', per_request, first), ('bulk', bulk, second)):
+                    elapsed, queries = measure(grade, client, assignment, student_ids)
+                    print(f"{count:>6} {mode:>12} {elapsed:>8.2f} {queries:>8}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/s3_client_startup.py
+"""
+Вартість старту процесу: S3-клієнти, створені під час імпорту views, проти одного лінивого клієнта.
+
+Запуск з каталогу myplatform-backend (потрібні ті самі змінні оточення, що й для manage.py):
+
+    python benchmarks/s3_client_startup.py --repeat 5
+
+Кожен замір - у свіжому інтерпретаторі. "before" відтворює стару схему: кожен з модулів
+STARTUP_VIEW_MODULES створював свій boto3.client('s3') під час імпорту. "after" - поточний код:
+імпорт views не створює жодного клієнта, а get_s3_client() будує один клієнт при першому зверненні
+(ця разова ціна показана окремо як first_client). Мережевих запитів не робиться.
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_VIEW_MODULES = [
+    'apps.users.views',
+    'apps.courses.views',
+    'apps.assignments.views',
+    'apps.lessons.views',
+    'apps.materials.views',
+]
+
+
+def count_created_clients():
+    import botocore.session
+
+    created = []
+    create_client = botocore.session.Session.create_client
+
+    def counting_create_client(self, *args, **kwargs):
+        created.append(args[0] if args else kwargs.get('service_name'))
+        return create_client(self, *args, **kwargs)
+
+    botocore.session.Session.create_client = counting_create_client
+    return created
+
+
+def measure(mode):
+    sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myplatform.settings')
+    import importlib
+
+    import django
+
+    django.setup()
+    created = count_created_clients()
+
+    started = time.perf_counter()
+    if mode == 'before':
+        import boto3
+        from django.conf import settings
+
+        for _ in STARTUP_VIEW_MODULES:
+            boto3.client(
+                's3',
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_S3_REGION_NAME
+            )
+    for module in STARTUP_VIEW_MODULES:
+        importlib.import_module(module)
+    startup = time.perf_counter() - started
+
+    result = {'startup': startup, 'clients': len(created)}
+    if mode == 'after':
+        from apps.storage.client import get_s3_client
+
+        started = time.perf_counter()
+        get_s3_client()
+        result['first_client'] = time.perf_counter() - started
+    result['maxrss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(result))
+
+
+def run_child(mode):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode],
+        check=True, capture_output=True, text=True, cwd=BACKEND_DIR
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--child', choices=['before', 'after'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure(args.child)
+        return
+
+    print(f"{'mode':>8} {'views import, ms':>17} {'clients':>8} {'first client, ms':>17} {'maxrss, MB':>11}")
+    for mode in ('before', 'after'):
+        runs = [run_child(mode) for _ in range(args.repeat)]
+        startup = statistics.median(run['startup'] for run in runs) * 1000
+        first_client = statistics.median(run.get('first_client', 0) for run in runs) * 1000
+        maxrss = statistics.median(run['maxrss_mb'] for run in runs)
+        first_client = f"{first_client:.1f}" if mode == 'after' else '-'
+        print(f"{mode:>8} {startup:>17.1f} {runs[0]['clients']:>8} {first_client:>17} {maxrss:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
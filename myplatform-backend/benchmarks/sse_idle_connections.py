@@ -0,0 +1,210 @@
+# benchmarks/sse_idle_connections.py
+"""
+Навантажувальний тест SSE (GET /api/assignments/events/): N з'єднань, що простоюють, на одному ASGI-воркері.
+
+Запуск з каталогу myplatform-backend (потрібні ті самі змінні оточення, що й для manage.py, і uvicorn):
+
+    python benchmarks/sse_idle_connections.py --connections 5000 --hold 30
+
+Скрипт створює окрему тестову БД, викладача і студента з оцінюваним завданням, піднімає один
+процес uvicorn з myplatform.asgi і відкриває --connections з'єднань від імені студента. Потім
+тримає їх --hold секунд (keepalive-коментарі мають приходити, з'єднання - не рватися), оцінює
+здачу через звичайний POST .../grade/ до того ж сервера і міряє, за скільки подія дійшла до всіх з'єднань.
+Виводить RSS воркера до і після відкриття з'єднань.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import socket
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myplatform.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from datetime import date, timedelta  # noqa: E402
+
+from django.db import connection, connections  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from apps.assignments.models import Assignment  # noqa: E402
+from apps.courses.models import Course  # noqa: E402
+from apps.enrollments.models import Enrollment  # noqa: E402
+from apps.users.models import CustomUser  # noqa: E402
+
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def serve(database_name, port, backlog):
+    import uvicorn
+
+    from myplatform.asgi import application
+
+    raise_fd_limit()
+    connection.settings_dict['NAME'] = database_name
+    config = uvicorn.Config(
+        application, host='127.0.0.1', port=port, backlog=backlog, log_level='warning', lifespan='off'
+    )
+    uvicorn.Server(config).run()
+
+
+def rss_mb(pid):
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def populate():
+    teacher = CustomUser.objects.create_user(username="bench_teacher", password='!', role='teacher')
+    student = CustomUser.objects.create_user(username="bench_student", password='!', role='student')
+    course = Course.objects.create(
+        title="Bench course", description="", teacher=teacher, start_date=date.today(),
+        end_date=date.today() + timedelta(days=30), duration=30, batch_number=1, status='free'
+    )
+    Enrollment.objects.create(course=course, student=student)
+    assignment = Assignment.objects.create(course=course, teacher=teacher, title="Bench assignment")
+    return teacher, student, assignment
+
+
+def session_cookie(user):
+    client = Client()
+    client.force_login(user)
+    return client.cookies['sessionid'].value
+
+
+async def open_stream(port, path, session_id):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: text/event-stream\r\n"
+        f"Cookie: sessionid={session_id}\r\n\r\n".encode()
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    if b" 200 " not in status_line:
+        raise RuntimeError(f"unexpected response: {status_line!r}")
+    await reader.readuntil(b"\r\n\r\n")  # заголовки
+    await reader.readuntil(b"retry:")
+    return reader, writer
+
+
+async def wait_for_event(reader):
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("stream closed")
+        if b"event: submission" in line:
+            return time.perf_counter()
+
+
+async def run(port, pid, args, session_id, grade):
+    rss_before = rss_mb(pid)
+    semaphore = asyncio.Semaphore(args.ramp)
+
+    async def limited():
+        async with semaphore:
+            return await open_stream(port, '/api/assignments/events/', session_id)
+
+    started = time.perf_counter()
+    streams = await asyncio.gather(*(limited() for _ in range(args.connections)))
+    opened = time.perf_counter() - started
+    print(f"opened {len(streams)} connections in {opened:.1f}s")
+
+    await asyncio.sleep(args.hold)
+    rss_after = rss_mb(pid)
+    alive = sum(1 for reader, _ in streams if not reader.at_eof())
+    print(f"after {args.hold}s idle: {alive} connections alive")
+    print(f"worker RSS: {rss_before:.1f} MB before, {rss_after:.1f} MB with connections "
+          f"({(rss_after - rss_before) * 1024 / len(streams):.1f} KB per connection)")
+
+    waiters = [asyncio.ensure_future(wait_for_event(reader)) for reader, _ in streams]
+    published = time.perf_counter()
+    await asyncio.get_running_loop().run_in_executor(None, grade)
+    received = await asyncio.gather(*waiters)
+    latencies = sorted(moment - published for moment in received)
+    print(f"grade event delivered to {len(received)} connections: "
+          f"p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms")
+
+    for _, writer in streams:
+        writer.close()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--connections', type=int, default=5000)
+    parser.add_argument('--hold', type=float, default=30, help="скільки секунд тримати з'єднання до оцінювання")
+    parser.add_argument('--ramp', type=int, default=200, help="скільки з'єднань відкривати одночасно")
+    args = parser.parse_args()
+
+    limit = raise_fd_limit()
+    if limit < args.connections + 100:
+        parser.error(f"open files limit is {limit}, raise it (ulimit -n) above {args.connections + 100}")
+
+    old_name = connection.settings_dict['NAME']
+    if connection.vendor == 'sqlite' and not connection.settings_dict['TEST']['NAME']:
+        # In-memory тестова БД SQLite не видна процесу сервера
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.gettempdir(), 'sse_bench.sqlite3')
+    database_name = connection.creation.create_test_db(verbosity=0, serialize=False)
+    server = None
+    try:
+        teacher, student, assignment = populate()
+        session_id = session_cookie(student)
+        connections.close_all()
+
+        port = free_port()
+        server = multiprocessing.get_context('spawn').Process(
+            target=serve, args=(database_name, port, args.connections)
+        )
+        server.start()
+        for _ in range(100):
+            try:
+                socket.create_connection(('127.0.0.1', port)).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        teacher_session = session_cookie(teacher)
+        grade_url = f"http://127.0.0.1:{port}" + reverse('grade_submission', args=[assignment.id, student.id])
+
+        def grade():
+            # Через HTTP до того ж воркера: з LocalBroker подія доходить лише до підписників його процесу
+            request = urllib.request.Request(
+                grade_url, data=urllib.parse.urlencode({'grade': '90'}).encode(),
+                headers={'Cookie': f"sessionid={teacher_session}"}
+            )
+            with urllib.request.urlopen(request) as response:
+                assert response.status == 200, response.read()
+
+        asyncio.run(run(port, server.pid, args, session_id, grade))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/stream_users.py
+"""
+Пікова пам'ять (RSS) list_students у звичайному і потоковому (?stream=1) режимах.
+
+Запуск з каталогу myplatform-backend (потрібні ті самі змінні оточення, що й для manage.py):
+
+    python benchmarks/stream_users.py --counts 1000 10000 100000 500000
+
+Скрипт створює окрему тестову БД (як manage.py test), наповнює її студентами і для кожного
+розміру й режиму робить запит у свіжому дочірньому процесі, щоб ru_maxrss не змішувався між замірами.
+Звичайний режим для великих розмірів можна пропустити через --buffered-limit.
+
+Міряти варто на PostgreSQL: там .iterator() читає серверним курсором. Драйвер SQLite сам
+по собі трохи набирає пам'ять на великих таблицях (так само і для голого cursor.fetchmany()).
+
+Пік береться з VmHWM (/proc/self/status): ru_maxrss на Linux переживає exec, тож дочірній процес
+успадкував би пік батьківського, який росте під час наповнення БД.
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myplatform.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, connections, reset_queries  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from apps.users.models import CustomUser  # noqa: E402
+
+BATCH_SIZE = 5000
+
+
+def populate(count):
+    existing = CustomUser.objects.filter(role='student').count()
+    for start in range(existing, count, BATCH_SIZE):
+        CustomUser.objects.bulk_create([
+            CustomUser(
+                username=f"bench_student_{i}", email=f"bench_student_{i}@example.com", password='!',
+                first_name="Bench", last_name=f"Student {i}", role='student',
+            ) for i in range(start, min(start + BATCH_SIZE, count))
+        ])
+        # при DEBUG=True кожен INSERT на 5000 рядків лишається в connection.queries
+        reset_queries()
+
+
+def peak_rss_kb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(database_name, params, queue):
+    connection.settings_dict['NAME'] = database_name
+    with override_settings(ALLOWED_HOSTS=['*']):
+        started = time.perf_counter()
+        response = Client().get(reverse('list_students'), params)
+        size = 0
+        if response.streaming:
+            for chunk in response.streaming_content:
+                size += len(chunk)
+        else:
+            size = len(response.content)
+        elapsed = time.perf_counter() - started
+    queue.put((peak_rss_kb(), size, elapsed))
+
+
+def run_in_child(params):
+    # spawn, а не fork: дочірній процес не успадковує пам'ять, набрану під час наповнення БД
+    connections.close_all()
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=measure, args=(connection.settings_dict['NAME'], params, queue))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"measurement process failed with exit code {process.exitcode}")
+    return queue.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 10000, 100000, 500000])
+    parser.add_argument('--buffered-limit', type=int, default=100000,
+                        help="не міряти звичайний режим, якщо студентів більше")
+    args = parser.parse_args()
+
+    old_name = connection.settings_dict['NAME']
+    if connection.vendor == 'sqlite' and not connection.settings_dict['TEST']['NAME']:
+        # In-memory тестова БД SQLite не видна дочірнім процесам
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.gettempdir(), 'stream_users_bench.sqlite3')
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        print(f"{'users':>8} {'mode':>9} {'peak RSS, MB':>13} {'body, MB':>9} {'time, s':>8}")
+        for count in sorted(args.counts):
+            populate(count)
+            modes = [('stream', {'stream': '1'}), ('ndjson', {'stream': 'ndjson'})]
+            if count <= args.buffered_limit:
+                modes.insert(0, ('buffered', {}))
+            for mode, params in modes:
+                max_rss_kb, size, elapsed = run_in_child(params)
+                print(f"{count:>8} {mode:>9} {max_rss_kb / 1024:>13.1f} {size / 2 ** 20:>9.1f} {elapsed:>8.2f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -13,4 +13,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myplatform.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Після get_asgi_application(): імпорт моделей потребує django.setup()
+from apps.assignments.events import EVENTS_PATH, submission_events_app  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # Довгі SSE-з'єднання - повз Django handler (див. apps/assignments/events.py)
+    if scope['type'] == 'http' and scope['path'] == EVENTS_PATH:
+        return await submission_events_app(scope, receive, send)
+    return await django_application(scope, receive, send)
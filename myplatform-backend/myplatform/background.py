@@ -0,0 +1,56 @@
+# myplatform/background.py
+"""
+Спільний пул потоків для фонової роботи всередині веб-процесу (завантаження в S3 тощо).
+
+Завдання не переживають перезапуск процесу, тому кожне з них має бути ідемпотентним і
+мати спосіб дозапуску (напр. manage.py process_uploads). BACKGROUND_TASKS_EAGER = True
+виконує завдання одразу в поточному потоці - для тестів і management-команд.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BACKGROUND_WORKERS, thread_name_prefix='background'
+                )
+    return _executor
+
+
+def _run(fn, args, kwargs):
+    close_old_connections()
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(fn, '__name__', fn))
+        raise
+    finally:
+        # У потоці пулу з'єднання з БД ніхто інший не закриє
+        connection.close()
+
+
+def submit(fn, *args, **kwargs):
+    """Запускає fn(*args, **kwargs) у фоновому пулі; повертає Future"""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            logger.exception("Background task %s failed", getattr(fn, '__name__', fn))
+            future.set_exception(e)
+        return future
+    return get_executor().submit(_run, fn, args, kwargs)
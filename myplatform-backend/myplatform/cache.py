@@ -0,0 +1,133 @@
+# myplatform/cache.py
+"""
+Обгортка над django.core.cache для дорогих обчислень, спільних для всіх воркерів.
+
+- single-flight: ключ перераховує лише один воркер, решта чекають або віддають старе значення;
+- stale-while-revalidate: після fresh_until запис ще stale_timeout секунд лежить у кеші,
+  і поки лідер перераховує, інші запити отримують попереднє значення;
+- jitter: TTL розкидаються випадково, щоб записи, створені одночасно, не протухали разом;
+- версії неймспейсів: bump_cache_version() робить недійсними всі ключі неймспейсу без delete_pattern.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import os
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+LOCK_TIMEOUT = 60
+WAIT_INTERVAL = 0.05
+
+
+def jittered(timeout, jitter=0.1):
+    """timeout, збільшений на випадкові 0..jitter*timeout секунд"""
+    return timeout + random.uniform(0, timeout * jitter)
+
+
+@contextlib.contextmanager
+def single_flight(key):
+    """
+    Неблокуючий ексклюзивний лок на ключ. Повертає True, якщо лок взято.
+
+    Якщо задано CACHE_LOCK_DIR - flock на файл (працює між потоками і процесами одного хоста,
+    знімається ядром, якщо воркер упав). Інакше - cache.add(), що атомарний у memcached/redis.
+    """
+    lock_dir = getattr(settings, 'CACHE_LOCK_DIR', None)
+
+    if lock_dir:
+        os.makedirs(lock_dir, exist_ok=True)
+        path = os.path.join(lock_dir, hashlib.md5(key.encode()).hexdigest() + '.lock')
+        with open(path, 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return
+
+    lock_key = f'lock:{key}'
+    acquired = cache.add(lock_key, 1, LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(lock_key)
+
+
+def _is_fresh(envelope):
+    return envelope is not None and envelope['fresh_until'] > time.time()
+
+
+def get_or_compute(key, compute, timeout=300, stale_timeout=None, wait=None):
+    """
+    Значення з кешу або результат compute(), порахований рівно одним воркером.
+
+    timeout - скільки секунд значення вважається свіжим (з jitter),
+    stale_timeout - скільки ще після цього його можна віддавати, поки хтось перераховує
+    (за замовчуванням дорівнює timeout), wait - скільки чекати на лідера, коли в кеші нічого немає.
+    """
+    if stale_timeout is None:
+        stale_timeout = timeout
+    if wait is None:
+        wait = LOCK_TIMEOUT
+
+    envelope = cache.get(key)
+    if _is_fresh(envelope):
+        return envelope['value']
+
+    with single_flight(key) as leader:
+        if leader:
+            # Поки ми чекали на лок, значення міг оновити попередній лідер
+            envelope = cache.get(key)
+            if _is_fresh(envelope):
+                return envelope['value']
+
+            value = compute()
+            fresh_for = jittered(timeout)
+            cache.set(key, {'value': value, 'fresh_until': time.time() + fresh_for}, fresh_for + stale_timeout)
+            return value
+
+    if envelope is not None:
+        return envelope['value']
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        envelope = cache.get(key)
+        if envelope is not None:
+            return envelope['value']
+
+    # Лідер не встиг (або впав) - рахуємо самі, але не перезаписуємо кеш
+    return compute()
+
+
+def cache_version(namespace):
+    """Поточна версія неймспейсу; створюється при першому зверненні"""
+    return cache.get_or_set(f'version:{namespace}', time.time_ns, None)
+
+
+def peek_cache_version(namespace):
+    """Версія неймспейсу без створення; None, якщо її ще ніхто не піднімав"""
+    return cache.get(f'version:{namespace}')
+
+
+def peek_cache_versions(namespaces):
+    """{неймспейс: версія} одним get_many; неймспейсів без версії в результаті немає"""
+    found = cache.get_many([f'version:{namespace}' for namespace in namespaces])
+    return {namespace: found[f'version:{namespace}'] for namespace in namespaces if f'version:{namespace}' in found}
+
+
+def bump_cache_version(namespace):
+    cache.set(f'version:{namespace}', time.time_ns(), None)
+
+
+def versioned_key(namespace, *parts):
+    return ':'.join([namespace, str(cache_version(namespace)), *map(str, parts)])
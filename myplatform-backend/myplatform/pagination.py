@@ -0,0 +1,112 @@
+# myplatform/pagination.py
+"""
+Keyset (cursor) пагінація за індексованою парою (<дата створення>, id).
+
+Вмикається лише якщо клієнт передав ?page_size= або ?cursor= - без них ендпоінти
+повертають увесь список, як і раніше. Наступна сторінка вибирається умовою
+WHERE (created_at, id) < (останній рядок), тож глибокі сторінки не роблять OFFSET-скан.
+"""
+
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    # У view можна перевизначити атрибутом keyset_ordering, напр. ('-date_joined', '-id')
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    default_page_size = 50
+    max_page_size = 500
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+        self.next_cursor = None
+        self.request = None
+
+    def is_requested(self, request):
+        return self.page_size_query_param in request.GET or self.cursor_query_param in request.GET
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.GET.get(self.page_size_query_param, self.default_page_size))
+        except ValueError:
+            raise ParseError("Invalid page_size")
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, values):
+        raw = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value for value in values])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            position, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            position = parse_datetime(position)
+            if position is None:
+                raise ValueError(cursor)
+            return position, int(pk)
+        except (TypeError, ValueError):
+            raise ParseError("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        ordering = getattr(view, 'keyset_ordering', self.ordering)
+        position_field, pk_field = (field.lstrip('-') for field in ordering)
+        try:
+            queryset.model._meta.get_field(position_field)
+        except FieldDoesNotExist:
+            # Модель без поля для впорядкування - віддаємо список без пагінації
+            return None
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*ordering)
+
+        cursor = request.GET.get(self.cursor_query_param)
+        if cursor:
+            position, pk = self.decode_cursor(cursor)
+            lookup = 'lt' if ordering[0].startswith('-') else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{position_field}__{lookup}': position}) |
+                Q(**{position_field: position, f'{pk_field}__{lookup}': pk})
+            )
+
+        page = list(queryset[:page_size + 1])
+        self.next_cursor = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            last = page[-1]
+            self.next_cursor = self.encode_cursor([getattr(last, position_field), getattr(last, pk_field)])
+        return page
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_data(self, data):
+        return {'next': self.get_next_link(), 'results': data}
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,163 @@
+# myplatform/pubsub.py
+"""
+Pub/sub для server-push (SSE) подій.
+
+Підписники - асинхронні view під ASGI: кожен отримує обмежену asyncio.Queue у своєму event loop.
+publish() викликається із синхронного коду (view, потоки), тож доставка в чергу йде через
+loop.call_soon_threadsafe. Бекенд задається PUBSUB_BACKEND:
+
+- myplatform.pubsub.LocalBroker - лише в межах процесу (один воркер, тести);
+- myplatform.pubsub.PostgresBroker - LISTEN/NOTIFY у тій самій БД: подію отримують
+  підписники всіх воркерів і хостів, без додаткових сервісів.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+
+    def put(self, message):
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # Event loop уже закрито - підписник зник, не встигнувши відписатися
+            self.broker.unsubscribe(self)
+
+    def _put(self, message):
+        if self.queue.full():
+            # Повільний клієнт: старі події витісняються, пам'ять не росте
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Наступне повідомлення або TimeoutError через timeout секунд"""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel, maxsize=None):
+        """Підписка з поточного event loop; закривати через close()"""
+        subscription = Subscription(self, channel, maxsize or settings.PUBSUB_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def dispatch(self, channel, message):
+        """Доставка підписникам цього процесу"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+        return len(subscribers)
+
+    def publish(self, channel, message):
+        self.dispatch(channel, message)
+
+
+class PostgresBroker(LocalBroker):
+    """
+    publish() - SELECT pg_notify(...) через з'єднання Django; один потік на процес слухає
+    LISTEN на окремому з'єднанні і роздає події локальним підписникам. Payload NOTIFY
+    обмежений 8000 байтами, тож повідомлення мають бути невеликими (id і статуси, не вміст).
+    """
+
+    def __init__(self, using='default', pg_channel=None):
+        super().__init__()
+        self.using = using
+        self.pg_channel = pg_channel or settings.PUBSUB_PG_CHANNEL
+        self._listener = None
+
+    def publish(self, channel, message):
+        payload = json.dumps({'channel': channel, 'message': message}, cls=DjangoJSONEncoder)
+        with connections[self.using].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.pg_channel, payload])
+
+    def subscribe(self, channel, maxsize=None):
+        self.start_listener()
+        return super().subscribe(channel, maxsize)
+
+    def start_listener(self):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self.listen, name='pubsub-listener', daemon=True)
+                self._listener.start()
+
+    def handle_notify(self, payload):
+        try:
+            event = json.loads(payload)
+            self.dispatch(event['channel'], event['message'])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Malformed pub/sub payload: %r", payload)
+
+    def listen(self):
+        import psycopg2
+
+        while True:
+            conn = None
+            try:
+                # Окреме з'єднання поза пулом Django: воно весь час висить у LISTEN
+                conn = psycopg2.connect(**connections[self.using].get_connection_params())
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.pg_channel}"')
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.handle_notify(conn.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Pub/sub listener lost its connection, reconnecting")
+                if conn is not None:
+                    conn.close()
+                time.sleep(1)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.PUBSUB_BACKEND)()
+
+
+def publish_on_commit(channel, message):
+    """Публікує після коміту поточної транзакції - клієнт не побачить подію раніше за дані"""
+    transaction.on_commit(lambda: get_broker().publish(channel, message), robust=True)
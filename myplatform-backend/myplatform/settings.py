@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -52,6 +53,8 @@ INSTALLED_APPS = [
     'apps.materials',
     'apps.questions',
     'apps.analytics',
+    'apps.storage',
+    'apps.jobs',
 
     'apps.categories',
     'django.contrib.sites',
@@ -213,6 +216,70 @@ AWS_SECRET_ACCESS_KEY = config('AWS_SECRET_ACCESS_KEY')
 AWS_S3_REGION_NAME = config('AWS_S3_REGION_NAME')
 AWS_STORAGE_BUCKET_NAME = 'myeducationplatformbucket'
 
+# Черга фонових завдань у БД (apps.jobs, воркери - manage.py run_workers)
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=5, cast=int)
+# Базова затримка повтору, секунд (подвоюється з кожною спробою)
+JOBS_RETRY_BACKOFF = config('JOBS_RETRY_BACKOFF', default=10, cast=int)
+# Як часто воркер оновлює heartbeat_at завдання, що виконується, секунд
+JOBS_HEARTBEAT_INTERVAL = config('JOBS_HEARTBEAT_INTERVAL', default=30, cast=int)
+# Завдання в статусі running без heartbeat довше за це (секунд) вважається покинутим воркером і повертається в чергу
+JOBS_STALLED_AFTER = config('JOBS_STALLED_AFTER', default=5 * 60, cast=int)
+
+# Перерахунок ModuleProgress після додавання/видалення уроку - завданням черги apps.jobs
+PROGRESS_RECOMPUTE_DEFERRED = config('PROGRESS_RECOMPUTE_DEFERRED', default=False, cast=bool)
+
+# Розсилка сповіщень курсу завданням черги apps.jobs; вставка пакетами по NOTIFICATIONS_BATCH_SIZE
+NOTIFICATIONS_DEFERRED = config('NOTIFICATIONS_DEFERRED', default=True, cast=bool)
+NOTIFICATIONS_BATCH_SIZE = config('NOTIFICATIONS_BATCH_SIZE', default=1000, cast=int)
+
+# Server-sent events (apps.assignments.events, лише під ASGI). Для кількох воркерів / хостів -
+# PUBSUB_BACKEND=myplatform.pubsub.PostgresBroker (LISTEN/NOTIFY у тій самій БД)
+PUBSUB_BACKEND = config('PUBSUB_BACKEND', default='myplatform.pubsub.LocalBroker')
+PUBSUB_PG_CHANNEL = config('PUBSUB_PG_CHANNEL', default='myplatform_events')
+# Скільки непрочитаних подій тримати для одного з'єднання (старші витісняються)
+PUBSUB_QUEUE_SIZE = config('PUBSUB_QUEUE_SIZE', default=100, cast=int)
+SSE_KEEPALIVE = config('SSE_KEEPALIVE', default=20, cast=int)
+SSE_RETRY_MS = config('SSE_RETRY_MS', default=5000, cast=int)
+
+# Спільний S3-клієнт (apps.storage.client). Пул має вміщати одночасні запити всіх потоків:
+# BACKGROUND_WORKERS * UPLOAD_MULTIPART_CONCURRENCY, STORAGE_PURGE_WORKERS і потоки веб-сервера
+S3_MAX_POOL_CONNECTIONS = config('S3_MAX_POOL_CONNECTIONS', default=50, cast=int)
+S3_MAX_ATTEMPTS = config('S3_MAX_ATTEMPTS', default=5, cast=int)
+S3_CONNECT_TIMEOUT = config('S3_CONNECT_TIMEOUT', default=5, cast=int)
+S3_READ_TIMEOUT = config('S3_READ_TIMEOUT', default=60, cast=int)
+
+# Фоновий пул потоків (myplatform.background) і асинхронні завантаження в S3 (apps.storage)
+BACKGROUND_WORKERS = config('BACKGROUND_WORKERS', default=4, cast=int)
+UPLOAD_SPOOL_DIR = config('UPLOAD_SPOOL_DIR', default=str(BASE_DIR / '.cache' / 'uploads'))
+UPLOAD_MULTIPART_THRESHOLD = config('UPLOAD_MULTIPART_THRESHOLD', default=8 * 1024 * 1024, cast=int)
+UPLOAD_MULTIPART_CONCURRENCY = config('UPLOAD_MULTIPART_CONCURRENCY', default=4, cast=int)
+# Видаляти файли з S3 завданням черги apps.jobs, не затримуючи відповідь (apps.storage.cleanup)
+STORAGE_DELETE_DEFERRED = config('STORAGE_DELETE_DEFERRED', default=True, cast=bool)
+STORAGE_PURGE_WORKERS = config('STORAGE_PURGE_WORKERS', default=8, cast=int)
+# Через скільки секунд непідтверджені тимчасові файли видаляє manage.py gc_temp_files
+TEMP_FILES_MAX_AGE = config('TEMP_FILES_MAX_AGE', default=24 * 60 * 60, cast=int)
+
+# Спільний для всіх воркерів кеш (за замовчуванням - файловий у .cache/django;
+# для кількох хостів - memcached/redis, напр. CACHE_BACKEND=django.core.cache.backends.memcached.PyMemcacheCache,
+# CACHE_LOCATION=unix:/var/run/memcached/memcached.sock і порожній CACHE_LOCK_DIR)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / '.cache' / 'django')),
+    }
+}
+# Каталог файлових локів для myplatform.cache.single_flight; порожнє значення - локи через cache.add()
+CACHE_LOCK_DIR = config('CACHE_LOCK_DIR', default=str(BASE_DIR / '.cache' / 'locks'))
+
+# manage.py test: кеш у пам'яті процесу і без файлових локів, щоб тести не ділили .cache з dev-сервером
+TESTING = sys.argv[1:2] == ['test']
+if TESTING:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    CACHE_LOCK_DIR = ''
+
+# Знімки аналітики, старші за цей вік (секунди), не віддаються і рахуються наживо; 0 - без обмеження
+ANALYTICS_SNAPSHOT_MAX_AGE = config('ANALYTICS_SNAPSHOT_MAX_AGE', default=3600, cast=int)
+
 # нововедення
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -0,0 +1,60 @@
+# myplatform/streaming.py
+"""
+Потокова віддача великих списків: рядки серіалізуються по мірі читання з курсора БД,
+тож пам'ять процесу не росте з кількістю рядків.
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+STREAM_CHUNK_SIZE = 2000
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+
+def stream_format(request):
+    """'json' / 'ndjson' для ?stream=1 / ?stream=ndjson, None - якщо потоковий режим не запитано"""
+    value = request.GET.get('stream')
+    if value == 'ndjson':
+        return 'ndjson'
+    if value in ('1', 'true', 'json'):
+        return 'json'
+    return None
+
+
+def iter_json_array(rows, chunk_rows):
+    encoder = DjangoJSONEncoder()
+    chunk = []
+    separator = '['
+    for row in rows:
+        chunk.append(separator + encoder.encode(row))
+        separator = ','
+        if len(chunk) >= chunk_rows:
+            yield ''.join(chunk)
+            chunk = []
+    if separator == '[':
+        chunk.append('[')
+    chunk.append(']')
+    yield ''.join(chunk)
+
+
+def iter_ndjson(rows, chunk_rows):
+    encoder = DjangoJSONEncoder()
+    chunk = []
+    for row in rows:
+        chunk.append(encoder.encode(row) + '\n')
+        if len(chunk) >= chunk_rows:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def stream_rows(queryset, fmt, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    StreamingHttpResponse з рядками queryset (.values()) у вигляді JSON-масиву або NDJSON.
+    .iterator(chunk_size) читає рядки порціями (на PostgreSQL - серверним курсором), без кешу queryset.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    if fmt == 'ndjson':
+        return StreamingHttpResponse(iter_ndjson(rows, chunk_size), content_type=NDJSON_CONTENT_TYPE)
+    return StreamingHttpResponse(iter_json_array(rows, chunk_size), content_type='application/json')
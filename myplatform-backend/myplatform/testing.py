@@ -0,0 +1,25 @@
+# myplatform/testing.py
+"""Спільні помічники для тестів."""
+
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    assertMaxQueries - як assertNumQueries, але перевіряє лише верхню межу: тест не падає, коли запитів
+    стає менше, і падає, коли ендпоінт починає робити запит на кожен рядок (N+1).
+    """
+
+    @contextmanager
+    def assertMaxQueries(self, number, using=DEFAULT_DB_ALIAS):
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+        executed = len(context)
+        if executed > number:
+            queries = '\n'.join(
+                f"{index}. {query['sql']}" for index, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(f"{executed} queries executed, at most {number} expected\nCaptured queries were:\n{queries}")
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.notes.models import NoteFolder, UserNote
+from apps.users.models import CustomUser
+from myplatform.cache import bump_cache_version, get_or_compute, single_flight, versioned_key
+from myplatform.pubsub import LocalBroker, PostgresBroker
+
+
+class GetOrComputeTest(SimpleTestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.file_cache = {
+            'CACHES': {'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': os.path.join(tmp_dir, 'cache'),
+            }},
+            'CACHE_LOCK_DIR': os.path.join(tmp_dir, 'locks'),
+        }
+        self.shared_memory_cache = {
+            'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+            'CACHE_LOCK_DIR': '',
+        }
+
+    def fire_concurrent_requests(self, compute, count=8):
+        barrier = threading.Barrier(count)
+        results = []
+
+        def request():
+            barrier.wait()
+            results.append(get_or_compute('dashboard', compute, timeout=60))
+
+        threads = [threading.Thread(target=request) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_requests_compute_once(self):
+        for settings in (self.file_cache, self.shared_memory_cache):
+            with self.subTest(lock_dir=settings['CACHE_LOCK_DIR']), override_settings(**settings):
+                calls = []
+
+                def expensive():
+                    calls.append(1)
+                    time.sleep(0.3)
+                    return {'total': 42}
+
+                results = self.fire_concurrent_requests(expensive)
+                self.assertEqual(len(calls), 1)
+                self.assertEqual(results, [{'total': 42}] * 8)
+
+    def test_stale_value_served_while_another_worker_recomputes(self):
+        with override_settings(**self.file_cache):
+            get_or_compute('dashboard', lambda: 'old', timeout=0.01, stale_timeout=60)
+            time.sleep(0.05)
+
+            with single_flight('dashboard') as leader:
+                self.assertTrue(leader)
+                self.assertEqual(get_or_compute('dashboard', lambda: self.fail("recomputed"), timeout=60), 'old')
+
+            self.assertEqual(get_or_compute('dashboard', lambda: 'new', timeout=60), 'new')
+
+    def test_bumping_version_changes_keys(self):
+        with override_settings(**self.file_cache):
+            key = versioned_key('catalog', 'courses', '/api/courses/')
+            self.assertEqual(versioned_key('catalog', 'courses', '/api/courses/'), key)
+
+            bump_cache_version('catalog')
+            self.assertNotEqual(versioned_key('catalog', 'courses', '/api/courses/'), key)
+
+
+class KeysetPaginationTest(TestCase):
+
+    def setUp(self):
+        joined = timezone.now()
+        self.students = []
+        for i in range(7):
+            # Частина студентів з однаковою датою - порядок між ними визначає id
+            student = CustomUser.objects.create_user(username=f"student_{i}", password="1234567890HTML", role='student')
+            student.date_joined = joined - timezone.timedelta(days=i // 3)
+            student.save()
+            self.students.append(student)
+
+    def walk(self, url, params):
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            pages.append([row['id'] for row in data['results']])
+            if data['next'] is None:
+                return pages
+            response = self.client.get(data['next'])
+
+    def test_pages_cover_list_in_keyset_order(self):
+        expected = [student.id for student in sorted(
+            self.students, key=lambda student: (student.date_joined, student.id), reverse=True
+        )]
+
+        pages = self.walk(reverse('list_students'), {'page_size': 3})
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_unpaginated_without_parameters(self):
+        response = self.client.get(reverse('list_students'))
+        self.assertEqual(len(response.json()), 7)
+
+        response = self.client.get(reverse('list_students'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_drf_list_view(self):
+        user = self.students[0]
+        notes = [UserNote.objects.create(user=user, title=f"Note {i}", content="Content") for i in range(5)]
+        self.client.login(username=user.username, password="1234567890HTML")
+
+        response = self.client.get(reverse('list_notes'))
+        self.assertEqual(len(response.json()), 5)
+
+        pages = self.walk(reverse('list_notes'), {'page_size': 2})
+        self.assertEqual(sum(pages, []), [note.id for note in reversed(notes)])
+
+    def test_other_list_views_not_paginated(self):
+        user = self.students[0]
+        folders = [NoteFolder.objects.create(user=user, name=f"Folder {i}") for i in range(3)]
+        self.client.login(username=user.username, password="1234567890HTML")
+
+        # Пагінація задана лише на конкретних view, а не глобально
+        response = self.client.get(reverse('list_folders'), {'page_size': 1})
+        self.assertEqual(sorted(row['id'] for row in response.json()), [folder.id for folder in folders])
+
+
+class StreamingListTest(TestCase):
+
+    def setUp(self):
+        for i in range(5):
+            CustomUser.objects.create_user(username=f"student_{i}", password="1234567890HTML", role='student')
+        CustomUser.objects.create_user(username="teacher", password="1234567890HTML", role='teacher')
+
+    def streamed(self, url, params):
+        response = self.client.get(url, params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_json_array_matches_buffered_listing(self):
+        buffered = self.client.get(reverse('list_students')).json()
+
+        response, body = self.streamed(reverse('list_students'), {'stream': '1'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(
+            sorted(json.loads(body), key=lambda row: row['id']), sorted(buffered, key=lambda row: row['id'])
+        )
+
+    def test_ndjson(self):
+        response, body = self.streamed(reverse('list_teachers'), {'stream': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['username'] for row in rows], ["teacher"])
+
+    def test_empty_listing(self):
+        CustomUser.objects.filter(role='teacher').delete()
+        response, body = self.streamed(reverse('list_teachers'), {'stream': '1'})
+        self.assertEqual(json.loads(body), [])
+
+
+class LocalBrokerTest(SimpleTestCase):
+
+    async def test_publish_from_another_thread(self):
+        broker = LocalBroker()
+        subscription = broker.subscribe("user.1")
+        other = broker.subscribe("user.2")
+
+        thread = threading.Thread(target=broker.publish, args=("user.1", {'status': 'graded'}))
+        thread.start()
+        thread.join()
+        self.assertEqual(await subscription.get(timeout=1), {'status': 'graded'})
+        self.assertTrue(other.queue.empty())
+
+        subscription.close()
+        self.assertEqual(broker.subscriber_count(), 1)
+        self.assertEqual(broker.dispatch("user.1", {}), 0)
+
+    async def test_slow_subscriber_keeps_latest_events(self):
+        broker = LocalBroker()
+        subscription = broker.subscribe("user.1", maxsize=2)
+        for i in range(5):
+            broker.publish("user.1", i)
+        await asyncio.sleep(0)
+        self.assertEqual([await subscription.get(timeout=1) for _ in range(2)], [3, 4])
+
+    @override_settings(PUBSUB_PG_CHANNEL='events')
+    async def test_postgres_notify_payload_is_dispatched_locally(self):
+        broker = PostgresBroker()
+        subscription = LocalBroker.subscribe(broker, "user.1")
+        broker.handle_notify(json.dumps({'channel': "user.1", 'message': {'grade': "95.00"}}))
+        with self.assertLogs('myplatform.pubsub', 'WARNING'):
+            broker.handle_notify("not json")
+        self.assertEqual(await subscription.get(timeout=1), {'grade': "95.00"})
@@ -58,8 +58,10 @@ urlpatterns = [
     path('api/questions/', include('apps.questions.urls')),
     path('api/payments/', include('apps.payments.urls')),
     path('api/categories/', include('apps.categories.urls')),
+    path('api/notifications/', include('apps.notifications.urls')),
 
     path('api/analytics/', include('apps.analytics.urls')),
+    path('api/storage/', include('apps.storage.urls')),
 
     # Документація
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),